@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CareersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'careers'
+
+    def ready(self):
+        # Registra las señales que invalidan el cache del catálogo
+        from careers import signals  # noqa: F401
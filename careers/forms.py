@@ -1,4 +1,6 @@
 from django import forms
+
+from core.choices import CachedModelMultipleChoiceField, subject_choices
 from .models import Career
 from subjects.models import Subject
 
@@ -37,21 +39,20 @@ class CareerForm(forms.ModelForm):
 
 
 class CareerSubjectsForm(forms.ModelForm):
+    # Las opciones salen del cache (id, nombre); el queryset solo valida lo enviado
+    subjects = CachedModelMultipleChoiceField(
+        queryset=Subject.objects.all(),
+        choices_provider=subject_choices,
+        label="Plan de Estudios",
+        widget=forms.SelectMultiple(
+            attrs={
+                "class": "form-control select2-subjects",
+                "style": "width: 100%",
+                "data-placeholder": "Buscar materias para agregar...",
+            },
+        ),
+    )
+
     class Meta:
         model = Career
         fields = ["subjects"]
-
-        widgets = {
-            "subjects": forms.SelectMultiple(
-                attrs={
-                    "class": "form-control select2-subjects",
-                    "style": "width: 100%",
-                    "data-placeholder": "Buscar materias para agregar...",
-                },
-            )
-        }
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.fields["subjects"].queryset = Subject.objects.all().order_by("name")
-        self.fields["subjects"].label = "Plan de Estudios"
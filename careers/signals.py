@@ -0,0 +1,23 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_version
+from .models import Career
+
+
+@receiver(post_save, sender=Career)
+@receiver(post_delete, sender=Career)
+def invalidate_career_cache(sender, **kwargs):
+    """
+    Invalida las páginas cacheadas que muestran datos de carreras.
+    """
+    bump_version("career")
+
+
+@receiver(m2m_changed, sender=Career.subjects.through)
+def invalidate_study_plan_cache(sender, action, **kwargs):
+    """
+    Un cambio en el plan de estudios afecta a las páginas de carreras y de materias.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        bump_version("career", "subject")
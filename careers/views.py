@@ -1,9 +1,14 @@
+from functools import partial
+
 from django.contrib import messages
+from django.db.models import Count
 from django.db.models.deletion import ProtectedError
 from django.shortcuts import redirect
 from django.urls import reverse_lazy, reverse
 from django.views.generic import CreateView, UpdateView, ListView, DeleteView, DetailView
 
+from core.cache import CatalogCacheMixin, cached
+from core.db_routers import ReplicaReadMixin
 from users.mixins import AdminRequiredMixin
 from .forms import CareerForm, CareerSubjectsForm
 from .models import Career
@@ -20,6 +25,7 @@ class CareerCreateView(AdminRequiredMixin, CreateView):
     model = Career
     form_class = CareerForm
     template_name = "careers/career_form.html"
+    query_budget = 2
     success_url = reverse_lazy("careers:career_list")
 
     def form_valid(self, form):
@@ -40,15 +46,20 @@ class CareerCreateView(AdminRequiredMixin, CreateView):
         return redirect(self.get_success_url())
 
 
-class CareerListView(AdminRequiredMixin, ListView):
+class CareerListView(AdminRequiredMixin, ReplicaReadMixin, CatalogCacheMixin, ListView):
     """
     Vista para listar las Carreras.
     Solo accesible por administradores.
+    El total y la tabla de cada página se cachean (ver core.cache).
     """
     model = Career
     template_name = "careers/career_list.html"
+    query_budget = 4
     context_object_name = "careers"
-    queryset = Career.objects.all().order_by('name').prefetch_related('subjects') # Ordenamiento alfabético por nombre
+    catalog_namespaces = ("career", "subject")
+    # Ordenamiento alfabético por nombre.
+    # La cantidad de materias se anota con un COUNT en la misma consulta (sin cargar las materias)
+    queryset = Career.objects.annotate(subject_count=Count('subjects')).order_by('name')
     paginate_by = 20  # Requisito de paginación por defecto consistente en el sistema
 
     def get_context_data(self, **kwargs):
@@ -66,6 +77,7 @@ class CareerUpdateView(AdminRequiredMixin, UpdateView):
     model = Career
     form_class = CareerForm
     template_name = "careers/career_form.html"
+    query_budget = 3
     context_object_name = "career"
 
     def form_valid(self, form):
@@ -92,6 +104,7 @@ class CareerSubjectsUpdateView(AdminRequiredMixin, UpdateView):
     model = Career
     form_class = CareerSubjectsForm
     template_name = "careers/career_subjects_form.html"
+    query_budget = 5
     context_object_name = "career"
     # No modificar name/description/is_active porque el form incluye solo 'subjects'
 
@@ -106,6 +119,7 @@ class CareerDeleteView(AdminRequiredMixin, DeleteView):
     """
     model = Career
     template_name = "careers/career_confirm_delete.html"
+    query_budget = 3
     context_object_name = "career"
     success_url = reverse_lazy("careers:career_list")
 
@@ -139,14 +153,23 @@ class CareerDeleteView(AdminRequiredMixin, DeleteView):
         return context
     
 
-class CareerDetailView(AdminRequiredMixin, DetailView):
+class CareerDetailView(AdminRequiredMixin, ReplicaReadMixin, CatalogCacheMixin, DetailView):
     model = Career
     template_name = "careers/career_detail.html"
+    query_budget = 4
     context_object_name = "career"
+    catalog_namespaces = ("career", "subject")
 
     def get_queryset(self):
         return Career.objects.prefetch_related("subjects")
 
+    def get_object(self, queryset=None):
+        # La carrera se cachea junto con su plan de estudios (prefetch)
+        return cached(
+            self.get_catalog_key("career_detail", self.kwargs["pk"]),
+            partial(super().get_object, queryset),
+        )
+
 
 class CareerToggleActiveView(AdminRequiredMixin, View):
 
@@ -5,6 +5,38 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+Despliegue ASGI (inscripción con vistas async)
+----------------------------------------------
+Con DJANGO_ASYNC_ENROLLMENT_VIEWS=1 la oferta, la inscripción y la baja de
+materias usan sus vistas async (ver enrollments/views.py): una petición que
+espera a la base no ocupa un hilo del servidor, así un proceso atiende muchas
+inscripciones en curso a la vez el día de apertura.
+
+Un proceso con uvicorn:
+
+    pip install "uvicorn[standard]"
+    DJANGO_ASYNC_ENROLLMENT_VIEWS=1 DJANGO_CONN_MAX_AGE=0 uvicorn core.asgi:application \\
+        --host 0.0.0.0 --port 8000 --workers 1 --limit-concurrency 512
+
+Varios procesos con gunicorn como supervisor:
+
+    pip install gunicorn uvicorn-worker
+    DJANGO_ASYNC_ENROLLMENT_VIEWS=1 DJANGO_CONN_MAX_AGE=0 gunicorn core.asgi:application \\
+        -k uvicorn_worker.UvicornWorker --workers 4 --bind 0.0.0.0:8000
+
+Notas:
+- Las transacciones de los servicios corren en el pool de hilos por defecto
+  del event loop (min(32, CPUs + 4) hilos): es el límite de transacciones
+  simultáneas por proceso, no de peticiones en curso.
+- Cada petición corre su código sincrónico en un hilo propio y abre su propia
+  conexión: desplegar con DJANGO_CONN_MAX_AGE=0 (las conexiones persistentes
+  quedarían en hilos que no se reutilizan) y, con PostgreSQL, un pooler
+  (pgbouncer) delante de la base.
+- Con DEBUG se carga QueryProfilingMiddleware, que es sincrónico y bloquea un
+  hilo durante toda la petición: medir y desplegar sin DEBUG.
+- Los archivos estáticos no los sirve ASGI: usar el servidor web o WhiteNoise.
+- Comparar con WSGI: python manage.py bench_async_enroll
 """
 
 import os
@@ -0,0 +1,30 @@
+"""
+Acceso a la base desde vistas async.
+
+Las consultas simples usan el ORM async de Django (aget, acount, async for):
+internamente corren en el hilo de la petición (thread_sensitive=True).
+
+Los servicios con @transaction.atomic son código sincrónico que necesita una
+misma conexión de principio a fin: se ejecutan enteros con run_in_db_thread,
+en el pool de hilos compartido (thread_sensitive=False), para que varias
+peticiones puedan tener su transacción en curso a la vez.
+"""
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+
+async def run_in_db_thread(func, /, *args, **kwargs):
+    """
+    Ejecuta func(*args, **kwargs) en un hilo del pool y retorna su resultado
+    (las excepciones, ej. ValidationError, se propagan al que espera).
+
+    Django no cierra las conexiones de los hilos del pool al terminar la
+    petición: se cierran acá, en el mismo hilo que las abrió, según CONN_MAX_AGE.
+    """
+    def call():
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return await sync_to_async(call, thread_sensitive=False)()
@@ -0,0 +1,83 @@
+"""
+Utilidades compartidas por los comandos de benchmark (bench_*).
+"""
+import math
+from collections import defaultdict
+
+
+def percentile(sorted_values, p):
+    """
+    Percentil p (0-100) de una lista ya ordenada, por el método nearest-rank.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies):
+    """
+    Resumen de una lista de latencias en segundos: cantidad, p50, p95, p99 y máximo
+    (estos últimos en milisegundos).
+    """
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50) * 1000,
+        "p95": percentile(values, 95) * 1000,
+        "p99": percentile(values, 99) * 1000,
+        "max": (values[-1] if values else 0.0) * 1000,
+    }
+
+
+def format_summary(label, summary):
+    """
+    Línea de tabla con el resumen de latencias de una operación.
+    """
+    return (
+        f"{label:<12}{summary['count']:>9}{summary['p50']:>10.1f}"
+        f"{summary['p95']:>10.1f}{summary['p99']:>10.1f}{summary['max']:>10.1f}"
+    )
+
+
+SUMMARY_HEADER = f"{'Operación':<12}{'Total':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'máx ms':>10}"
+
+
+def plan_pending_enrollments(n_students, per_student, rng):
+    """
+    {student_id: [subject_id, ...]}: n_students alumnos activos elegidos al azar,
+    cada uno con per_student materias de su plan que todavía no cursó.
+    Lanza ValueError si el dataset no alcanza.
+    """
+    # Importaciones locales: las apps deben estar cargadas
+    from careers.models import Career
+    from enrollments.models import Enrollment
+    from students.models import Student
+
+    students = list(
+        Student.objects.filter(user__is_active=True, user__is_first_login=False, career__isnull=False)
+        .values_list("pk", "career_id")
+    )
+    rng.shuffle(students)
+    candidates = students[:n_students * 3]
+
+    plan_subjects = defaultdict(list)
+    for career_id, subject_id in Career.subjects.through.objects.values_list("career_id", "subject_id"):
+        plan_subjects[career_id].append(subject_id)
+    taken = defaultdict(set)
+    for student_id, subject_id in Enrollment.objects.filter(
+        student_id__in=[student_id for student_id, _ in candidates]
+    ).values_list("student_id", "subject_id"):
+        taken[student_id].add(subject_id)
+
+    plans = {}
+    for student_id, career_id in candidates:
+        pending = [pk for pk in plan_subjects[career_id] if pk not in taken[student_id]]
+        if len(pending) >= per_student:
+            plans[student_id] = rng.sample(pending, per_student)
+        if len(plans) == n_students:
+            return plans
+    raise ValueError(
+        f"Se necesitan {n_students} alumnos activos con {per_student} materias pendientes: "
+        "ejecutar seed_academic_data con más alumnos."
+    )
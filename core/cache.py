@@ -0,0 +1,123 @@
+"""
+Cache de las páginas del catálogo (carreras y materias).
+
+Las claves llevan la versión de cada "espacio" de datos del que dependen
+(career, subject, teacher). Las señales de los modelos incrementan la versión
+al guardar o borrar (ver careers.signals y subjects.signals): las entradas
+viejas dejan de leerse y expiran solas, sin borrar claves una por una.
+
+Las entradas se arman siempre desde el primario: la versión se incrementa al
+confirmar la transacción, y una réplica con retraso todavía podría devolver
+los datos viejos, que quedarían guardados bajo la versión nueva hasta la
+próxima edición.
+
+Las versiones se guardan en el mismo cache. Con varios procesos (gunicorn,
+uwsgi) el backend debe ser compartido (Redis, Memcached): con LocMemCache
+cada proceso vería solo sus propias invalidaciones.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from core.db_routers import PRIMARY_DB
+
+VERSION_KEY = "catalog:version:{}"
+
+
+def _new_version() -> int:
+    # Si la clave de versión se pierde (expulsión del cache), la nueva nunca
+    # coincide con una anterior: no se reutilizan entradas viejas
+    return time.time_ns()
+
+
+def get_versions(*namespaces) -> str:
+    """
+    Versión combinada de los espacios indicados, ej. "1718...:1718...".
+    """
+    keys = [VERSION_KEY.format(namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return ":".join(str(versions[key]) for key in keys)
+
+
+def bump_version(*namespaces) -> None:
+    """
+    Invalida todas las entradas que dependen de los espacios indicados.
+    Si hay una transacción en curso, la invalidación ocurre al confirmarla
+    (antes, otra petición podría volver a cachear los datos viejos).
+    """
+    def bump():
+        for namespace in namespaces:
+            key = VERSION_KEY.format(namespace)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, _new_version(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def _build_key(name, version, parts) -> str:
+    return f"catalog:{name}:{version}:" + ":".join(str(part) for part in parts)
+
+
+def catalog_key(name, namespaces, *parts) -> str:
+    """
+    Clave versionada: cambia cuando cambia alguno de los espacios de los que depende.
+    """
+    return _build_key(name, get_versions(*namespaces), parts)
+
+
+def cached(key, builder, timeout=None):
+    """
+    Retorna el valor cacheado en key o lo calcula con builder() y lo guarda.
+    """
+    if timeout is None:
+        timeout = settings.CATALOG_CACHE_TIMEOUT
+    return cache.get_or_set(key, builder, timeout)
+
+
+class CatalogCacheMixin:
+    """
+    Mixin para las vistas del catálogo.
+
+    - catalog_namespaces: espacios de datos de los que depende la página.
+    - Agrega al contexto catalog_version y catalog_cache_timeout para cachear
+      fragmentos del template con {% cache %}:
+          {% cache catalog_cache_timeout "subject_list" catalog_version page_obj.number %}
+    - En los listados paginados cachea el COUNT(*) del paginador.
+    - Lo que se cachea (filas y total de la página, objeto del detalle) se lee
+      del primario aunque la vista use ReplicaReadMixin.
+    """
+    catalog_namespaces = ()
+
+    def get_catalog_version(self) -> str:
+        if not hasattr(self, "_catalog_version"):
+            self._catalog_version = get_versions(*self.catalog_namespaces)
+        return self._catalog_version
+
+    def get_catalog_key(self, name, *parts) -> str:
+        return _build_key(name, self.get_catalog_version(), parts)
+
+    def get_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+        return super().get_object(queryset.using(PRIMARY_DB))
+
+    def get_paginator(self, queryset, *args, **kwargs):
+        queryset = queryset.using(PRIMARY_DB)
+        paginator = super().get_paginator(queryset, *args, **kwargs)
+        # Paginator.count es un cached_property: se precarga con el valor cacheado
+        paginator.count = cached(self.get_catalog_key(f"{self.__class__.__name__}.count"), queryset.count)
+        return paginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["catalog_version"] = self.get_catalog_version()
+        context["catalog_cache_timeout"] = settings.CATALOG_CACHE_TIMEOUT
+        return context
@@ -0,0 +1,108 @@
+"""
+Opciones cacheadas para los <select> de carreras, materias y profesores.
+
+Los formularios y filtros solo necesitan (id, nombre): en lugar de cargar las
+tablas completas como instancias en cada petición, las tuplas se guardan en
+el cache del catálogo (core.cache) y se invalidan con las mismas señales.
+Como las páginas del catálogo, se arman desde el primario: leídas de la
+réplica justo después de una edición, quedarían viejas bajo la versión nueva.
+"""
+from django import forms
+from django.utils.choices import BaseChoiceIterator
+
+from core.cache import cached, catalog_key
+from core.db_routers import PRIMARY_DB
+
+
+def career_choices(active_only=False) -> list:
+    """
+    [(id, nombre)] de las carreras ordenadas por nombre.
+    """
+    from careers.models import Career
+
+    def build():
+        qs = Career.objects.using(PRIMARY_DB)
+        if active_only:
+            qs = qs.filter(is_active=True)
+        return list(qs.order_by("name").values_list("id", "name"))
+
+    return cached(catalog_key("career_choices", ("career",), active_only), build)
+
+
+def subject_choices() -> list:
+    """
+    [(id, nombre)] de todas las materias ordenadas por nombre.
+    """
+    from subjects.models import Subject
+
+    def build():
+        return list(Subject.objects.using(PRIMARY_DB).order_by("name").values_list("id", "name"))
+
+    return cached(catalog_key("subject_choices", ("subject",)), build)
+
+
+def active_teacher_choices() -> list:
+    """
+    [(id, nombre)] de los profesores con usuario activo, con el mismo texto
+    que Teacher.__str__ (ej. "Lic. Ana Gómez").
+    """
+    from users.models import Teacher
+
+    def build():
+        rows = Teacher.objects.using(PRIMARY_DB).filter(user__is_active=True).values_list(
+            "id", "name", "surname", "academic_degree"
+        )
+        return [
+            (pk, str(Teacher(name=name, surname=surname, academic_degree=degree)))
+            for pk, name, surname, degree in rows
+        ]
+
+    return cached(catalog_key("teacher_choices", ("teacher",)), build)
+
+
+class CachedChoiceIterator(BaseChoiceIterator):
+    """
+    Iterador perezoso: consulta el proveedor cada vez que se renderiza el widget,
+    no al definir el formulario.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from self.field.choices_provider()
+
+    def __len__(self):
+        return len(self.field.choices_provider()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.field.choices_provider())
+
+
+class CachedChoicesMixin:
+    """
+    Para ModelChoiceField / ModelMultipleChoiceField: las opciones del widget
+    salen de choices_provider (tuplas cacheadas) y el queryset solo se usa para
+    validar el valor enviado.
+    """
+
+    def __init__(self, *args, choices_provider, **kwargs):
+        self.choices_provider = choices_provider
+        super().__init__(*args, **kwargs)
+
+    def _get_choices(self):
+        if hasattr(self, "_choices"):
+            return self._choices
+        return CachedChoiceIterator(self)
+
+    choices = property(_get_choices, forms.ChoiceField.choices.fset)
+
+
+class CachedModelChoiceField(CachedChoicesMixin, forms.ModelChoiceField):
+    pass
+
+
+class CachedModelMultipleChoiceField(CachedChoicesMixin, forms.ModelMultipleChoiceField):
+    pass
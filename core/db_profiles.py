@@ -0,0 +1,109 @@
+"""
+Perfiles de base de datos para settings.DATABASES, elegidos con la variable
+de entorno DJANGO_DB_PROFILE ("sqlite", por defecto, o "postgres").
+
+Ambos perfiles mantienen la conexión abierta entre peticiones (CONN_MAX_AGE)
+y la verifican antes de reutilizarla (CONN_HEALTH_CHECKS), así una petición no
+paga la apertura de la conexión ni falla por una conexión caída.
+
+Este módulo se importa desde settings: no debe importar nada de Django.
+"""
+import os
+
+# Segundos que una conexión se reutiliza entre peticiones (0 = una por petición).
+# Con ASGI conviene 0 y un pooler: cada petición corre en un hilo nuevo.
+DEFAULT_CONN_MAX_AGE = 60
+
+# PRAGMAs que se ejecutan al abrir cada conexión SQLite:
+# - busy_timeout: espera (ms) a que se libere el lock en lugar de fallar con
+#   "database is locked".
+# - journal_mode=WAL: los lectores no bloquean al escritor ni al revés
+#   (queda grabado en el archivo).
+# - synchronous=NORMAL: con WAL no se pierde consistencia, solo las últimas
+#   transacciones ante un corte de luz; evita un fsync por commit.
+# - cache_size (negativo = KiB) y mmap_size (bytes): más páginas en memoria.
+SQLITE_PRAGMAS = {
+    # Primero: el cambio a WAL también espera si otra conexión tiene el lock
+    "busy_timeout": 20000,
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+
+# Valores de psycopg.IsolationLevel (no se importa psycopg desde settings)
+POSTGRES_ISOLATION_LEVELS = {
+    "read_committed": 2,
+    "repeatable_read": 3,
+    "serializable": 4,
+}
+
+
+def conn_max_age() -> int:
+    return int(os.environ.get("DJANGO_CONN_MAX_AGE", DEFAULT_CONN_MAX_AGE))
+
+
+def sqlite_profile(name, pragmas=None) -> dict:
+    """
+    SQLite para varios hilos escribiendo a la vez (inscripciones y bajas).
+
+    transaction_mode IMMEDIATE: cada transacción (atomic) toma el lock de
+    escritura al empezar. Con el modo por defecto (DEFERRED) una transacción
+    que primero lee y después escribe falla con "database is locked" sin
+    esperar el busy_timeout cuando otra ya está escribiendo.
+    """
+    pragmas = {**SQLITE_PRAGMAS, **(pragmas or {})}
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        "CONN_MAX_AGE": conn_max_age(),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "init_command": ";".join(f"PRAGMA {pragma}={value}" for pragma, value in pragmas.items()),
+            "transaction_mode": "IMMEDIATE",
+        },
+    }
+
+
+def postgres_profile() -> dict:
+    """
+    PostgreSQL configurado por variables de entorno (POSTGRES_DB, POSTGRES_USER,
+    POSTGRES_PASSWORD, POSTGRES_HOST, POSTGRES_PORT). Requiere psycopg.
+
+    POSTGRES_ISOLATION_LEVEL (read_committed por defecto, repeatable_read o
+    serializable): con aislamiento estricto las transacciones que chocan fallan
+    con error de serialización y los servicios las reintentan
+    (core.transactions.retry_on_contention).
+    """
+    isolation = os.environ.get("POSTGRES_ISOLATION_LEVEL", "read_committed")
+    if isolation not in POSTGRES_ISOLATION_LEVELS:
+        raise ValueError(
+            f"POSTGRES_ISOLATION_LEVEL desconocido: {isolation!r} "
+            f"(usar {', '.join(POSTGRES_ISOLATION_LEVELS)})."
+        )
+    return {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("POSTGRES_DB", "sga"),
+        "USER": os.environ.get("POSTGRES_USER", "sga"),
+        "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+        "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
+        "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        "CONN_MAX_AGE": conn_max_age(),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "connect_timeout": 5,
+            "isolation_level": POSTGRES_ISOLATION_LEVELS[isolation],
+        },
+    }
+
+
+def database_profile(profile, sqlite_name) -> dict:
+    """
+    Configuración de la base "default" para el perfil indicado.
+    """
+    if profile == "sqlite":
+        return sqlite_profile(sqlite_name)
+    if profile == "postgres":
+        return postgres_profile()
+    raise ValueError(f"DJANGO_DB_PROFILE desconocido: {profile!r} (usar 'sqlite' o 'postgres').")
@@ -0,0 +1,145 @@
+"""
+Ruteo de lecturas a una réplica de solo lectura.
+
+- PrimaryReplicaRouter: las escrituras (y todo lo que ocurre dentro de una
+  transacción) van siempre a "default". Las lecturas van a "replica" solo
+  dentro de use_replica(), y solo si la réplica está configurada.
+- ReplicaReadMixin: opt-in por vista. Las peticiones GET de la vista (incluido
+  el render del template) leen de la réplica.
+- ReadYourWritesMiddleware: después de un POST del usuario, sus lecturas
+  vuelven a "default" durante REPLICA_READ_YOUR_WRITES_SECONDS, para que vea
+  de inmediato lo que acaba de escribir aunque la réplica tenga retraso.
+
+Para probarlo localmente con dos archivos SQLite ver el comando sync_sqlite_replica.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+
+PRIMARY_DB = "default"
+REPLICA_DB = "replica"
+
+# Cookie firmada que fija las lecturas del usuario al primario tras una escritura
+PIN_COOKIE_NAME = "db_primary_pin"
+PIN_COOKIE_SALT = "core.db_routers.read_your_writes"
+
+_read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_DB in settings.DATABASES
+
+
+@contextmanager
+def use_replica():
+    """
+    Las lecturas ejecutadas dentro del bloque pueden ir a la réplica.
+    """
+    token = _read_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Router de base de datos primario / réplica (ver DATABASE_ROUTERS en settings).
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _read_from_replica.get() or not replica_configured():
+            return PRIMARY_DB
+        # Dentro de una transacción se lee lo que la propia transacción escribió
+        if connections[PRIMARY_DB].in_atomic_block:
+            return PRIMARY_DB
+        return REPLICA_DB
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Ambas bases tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # La réplica recibe el esquema por replicación, no por migraciones
+        return db == PRIMARY_DB
+
+
+def is_pinned_to_primary(request) -> bool:
+    """
+    True si el usuario escribió hace menos de REPLICA_READ_YOUR_WRITES_SECONDS.
+    """
+    return request.get_signed_cookie(
+        PIN_COOKIE_NAME,
+        default=None,
+        salt=PIN_COOKIE_SALT,
+        max_age=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+    ) is not None
+
+
+class ReplicaReadMixin:
+    """
+    Mixin para vistas de solo lectura (listados, reportes, detalles).
+    Las peticiones GET/HEAD leen de la réplica, salvo que el usuario esté dentro
+    de la ventana de read-your-writes.
+
+    Debe ir antes de la vista genérica en la herencia, ej.:
+        class StudentListView(AdminRequiredMixin, ReplicaReadMixin, ListView)
+
+    También sirve para vistas async: el ContextVar de use_replica() llega a los
+    hilos donde corre el ORM async.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or is_pinned_to_primary(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        if self.view_is_async:
+            return self._adispatch_from_replica(request, *args, **kwargs)
+
+        with use_replica():
+            response = super().dispatch(request, *args, **kwargs)
+            # Los querysets del template se evalúan al renderizar: se renderiza acá
+            # para que también lean de la réplica.
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        return response
+
+    async def _adispatch_from_replica(self, request, *args, **kwargs):
+        with use_replica():
+            response = await super().dispatch(request, *args, **kwargs)
+            if hasattr(response, "render") and not response.is_rendered:
+                await sync_to_async(response.render)()
+        return response
+
+
+class ReadYourWritesMiddleware(MiddlewareMixin):
+    """
+    Después de una petición que escribe (POST, PUT, PATCH, DELETE) deja una cookie
+    firmada que fija las lecturas del usuario al primario por unos segundos.
+    Si no hay réplica configurada el middleware no se carga.
+    """
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def process_response(self, request, response):
+        if request.method not in ("GET", "HEAD", "OPTIONS", "TRACE"):
+            response.set_signed_cookie(
+                PIN_COOKIE_NAME,
+                "1",
+                salt=PIN_COOKIE_SALT,
+                max_age=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,210 @@
+"""
+Exportación de reportes en streaming (CSV y XLSX).
+
+Los generadores reciben los encabezados y un iterable de filas (tuplas) y
+producen el archivo por partes, sin armarlo completo en memoria: pensados
+para StreamingHttpResponse sobre queryset.values_list(...).iterator().
+"""
+import csv
+import datetime
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+# Filas que se acumulan antes de entregar un bloque de bytes al servidor
+ROWS_PER_CHUNK = 500
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Inicios de celda que Excel interpreta como fórmula (inyección de fórmulas en CSV)
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# Caracteres de control que XML 1.0 no admite: uno solo deja el XLSX ilegible
+XML_ILLEGAL_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+class Echo:
+    """
+    Objeto con interfaz de archivo que devuelve lo que se le escribe,
+    para usar csv.writer sin buffer intermedio.
+    """
+
+    def write(self, value):
+        return value
+
+
+class _ChunkBuffer:
+    """
+    Archivo de solo escritura (no seekable) que acumula bytes hasta que se retiran.
+    zipfile escribe sobre él en modo streaming (con descriptores de datos).
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def format_cell(value):
+    """
+    Convierte un valor de la base a texto para el reporte.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, datetime.datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime("%Y-%m-%d %H:%M")
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value):
+    """
+    Valor de la celda para el CSV: el texto que empieza como una fórmula se
+    antepone con ' para que Excel lo muestre como texto y no lo evalúe.
+    """
+    value = format_cell(value)
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(header, rows):
+    """
+    Genera el CSV por bloques de ROWS_PER_CHUNK filas. El primer bloque (BOM
+    y encabezados) sale antes de ejecutar la consulta.
+    """
+    writer = csv.writer(Echo())
+    # BOM para que Excel detecte UTF-8
+    yield "﻿" + writer.writerow(header)
+
+    chunk = []
+    for row in rows:
+        chunk.append(writer.writerow([_csv_cell(value) for value in row]))
+        if len(chunk) >= ROWS_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def _xml_text(value):
+    return escape(XML_ILLEGAL_CHARS.sub("", str(value)))
+
+
+def _xlsx_cell(value):
+    value = format_cell(value)
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return f'<c t="inlineStr"><is><t>{_xml_text(value)}</t></is></c>'
+    return f"<c><v>{value}</v></c>"
+
+
+def _xlsx_row(values):
+    return "<row>" + "".join(_xlsx_cell(value) for value in values) + "</row>"
+
+
+XLSX_STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+def _xlsx_workbook(sheet_name):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{_xml_text(sheet_name[:31])}" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    )
+
+
+def stream_xlsx(header, rows, sheet_name="Reporte"):
+    """
+    Genera un XLSX mínimo (una hoja, celdas de texto en línea, sin estilos)
+    escribiendo el zip en streaming: la hoja se comprime a medida que llegan
+    las filas y se entrega por bloques de ROWS_PER_CHUNK filas.
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for name, content in XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        archive.writestr("xl/workbook.xml", _xlsx_workbook(sheet_name))
+
+        with archive.open("xl/worksheets/sheet1.xml", mode="w") as sheet:
+            sheet.write((
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+                + _xlsx_row(header)
+            ).encode())
+            # Primer bloque (partes fijas y encabezados) antes de ejecutar la consulta
+            yield buffer.take()
+
+            chunk = []
+            for row in rows:
+                chunk.append(_xlsx_row(row))
+                if len(chunk) >= ROWS_PER_CHUNK:
+                    sheet.write("".join(chunk).encode())
+                    chunk = []
+                    data = buffer.take()
+                    if data:
+                        yield data
+            sheet.write(("".join(chunk) + "</sheetData></worksheet>").encode())
+    yield buffer.take()
+
+
+EXPORT_FORMATS = {
+    "csv": (stream_csv, "text/csv; charset=utf-8"),
+    "xlsx": (stream_xlsx, XLSX_CONTENT_TYPE),
+}
+
+
+def streaming_export_response(export_format, filename, header, rows):
+    """
+    StreamingHttpResponse con el reporte en el formato indicado ("csv" o "xlsx").
+    filename va sin extensión.
+    """
+    generate, content_type = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(generate(header, rows), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{export_format}"'
+    return response
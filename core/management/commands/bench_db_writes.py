@@ -0,0 +1,189 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, close_old_connections, connections
+
+from core.benchmarks import SUMMARY_HEADER, format_summary, plan_pending_enrollments, summarize
+from core.transactions import contention_counters
+from enrollments.services import EnrollmentService
+from students.models import Student
+
+
+# Configuración anterior a core.db_profiles: sin OPTIONS y una conexión nueva por petición
+PREVIOUS_PROFILE = {"OPTIONS": {}, "CONN_MAX_AGE": 0, "CONN_HEALTH_CHECKS": False}
+
+
+@contextmanager
+def database_settings(overrides, setup_sql=()):
+    """
+    Aplica overrides a la configuración de "default" mientras dura el bloque.
+    Las conexiones abiertas se cierran: las nuevas se abren con la configuración
+    modificada (los hilos comparten el diccionario de settings).
+
+    Antes de empezar abre una conexión (que ejecuta el init_command del perfil)
+    y ejecuta setup_sql, sin otros hilos conectados.
+    """
+    db = connections.settings[DEFAULT_DB_ALIAS]
+    saved = {key: db[key] for key in overrides}
+    connections.close_all()
+    db.update(overrides)
+    try:
+        with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+            for sql in setup_sql:
+                cursor.execute(sql)
+        connections.close_all()
+        yield
+    finally:
+        connections.close_all()
+        db.update(saved)
+
+
+class Command(BaseCommand):
+    """
+    Mide el throughput de escritura de la base con varios hilos inscribiendo y
+    dando de baja alumnos a la vez (EnrollmentService, sin HTTP), con la
+    configuración anterior (sin OPTIONS, CONN_MAX_AGE=0) y con el perfil de
+    DJANGO_DB_PROFILE (ver core/db_profiles.py).
+
+    Cada operación se trata como una petición: antes y después se llama a
+    close_old_connections(), como hace Django al empezar y terminar cada una,
+    así se paga (o no) la apertura de la conexión según CONN_MAX_AGE.
+
+    Reporta p50/p95/p99, escrituras confirmadas por segundo, los errores de lock
+    ("database is locked", incluidos los que agotaron los reintentos de
+    retry_on_contention) y la cantidad de reintentos de cada configuración.
+
+    Opera sobre la base configurada y MODIFICA sus datos: usarlo sobre un
+    dataset generado con seed_academic_data.
+
+    Ejemplo:
+        python manage.py seed_academic_data --students 5000
+        python manage.py bench_db_writes --threads 16 --operations 20
+    """
+    help = "Benchmark de escrituras concurrentes: configuración anterior contra el perfil de base actual."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8, help="Hilos concurrentes (un alumno cada uno).")
+        parser.add_argument("--operations", type=int, default=10,
+                            help="Inscripciones por hilo (cada una seguida de su baja).")
+        parser.add_argument("--seed", type=int, default=None, help="Semilla para reproducir la corrida.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        # Alumnos distintos para cada configuración
+        try:
+            plans = plan_pending_enrollments(options["threads"] * 2, options["operations"], rng)
+        except ValueError as e:
+            raise CommandError(f"{e} O bajar --threads/--operations.")
+        students = Student.objects.select_related("user").in_bulk(list(plans))
+        pool = [(students[student_id], subject_ids) for student_id, subject_ids in plans.items()]
+
+        vendor = connections[DEFAULT_DB_ALIAS].vendor
+        profile = connections.settings[DEFAULT_DB_ALIAS]
+        configurations = [
+            # El modo WAL queda grabado en el archivo: se vuelve al journal clásico
+            ("Anterior", PREVIOUS_PROFILE, ["PRAGMA journal_mode=DELETE"] if vendor == "sqlite" else []),
+            ("Perfil", {key: profile[key] for key in PREVIOUS_PROFILE}, []),
+        ]
+
+        # Los errores de lock y los reintentos se cuentan en el reporte
+        quiet_loggers = [logging.getLogger(name) for name in ("django.db.backends", "core.transactions")]
+        levels = [logger.level for logger in quiet_loggers]
+        for logger in quiet_loggers:
+            logger.setLevel(logging.CRITICAL)
+        try:
+            rows = []
+            for index, (label, overrides, setup_sql) in enumerate(configurations):
+                phase = pool[index * options["threads"]:(index + 1) * options["threads"]]
+                with database_settings(overrides, setup_sql):
+                    rows.append((label, self._run(phase)))
+        finally:
+            for logger, level in zip(quiet_loggers, levels):
+                logger.setLevel(level)
+
+        self._report(rows, vendor, options)
+
+    def _run(self, phase):
+        """
+        Lanza un hilo por alumno y espera a que terminen todos.
+        """
+        results = {"enroll": [], "drop": [], "written": 0, "locked": 0, "rejected": 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(len(phase) + 1)
+
+        threads = [
+            threading.Thread(target=self._worker, args=(student, subject_ids, results, lock, barrier))
+            for student, subject_ids in phase
+        ]
+        contention_counters.reset()
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        results["elapsed"] = time.perf_counter() - start
+        results["retries"] = contention_counters.snapshot()["retries"]
+        return results
+
+    def _worker(self, student, subject_ids, results, lock, barrier):
+        latencies = {"enroll": [], "drop": []}
+        written = locked = rejected = 0
+
+        def request(action, func, *args, **kwargs):
+            nonlocal written, locked, rejected
+            close_old_connections()
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                written += 1
+                return result
+            except OperationalError:
+                locked += 1
+            except ValidationError as e:
+                # Reintentos agotados (retry_on_contention) o una regla de negocio (cupo completo)
+                if e.code == "contention":
+                    locked += 1
+                else:
+                    rejected += 1
+            finally:
+                latencies[action].append(time.perf_counter() - start)
+                close_old_connections()
+
+        barrier.wait()
+        try:
+            for subject_id in subject_ids:
+                enrollment = request("enroll", EnrollmentService.create_enrollment,
+                                     user=student.user, subject_id=subject_id)
+                if enrollment is not None:
+                    request("drop", EnrollmentService.unenroll_student, student, enrollment.pk)
+        finally:
+            connections.close_all()
+
+        with lock:
+            for action, values in latencies.items():
+                results[action].extend(values)
+            results["written"] += written
+            results["locked"] += locked
+            results["rejected"] += rejected
+
+    def _report(self, rows, vendor, options):
+        self.stdout.write(
+            f"{vendor}: {options['threads']} hilos x {options['operations']} inscripciones (+ bajas)"
+        )
+        for label, results in rows:
+            self.stdout.write(f"\n{label}: {results['written'] / results['elapsed']:.1f} escrituras "
+                              f"confirmadas/s en {results['elapsed']:.2f} s")
+            self.stdout.write(SUMMARY_HEADER)
+            self.stdout.write(format_summary("Inscripción", summarize(results["enroll"])))
+            self.stdout.write(format_summary("Baja", summarize(results["drop"])))
+            style = self.style.ERROR if results["locked"] else self.style.SUCCESS
+            self.stdout.write(style(
+                f"Errores de lock: {results['locked']} | Reintentos: {results['retries']} | "
+                f"Rechazadas por reglas de negocio: {results['rejected']}"
+            ))
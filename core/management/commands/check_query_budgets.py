@@ -0,0 +1,88 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings,
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from core.profiling import get_query_budget
+from core.testing import (
+    FAST_PASSWORD_HASHERS,
+    budget_client,
+    iter_budget_urls,
+    measure_url,
+    seed_query_budget_dataset,
+)
+
+class Command(BaseCommand):
+    """
+    Recorre todas las URLs de core/urls.py contra un dataset de prueba y verifica
+    que ninguna vista supere su presupuesto de consultas (atributo query_budget).
+
+    Crea una base de datos de test, por lo que no modifica la base configurada.
+
+    Ejemplo:
+        python manage.py check_query_budgets
+        python manage.py check_query_budgets --strict --verbose
+    """
+    help = "Verifica el presupuesto de consultas SQL (query_budget) de cada vista."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--strict", action="store_true",
+                            help="Falla también si alguna vista no declara query_budget.")
+        parser.add_argument("--verbose", action="store_true",
+                            help="Muestra las consultas repetidas de cada vista.")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={"default"})
+        try:
+            with override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS):
+                users = seed_query_budget_dataset()
+                failures, missing = self._check_urls(users, options["verbose"])
+        finally:
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        if failures or (options["strict"] and missing):
+            raise CommandError(
+                f"{len(failures)} vista(s) superan su presupuesto o no responden 2xx, {len(missing)} sin presupuesto."
+            )
+        self.stdout.write(self.style.SUCCESS("Todas las vistas respetan su presupuesto de consultas."))
+
+    def _check_urls(self, users, verbose):
+        failures, missing = [], []
+        clients = {}
+
+        for name, path, role, callback in iter_budget_urls():
+            if role not in clients:
+                clients[role] = budget_client(users, role)
+
+            response, profile = measure_url(clients[role], path)
+            if response.status_code == 405:
+                # Vistas que solo aceptan POST: el presupuesto se mide sobre GET
+                continue
+            budget = get_query_budget(callback)
+            line = f"{name:<45} {response.status_code}  {profile.count:>3} consultas  {profile.total_time * 1000:7.2f} ms"
+
+            if not 200 <= response.status_code < 300:
+                # Redirección, 403 o 500: la cantidad de consultas no dice nada de la vista
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"ESTADO {response.status_code}      {line}"))
+            elif budget is None:
+                missing.append(name)
+                self.stdout.write(self.style.WARNING(f"SIN PRESUPUESTO  {line}"))
+            elif profile.count > budget:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"EXCEDIDO ({budget:>2})    {line}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"OK ({budget:>2})          {line}"))
+
+            duplicates = profile.duplicates()
+            if duplicates and (verbose or (budget is not None and profile.count > budget)):
+                for sql, n in duplicates.items():
+                    self.stdout.write(f"    {n}x {sql[:200]}")
+
+        return failures, missing
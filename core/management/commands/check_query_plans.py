@@ -0,0 +1,149 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+
+
+# Patrones que indican que el motor recorre la tabla completa
+FULL_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (?P<table>\w+)(?! USING)\s*$"),
+    "postgresql": re.compile(r"\bSeq Scan on (?P<table>\w+)"),
+}
+
+# Patrones informativos (ordenamientos en memoria / disco)
+SORT_PATTERNS = {
+    "sqlite": re.compile(r"USE TEMP B-TREE FOR"),
+    "postgresql": re.compile(r"\bSort\b"),
+}
+
+
+def _view_queryset(view_class, params=None, profile=None, **kwargs):
+    """
+    Obtiene el queryset que arma la vista para los parámetros GET indicados,
+    limitado a una página como lo carga la vista. profile es el request.profile
+    que reciben las vistas por rol (alumno o profesor) y kwargs los de la URL.
+    """
+    request = RequestFactory().get("/", params or {})
+    request.profile = profile
+    view = view_class()
+    view.setup(request, **kwargs)
+    queryset = view.get_queryset()
+
+    if getattr(view, "search_ids", None) is not None:
+        # Con búsqueda la vista carga por id solo los alumnos de la página
+        return queryset.filter(pk__in=view.search_ids[:view.paginate_by] or [0])
+    if getattr(view, "pk_url_kwarg", None) in kwargs:
+        # DetailView: get_object() filtra el queryset por la clave primaria
+        return queryset.filter(pk=kwargs[view.pk_url_kwarg])
+    if getattr(view, "paginate_by", None):
+        queryset = queryset[: view.paginate_by + 1]
+    return queryset
+
+
+def _query_plans():
+    """
+    Querysets de cada vista a verificar: (nombre, función que construye el queryset).
+    Cada entrada se arma con el get_queryset() de la vista. Los ids usados son
+    ficticios (el plan no depende de que existan las filas), salvo la materia
+    del profesor, que la vista busca antes de armar el queryset.
+    """
+    from enrollments.models import Enrollment
+    from enrollments.views import EnrollmentAdminListView, MyEnrollmentListView, StudentEnrollmentListView
+    from students.models import Student
+    from students.views import StudentDetailView, StudentListView
+    from subjects.models import Subject
+    from subjects.views import SubjectEnrollmentListView
+
+    student = Student(pk=1, career_id=1)
+
+    def subject_enrollments():
+        subject = Subject.objects.filter(teacher__isnull=False).select_related("teacher").order_by("pk").first()
+        if subject is None:
+            return None
+        return _view_queryset(SubjectEnrollmentListView, profile=subject.teacher, pk=subject.pk)
+
+    return [
+        ("enrollments:enrollment_admin_list",
+         lambda: _view_queryset(EnrollmentAdminListView)),
+        ("enrollments:enrollment_admin_list?status",
+         lambda: _view_queryset(EnrollmentAdminListView, {"status": "activa"})),
+        ("enrollments:enrollment_admin_list?subject_id",
+         lambda: _view_queryset(EnrollmentAdminListView, {"subject_id": 1})),
+        ("enrollments:enrollment_admin_list?career_id",
+         lambda: _view_queryset(EnrollmentAdminListView, {"career_id": 1})),
+        ("enrollments:enrollment_admin_list?student_dni",
+         lambda: _view_queryset(EnrollmentAdminListView, {"student_dni": "30123456"})),
+        ("enrollments:my_enrollments",
+         lambda: _view_queryset(MyEnrollmentListView, profile=student)),
+        ("enrollments:enrollment_list",
+         lambda: _view_queryset(StudentEnrollmentListView, profile=student)),
+        ("students:student_list",
+         lambda: _view_queryset(StudentListView)),
+        ("students:student_list?search",
+         lambda: _view_queryset(StudentListView, {"search": "perez"})),
+        ("students:student_detail (historial)",
+         lambda: StudentDetailView.enrollment_history(student)[:10]),
+        ("subjects:subject_enrollment_list",
+         subject_enrollments),
+        ("cupo (inscripciones activas por materia)",
+         lambda: Enrollment.objects.filter(subject_id=1, status="activa").order_by().values("id")),
+        ("students:student_detail",
+         lambda: _view_queryset(StudentDetailView, pk=1)),
+    ]
+
+
+class Command(BaseCommand):
+    """
+    Ejecuta EXPLAIN sobre el queryset de cada vista y falla si alguno recorre
+    una tabla completa en lugar de usar un índice.
+
+    Ejemplo:
+        python manage.py check_query_plans
+        python manage.py check_query_plans --verbose
+    """
+    help = "Verifica que las consultas de las vistas principales usen índices (EXPLAIN)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose", action="store_true", help="Muestra el plan completo de cada consulta.")
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in FULL_SCAN_PATTERNS:
+            raise CommandError(f"Motor de base de datos no soportado: {vendor}")
+
+        if vendor == "postgresql":
+            # Con tablas chicas PostgreSQL prefiere Seq Scan aunque exista el índice.
+            # Desalentamos el Seq Scan para ver si hay un índice utilizable.
+            with connection.cursor() as cursor:
+                cursor.execute("SET enable_seqscan = off")
+
+        failures = []
+        for name, build in _query_plans():
+            queryset = build()
+            if queryset is None:
+                self.stdout.write(self.style.WARNING(f"SIN DATOS  {name}"))
+                continue
+            plan = queryset.explain()
+            scans = [
+                match.group("table")
+                for line in plan.splitlines()
+                if (match := FULL_SCAN_PATTERNS[vendor].search(line))
+            ]
+            sorts = any(SORT_PATTERNS[vendor].search(line) for line in plan.splitlines())
+
+            if scans:
+                failures.append(name)
+                self.stdout.write(self.style.ERROR(f"FULL SCAN  {name}: {', '.join(scans)}"))
+            elif sorts:
+                self.stdout.write(self.style.WARNING(f"OK (sort)  {name}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"OK         {name}"))
+
+            if options["verbose"] or scans:
+                self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(f"{len(failures)} consulta(s) recorren tablas completas.")
+
+        self.stdout.write(self.style.SUCCESS("Todas las consultas usan índices."))
@@ -0,0 +1,62 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    """
+    Borra las sesiones vencidas de django_session por lotes.
+
+    clearsessions de Django las borra con un único DELETE: con muchas sesiones
+    acumuladas (ej. después del día de inscripción) la tabla queda bloqueada
+    mientras dura. Acá cada lote es un DELETE corto por clave primaria, con una
+    pausa opcional entre lotes para no competir con las peticiones.
+
+    En el cache de sesiones las entradas vencen solas (SESSION_COOKIE_AGE).
+
+    Ejemplo:
+        python manage.py purge_sessions
+        python manage.py purge_sessions --chunk-size 2000 --pause 0.1
+        python manage.py purge_sessions --dry-run
+    """
+    help = "Borra las sesiones vencidas de la base en lotes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000, help="Sesiones por DELETE.")
+        parser.add_argument("--pause", type=float, default=0.0, help="Segundos de espera entre lotes.")
+        parser.add_argument("--dry-run", action="store_true", help="Solo cuenta las sesiones vencidas.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser mayor a 0.")
+
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+        if not hasattr(store, "get_model_class"):
+            raise CommandError(f"El motor de sesiones {settings.SESSION_ENGINE} no guarda sesiones en la base.")
+        Session = store.get_model_class()
+
+        # Corte fijo: las sesiones que vencen mientras corre el comando quedan para la próxima
+        expired = Session.objects.filter(expire_date__lt=timezone.now())
+
+        if options["dry_run"]:
+            self.stdout.write(f"{expired.count()} sesiones vencidas.")
+            return
+
+        start = time.perf_counter()
+        deleted = 0
+        while True:
+            keys = list(expired.values_list("pk", flat=True)[:options["chunk_size"]])
+            if not keys:
+                break
+            deleted += Session.objects.filter(pk__in=keys).delete()[0]
+            if len(keys) < options["chunk_size"]:
+                break
+            if options["pause"]:
+                time.sleep(options["pause"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{deleted} sesiones vencidas borradas en {time.perf_counter() - start:.1f} s."
+        ))
@@ -0,0 +1,267 @@
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from careers.models import Career
+from core.testing import FAST_PASSWORD_HASHERS
+from enrollments.models import Enrollment
+from enrollments.services import EnrollmentService, EnrollmentStatsService
+from students.services import StudentProgressService, StudentService
+from subjects.models import Subject
+from users.models import Teacher
+from users.services.teacher_service import TeacherService
+
+User = get_user_model()
+
+# Dominio de los emails generados: identifica los datos sintéticos
+SEED_EMAIL_DOMAIN = "seed.test"
+
+FIRST_NAMES = [
+    "Lucía", "Martín", "Sofía", "Mateo", "Valentina", "Santiago", "Camila", "Benjamín",
+    "Julieta", "Tomás", "Martina", "Joaquín", "Catalina", "Lautaro", "Florencia", "Agustín",
+]
+SURNAMES = [
+    "González", "Rodríguez", "Gómez", "Fernández", "López", "Díaz", "Martínez", "Pérez",
+    "García", "Sánchez", "Romero", "Sosa", "Torres", "Álvarez", "Ruiz", "Ramírez",
+]
+
+# Distribución de estados de las inscripciones de semestres anteriores
+HISTORY_STATUSES = ["aprobada", "reprobada", "regular", "ausente", "baja"]
+HISTORY_WEIGHTS = [60, 12, 10, 8, 10]
+
+CHUNK_SIZE = 500
+
+
+def _previous_semesters(count):
+    """
+    Semestres anteriores al actual, del más reciente al más antiguo, como
+    (código "YYYY-N", fecha dentro del semestre).
+    """
+    today = timezone.now().date()
+    year, half = today.year, 1 if today.month <= 6 else 2
+    semesters = []
+    for _ in range(count):
+        year, half = (year, 1) if half == 2 else (year - 1, 2)
+        semesters.append((f"{year}-{half}", date(year, 3 if half == 1 else 8, 15)))
+    return semesters
+
+
+class Command(BaseCommand):
+    """
+    Genera un dataset sintético para reproducir la carga del día de inscripción:
+    carreras, materias, profesores y alumnos con historial académico.
+
+    Los profesores y alumnos se crean con los servicios (TeacherService,
+    StudentService) y las inscripciones del semestre actual con
+    EnrollmentService.bulk_enroll. El historial de semestres anteriores se
+    inserta en bloque y al final se reconstruyen las estadísticas y el cupo.
+
+    Para que sea rápido, las contraseñas se guardan con un hasher liviano (MD5):
+    los usuarios generados están pensados para bench_registration (force_login),
+    no para iniciar sesión desde el formulario.
+
+    Ejemplo:
+        python manage.py seed_academic_data --students 50000
+        python manage.py seed_academic_data --careers 3 --subjects 24 --students 2000 --seed 7
+    """
+    help = "Genera carreras, materias, profesores y alumnos sintéticos con historial de inscripciones."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--careers", type=int, default=5, help="Cantidad de carreras.")
+        parser.add_argument("--subjects", type=int, default=60, help="Cantidad total de materias.")
+        parser.add_argument("--teachers", type=int, default=30, help="Cantidad de profesores.")
+        parser.add_argument("--students", type=int, default=50000, help="Cantidad de alumnos.")
+        parser.add_argument("--semesters", type=int, default=6,
+                            help="Semestres de historial hacia atrás.")
+        parser.add_argument("--seed", type=int, default=None, help="Semilla para reproducir el dataset.")
+
+    def handle(self, *args, **options):
+        if options["careers"] < 1 or options["subjects"] < options["careers"] or options["teachers"] < 1:
+            raise CommandError("Se necesita al menos una carrera, un profesor y una materia por carrera.")
+        if User.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").exists():
+            raise CommandError(f"Ya existen datos generados (usuarios @{SEED_EMAIL_DOMAIN}).")
+
+        self.random = random.Random(options["seed"])
+        start = time.perf_counter()
+
+        with override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS):
+            teachers = self._create_teachers(options["teachers"])
+            plans = self._create_careers(options["careers"], options["subjects"], teachers)
+            students_by_career = self._create_students(options["students"], plans)
+
+        history = self._create_history(plans, students_by_career, options["semesters"])
+        active = self._create_current_enrollments(plans, students_by_career)
+        stats = EnrollmentStatsService.rebuild()
+        # El historial se crea con bulk_create (sin señales): el avance se recalcula al final
+        student_ids = [student_id for ids in students_by_career.values() for student_id in ids]
+        for chunk_start in range(0, len(student_ids), StudentProgressService.CHUNK_SIZE):
+            StudentProgressService.rebuild_chunk(
+                student_ids[chunk_start:chunk_start + StudentProgressService.CHUNK_SIZE]
+            )
+
+        # Sin cambio de contraseña pendiente, para poder usarlos en los benchmarks
+        User.objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}").update(is_first_login=False)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(teachers)} profesores, {len(plans)} carreras, "
+            f"{sum(len(subjects) for subjects in plans.values())} materias, "
+            f"{sum(len(ids) for ids in students_by_career.values())} alumnos, "
+            f"{history} inscripciones históricas y {active} activas "
+            f"({stats['stats_rows']} filas de estadísticas) en {time.perf_counter() - start:.1f} s."
+        ))
+
+    def _person_name(self):
+        return self.random.choice(FIRST_NAMES), self.random.choice(SURNAMES)
+
+    def _create_teachers(self, count):
+        teachers = []
+        degrees = [degree for degree, _ in Teacher.ACADEMIC_DEGREE_CHOICES]
+        with transaction.atomic():
+            for n in range(count):
+                name, surname = self._person_name()
+                teachers.append(TeacherService.create_teacher({
+                    "email": f"profesor{n}@{SEED_EMAIL_DOMAIN}",
+                    "dni": f"{20000000 + n}",
+                    "name": name,
+                    "surname": surname,
+                    "academic_degree": self.random.choice(degrees),
+                    "hire_date": date(2010, 3, 1) + timedelta(days=self.random.randrange(5000)),
+                }))
+        self.stdout.write(f"{count} profesores creados.")
+        return teachers
+
+    def _create_careers(self, careers, subjects, teachers):
+        """
+        Crea las carreras y reparte las materias entre ellas (en orden de plan).
+        Si la división no es exacta, las primeras carreras reciben una materia más.
+        Retorna {career_id: [subject_id, ...]}.
+        """
+        plans = {}
+        per_career, remainder = divmod(subjects, careers)
+        with transaction.atomic():
+            for c in range(careers):
+                career = Career.objects.create(
+                    name=f"Carrera {c + 1} (seed)",
+                    description="Carrera generada por seed_academic_data.",
+                )
+                career_subjects = [
+                    Subject.objects.create(
+                        name=f"Carrera {c + 1} (seed) - Materia {s + 1}",
+                        teacher=self.random.choice(teachers),
+                        # El cupo real se ajusta a la demanda en _create_current_enrollments
+                        quota=30,
+                    )
+                    for s in range(per_career + (c < remainder))
+                ]
+                career.subjects.set(career_subjects)
+                plans[career.pk] = [subject.pk for subject in career_subjects]
+        self.stdout.write(f"{careers} carreras y {subjects} materias creadas.")
+        return plans
+
+    def _create_students(self, count, plans):
+        """
+        Crea los alumnos con StudentService en transacciones de CHUNK_SIZE.
+        Retorna {career_id: [student_id, ...]}.
+        """
+        career_ids = list(plans)
+        careers = {career.pk: career for career in Career.objects.filter(pk__in=career_ids)}
+        students_by_career = {career_id: [] for career_id in career_ids}
+
+        for chunk_start in range(0, count, CHUNK_SIZE):
+            with transaction.atomic():
+                for n in range(chunk_start, min(chunk_start + CHUNK_SIZE, count)):
+                    name, surname = self._person_name()
+                    career_id = self.random.choice(career_ids)
+                    student = StudentService.create_student({
+                        "email": f"alumno{n}@{SEED_EMAIL_DOMAIN}",
+                        "dni": f"{30000000 + n}",
+                        "name": name,
+                        "surname": surname,
+                        "career": careers[career_id],
+                        "birth_date": date(1995, 1, 1) + timedelta(days=self.random.randrange(3650)),
+                    })
+                    students_by_career[career_id].append(student.pk)
+            self.stdout.write(f"  {min(chunk_start + CHUNK_SIZE, count)}/{count} alumnos")
+        return students_by_career
+
+    def _create_history(self, plans, students_by_career, semesters):
+        """
+        Historial de semestres anteriores: cada alumno cursó las primeras materias
+        de su plan (dos por semestre) con estados finales variados.
+        enrolled_at es auto_now_add, así que la fecha se corrige después por semestre.
+        """
+        past = _previous_semesters(semesters)
+        by_semester = {code: [] for code, _ in past}
+        total = 0
+
+        for career_id, student_ids in students_by_career.items():
+            plan = plans[career_id]
+            for student_id in student_ids:
+                # Cuántas materias ya cursó (deja al menos una para inscribirse)
+                taken = self.random.randint(0, min(len(plan) - 1, semesters * 2))
+                for index, subject_id in enumerate(plan[:taken]):
+                    code = past[min((taken - 1 - index) // 2, semesters - 1)][0]
+                    by_semester[code].append(Enrollment(
+                        student_id=student_id,
+                        subject_id=subject_id,
+                        semester=code,
+                        status=self.random.choices(HISTORY_STATUSES, HISTORY_WEIGHTS)[0],
+                    ))
+
+        dates = dict(past)
+        for code, enrollments in by_semester.items():
+            enrolled_at = timezone.make_aware(datetime.combine(dates[code], dt_time(10, 0)))
+            with transaction.atomic():
+                created = Enrollment.objects.bulk_create(enrollments, batch_size=CHUNK_SIZE)
+                pks = [enrollment.pk for enrollment in created]
+                for chunk_start in range(0, len(pks), CHUNK_SIZE):
+                    Enrollment.objects.filter(pk__in=pks[chunk_start:chunk_start + CHUNK_SIZE]).update(
+                        enrolled_at=enrolled_at
+                    )
+            total += len(created)
+        self.stdout.write(f"{total} inscripciones históricas creadas.")
+        return total
+
+    def _create_current_enrollments(self, plans, students_by_career):
+        """
+        Inscripciones activas del semestre actual con EnrollmentService.bulk_enroll:
+        la mitad de los alumnos se anota en su próxima materia. El cupo de cada
+        materia se fija cerca de la demanda para que queden pocos lugares libres.
+        """
+        taken = {}
+        for student_id, subject_id in Enrollment.objects.values_list("student_id", "subject_id").iterator(
+            chunk_size=5000
+        ):
+            taken.setdefault(student_id, set()).add(subject_id)
+
+        demand = {}
+        for career_id, student_ids in students_by_career.items():
+            for student_id in student_ids:
+                if self.random.random() < 0.5:
+                    continue
+                pending = [s for s in plans[career_id] if s not in taken.get(student_id, ())]
+                if pending:
+                    demand.setdefault(pending[0], []).append(student_id)
+
+        for subject_ids in plans.values():
+            for subject_id in subject_ids:
+                requested = len(demand.get(subject_id, []))
+                Subject.objects.filter(pk=subject_id).update(
+                    quota=max(int(requested * self.random.uniform(1.0, 1.25)) + 5, 30)
+                )
+
+        total = 0
+        for subject_id, student_ids in demand.items():
+            for chunk_start in range(0, len(student_ids), CHUNK_SIZE):
+                result = EnrollmentService.bulk_enroll(
+                    student_ids[chunk_start:chunk_start + CHUNK_SIZE], [subject_id]
+                )
+                total += len(result["created"])
+        self.stdout.write(f"{total} inscripciones activas creadas.")
+        return total
@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.db_routers import PRIMARY_DB, REPLICA_DB, replica_configured
+
+
+class Command(BaseCommand):
+    """
+    Copia la base SQLite primaria sobre la réplica (API de backup de SQLite).
+
+    Sirve para probar el ruteo primario / réplica localmente con dos archivos:
+    la réplica no recibe migraciones, recibe el esquema y los datos con esta copia.
+    Entre una sincronización y la siguiente la réplica queda "atrasada", igual
+    que una réplica real con retraso de replicación.
+
+    Ejemplo:
+        export DJANGO_REPLICA_DB=replica.sqlite3
+        python manage.py migrate
+        python manage.py sync_sqlite_replica
+        python manage.py sync_sqlite_replica --every 5
+    """
+    help = "Sincroniza la réplica SQLite local copiando la base primaria."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--every", type=float, default=None,
+                            help="Repite la copia cada N segundos (hasta Ctrl+C).")
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError("No hay réplica configurada: definir la variable DJANGO_REPLICA_DB.")
+
+        primary, replica = connections[PRIMARY_DB], connections[REPLICA_DB]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("sync_sqlite_replica solo funciona con bases SQLite.")
+
+        while True:
+            start = time.perf_counter()
+            primary.ensure_connection()
+            replica.ensure_connection()
+            primary.connection.backup(replica.connection)
+            self.stdout.write(self.style.SUCCESS(
+                f"Réplica sincronizada en {(time.perf_counter() - start) * 1000:.0f} ms."
+            ))
+            if options["every"] is None:
+                break
+            time.sleep(options["every"])
@@ -0,0 +1,195 @@
+import datetime
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class KeysetPage:
+    """
+    Página obtenida por cursor. Expone la misma interfaz básica que
+    django.core.paginator.Page para poder usarse desde los templates.
+    """
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None, is_first=False):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.is_first = is_first
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None or not self.is_first
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginador por cursor (seek pagination).
+
+    En lugar de OFFSET, cada página filtra a partir de la clave de orden de la
+    última fila vista, por lo que el costo de una página profunda es igual al
+    de la primera. Los cursores son tokens firmados y opacos.
+
+    ordering debe identificar unívocamente cada fila (ej. ("-enrolled_at", "-id")).
+    Con with_count=True además se calcula el total (un COUNT(*) por página).
+    """
+    salt = "core.pagination.keyset"
+
+    def __init__(self, queryset, per_page, ordering, with_count=False):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.with_count = with_count
+        self._count = None
+
+    @property
+    def count(self):
+        """
+        Total de filas, o None en modo sin conteo.
+        """
+        if not self.with_count:
+            return None
+        if self._count is None:
+            self._count = self.queryset.count()
+        return self._count
+
+    # --- Cursores ---
+
+    def _fields(self):
+        return [(name.lstrip("-"), name.startswith("-")) for name in self.ordering]
+
+    def encode_cursor(self, obj, direction):
+        values = [getattr(obj, name) for name, _ in self._fields()]
+        return signing.dumps(
+            {"d": direction, "v": values}, salt=self.salt, compress=True, serializer=_CursorSerializer
+        )
+
+    def decode_cursor(self, cursor):
+        """
+        Retorna (dirección, valores) o (None, None) si el cursor es inválido.
+        """
+        if not cursor:
+            return None, None
+        try:
+            data = signing.loads(cursor, salt=self.salt, serializer=_CursorSerializer)
+            model = self.queryset.model
+            values = [
+                model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self._fields(), data["v"], strict=True)
+            ]
+        except (signing.BadSignature, KeyError, TypeError, ValueError, LookupError):
+            return None, None
+        if data["d"] not in ("next", "prev"):
+            return None, None
+        return data["d"], values
+
+    # --- Consulta ---
+
+    def _seek_filter(self, values, forward):
+        """
+        Construye la condición lexicográfica "fila posterior a values" según el orden.
+        Ej. para (-enrolled_at, -id): enrolled_at < v0 OR (enrolled_at = v0 AND id < v1).
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(self._fields(), values):
+            lookup = "lt" if descending == forward else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_page(self, cursor=None):
+        direction, values = self.decode_cursor(cursor)
+        forward = direction != "prev"
+
+        ordering = self.ordering
+        if not forward:
+            ordering = tuple(name[1:] if name.startswith("-") else f"-{name}" for name in ordering)
+
+        qs = self.queryset.order_by(*ordering)
+        if values is not None:
+            qs = qs.filter(self._seek_filter(values, forward))
+
+        # Pedimos una fila extra para saber si hay más resultados en esa dirección
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if not forward:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or not forward:
+                next_cursor = self.encode_cursor(rows[-1], "next")
+            if (forward and values is not None) or (not forward and has_more):
+                previous_cursor = self.encode_cursor(rows[0], "prev")
+
+        is_first = values is None or (not forward and not has_more)
+        return KeysetPage(rows, self, next_cursor, previous_cursor, is_first=is_first)
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """
+    Igual que DjangoJSONEncoder pero sin truncar los microsegundos:
+    el cursor tiene que reproducir exactamente la clave de la fila.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class _CursorSerializer:
+    """
+    Serializador JSON que admite fechas, decimales y UUIDs en los valores del cursor.
+    """
+
+    def dumps(self, obj):
+        return _CursorEncoder(separators=(",", ":")).encode(obj).encode("latin-1")
+
+    def loads(self, data):
+        return signing.JSONSerializer().loads(data)
+
+
+class KeysetPaginationMixin:
+    """
+    Mixin para ListView que reemplaza la paginación por OFFSET por paginación por cursor.
+
+    Atributos:
+    - keyset_ordering: orden único de las filas (debe incluir la PK al final).
+    - keyset_with_count: si es True se muestra el total (agrega un COUNT por página).
+    - cursor_kwarg: nombre del parámetro GET con el cursor.
+
+    Uso:
+        class MiListado(KeysetPaginationMixin, ListView):
+            paginate_by = 20
+            keyset_ordering = ("-enrolled_at", "-id")
+    """
+    keyset_ordering = ("-pk",)
+    keyset_with_count = False
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            queryset,
+            page_size,
+            ordering=self.keyset_ordering,
+            with_count=self.keyset_with_count,
+        )
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
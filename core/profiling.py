@@ -0,0 +1,132 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger("core.profiling")
+
+# Literales que se reemplazan por "?" para agrupar consultas iguales con distintos parámetros
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\s*(?:\?|%s)\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normaliza una consulta SQL quitando sus literales.
+    Dos consultas con el mismo fingerprint son la misma consulta con otros
+    parámetros: si se repiten dentro de una petición suele tratarse de un N+1.
+    """
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryProfile:
+    """
+    Registro de las consultas ejecutadas mientras está activo (ver profile_queries).
+    Se instala como execute_wrapper de cada conexión.
+    """
+
+    def __init__(self):
+        self.queries = []  # [(sql, duración en segundos)]
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - start))
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_time(self) -> float:
+        """
+        Tiempo total en base de datos, en segundos.
+        """
+        return sum(duration for _, duration in self.queries)
+
+    def duplicates(self) -> dict:
+        """
+        Fingerprints ejecutados más de una vez: {fingerprint: repeticiones}.
+        """
+        counts = Counter(fingerprint(sql) for sql, _ in self.queries)
+        return {sql: n for sql, n in counts.most_common() if n > 1}
+
+
+@contextmanager
+def profile_queries():
+    """
+    Context manager que registra las consultas de todas las bases configuradas.
+
+    Ejemplo:
+        with profile_queries() as profile:
+            ...
+        profile.count, profile.total_time, profile.duplicates()
+    """
+    profile = QueryProfile()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(profile))
+        yield profile
+
+
+def get_query_budget(view_func):
+    """
+    Presupuesto de consultas declarado por la vista (atributo query_budget), o None.
+    """
+    view_class = getattr(view_func, "view_class", None)
+    return getattr(view_class, "query_budget", None)
+
+
+class QueryProfilingMiddleware:
+    """
+    Middleware que mide, por petición, la cantidad de consultas SQL, el tiempo
+    total en base de datos y las consultas repetidas.
+
+    - Agrega los encabezados X-DB-Query-Count y X-DB-Time-Ms a la respuesta.
+    - Si la vista declara query_budget y una petición GET lo supera, o si hay
+      consultas repetidas, lo informa en el logger "core.profiling".
+      El presupuesto aplica a GET: los POST ejecutan la lógica de los servicios.
+
+    Se activa con QUERY_PROFILING = True en settings.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_PROFILING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with profile_queries() as profile:
+            response = self.get_response(request)
+
+        response["X-DB-Query-Count"] = str(profile.count)
+        response["X-DB-Time-Ms"] = f"{profile.total_time * 1000:.2f}"
+
+        match = request.resolver_match
+        view_name = match.view_name if match else request.path
+        budget = get_query_budget(match.func) if match else None
+
+        if budget is not None and request.method in ("GET", "HEAD") and profile.count > budget:
+            logger.warning(
+                "%s: %d consultas (presupuesto %d), %.2f ms en base de datos",
+                view_name, profile.count, budget, profile.total_time * 1000,
+            )
+        duplicates = profile.duplicates()
+        if duplicates:
+            logger.info(
+                "%s: consultas repetidas %s",
+                view_name, "; ".join(f"{n}x {sql[:120]}" for sql, n in duplicates.items()),
+            )
+        return response
@@ -1,6 +1,9 @@
 import os
+import tempfile
 from pathlib import Path
 
+from core.db_profiles import database_profile, sqlite_profile
+
 """
 Django settings for core project.
 
@@ -49,12 +52,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.profiling.QueryProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "users.middleware.ProfileAuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "core.db_routers.ReadYourWritesMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "users.middleware.ForcePasswordChangeMiddleware",
 ]
@@ -85,13 +90,72 @@ WSGI_APPLICATION = "core.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Perfil elegido con DJANGO_DB_PROFILE: "sqlite" (por defecto) o "postgres".
+# Conexiones persistentes y, en SQLite, WAL y transacciones IMMEDIATE (ver core/db_profiles.py).
+DB_PROFILE = os.environ.get("DJANGO_DB_PROFILE", "sqlite")
+
 DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+    "default": database_profile(DB_PROFILE, sqlite_name=BASE_DIR / "db.sqlite3"),
+}
+
+# Réplica de solo lectura (opcional) para listados y reportes (ver core/db_routers.py).
+# Localmente puede ser un segundo archivo SQLite, sincronizado con sync_sqlite_replica.
+REPLICA_DATABASE_NAME = os.environ.get("DJANGO_REPLICA_DB")
+if REPLICA_DATABASE_NAME:
+    DATABASES["replica"] = {
+        **sqlite_profile(REPLICA_DATABASE_NAME),
+        # En los tests la réplica apunta a la misma base que default
+        "TEST": {"MIRROR": "default"},
     }
+
+DATABASE_ROUTERS = ["core.db_routers.PrimaryReplicaRouter"]
+
+# Reintentos de las transacciones de los servicios ante contención (ver core/transactions.py):
+# intentos totales y espera base / máxima del backoff, en segundos
+CONTENTION_RETRY_ATTEMPTS = 4
+CONTENTION_RETRY_BASE_DELAY = 0.05
+CONTENTION_RETRY_MAX_DELAY = 1.0
+
+# Segundos durante los que un usuario lee del primario después de escribir
+REPLICA_READ_YOUR_WRITES_SECONDS = 10
+
+# Despliegue ASGI (ver core/asgi.py): inscripción, baja y oferta de materias
+# usan sus vistas async. Con WSGI conviene dejarlo apagado.
+ASYNC_ENROLLMENT_VIEWS = os.environ.get("DJANGO_ASYNC_ENROLLMENT_VIEWS", "") == "1"
+
+
+# Cache (ver core/cache.py). LocMemCache alcanza para un solo proceso; con varios
+# procesos usar un backend compartido (Redis, Memcached) para que las
+# invalidaciones lleguen a todos.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sga-default",
+    },
+    # Sesiones (ver SESSION_ENGINE). Un cache en archivos lo comparten todos los
+    # procesos del servidor: con LocMemCache un proceso seguiría viendo una
+    # sesión que otro ya cerró. En producción con varios servidores, Redis o Memcached.
+    "sessions": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("DJANGO_SESSION_CACHE_DIR", os.path.join(tempfile.gettempdir(), "sga-sessions")),
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
 }
 
+# Sesiones en cache con respaldo en la base (cached_db): las lecturas salen del
+# cache y solo las escrituras (login, logout, cambios) van a django_session.
+# Los cambios se guardan solo en las peticiones que modifican la sesión.
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+SESSION_CACHE_ALIAS = "sessions"
+SESSION_SAVE_EVERY_REQUEST = False
+
+# Los mensajes flash viajan en una cookie firmada, sin escribir la sesión
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+# Duración de las páginas y fragmentos cacheados del catálogo (se invalidan
+# por señales al editar carreras, materias o profesores)
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -111,6 +175,19 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+PASSWORD_HASHERS = [
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+    "users.hashers.ProvisionalPBKDF2PasswordHasher",
+]
+
+# Hasher liviano para la contraseña inicial (DNI) de las cuentas con primer login
+# pendiente. Se reemplaza por el hasher por defecto al cambiar la contraseña.
+PROVISIONAL_PASSWORD_HASHER = "pbkdf2_sha256_provisional"
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -136,6 +213,24 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.User"
 
+# Carga el usuario de la sesión junto con su perfil (Student/Teacher/Admin) en un solo join
+AUTHENTICATION_BACKENDS = ["users.backends.ProfileModelBackend"]
+
+# Medición de consultas SQL por petición (ver core/profiling.py)
+QUERY_PROFILING = DEBUG
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "core.profiling": {"handlers": ["console"], "level": "INFO" if DEBUG else "WARNING"},
+        "core.transactions": {"handlers": ["console"], "level": "WARNING"},
+    },
+}
+
 LOGIN_URL = "/login/"
 LOGIN_REDIRECT_URL = "dashboard"
 LOGOUT_REDIRECT_URL = "home"
@@ -9,8 +9,13 @@ def param_replace(context, **kwargs):
     Devuelve la URL actual con los parámetros GET actualizados.
     Ejemplo de uso: <a href="?{% param_replace page=page_obj.next_page_number %}">
     Mantiene filtros activos como ?search=juan y solo cambia la página.
+    Si un valor es None, el parámetro se elimina (ej. volver a la primera página
+    con paginación por cursor: {% param_replace cursor=None %}).
     """
     d = context['request'].GET.copy()
     for k, v in kwargs.items():
-        d[k] = v
+        if v is None:
+            d.pop(k, None)
+        else:
+            d[k] = v
     return d.urlencode()
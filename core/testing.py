@@ -0,0 +1,243 @@
+"""
+Utilidades para medir consultas SQL por vista en tests y comandos de verificación.
+
+- seed_query_budget_dataset(): dataset chico pero con varias filas por relación,
+  suficiente para que un N+1 supere el presupuesto de la vista.
+- iter_view_urls(): recorre las URLs de core/urls.py.
+- iter_budget_urls(): rutas listas para pedir, con el rol de cada vista.
+- QueryBudgetTestMixin: assertQueryBudget() para usar desde los tests de cada app.
+"""
+import re
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import URLPattern, URLResolver, get_resolver
+
+from core.profiling import get_query_budget, profile_queries
+from users.mixins import AdminRequiredMixin, StudentRequiredMixin, SuperuserRequiredMixin, TeacherRequiredMixin
+
+# Hasher rápido para crear usuarios de prueba (el de producción es lento a propósito)
+FAST_PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+def seed_query_budget_dataset(careers=2, subjects_per_career=4, students_per_career=5):
+    """
+    Crea, a través de los servicios, un administrador (superusuario), un profesor
+    con todas las materias, carreras con materias y alumnos inscriptos en ellas.
+    Retorna un diccionario con los usuarios de cada rol.
+    """
+    # Importaciones locales: este módulo se importa antes de tener las apps listas
+    from careers.models import Career
+    from enrollments.services import EnrollmentService
+    from students.services import StudentService
+    from subjects.models import Subject
+    from users.services.admin_service import AdminService
+    from users.services.teacher_service import TeacherService
+
+    User = get_user_model()
+
+    admin = AdminService.create_admin({
+        "name": "Ana", "surname": "Admin", "dni": "10000000", "email": "admin@budget.test",
+        "hire_date": date(2020, 1, 1), "password": "budget-admin",
+    })
+    teacher = TeacherService.create_teacher({
+        "name": "Pablo", "surname": "Profesor", "dni": "20000000", "email": "teacher@budget.test",
+        "academic_degree": "TEACHER", "hire_date": date(2020, 1, 1),
+    })
+
+    students = []
+    for c in range(careers):
+        career = Career.objects.create(name=f"Carrera {c + 1}")
+        subjects = [
+            Subject.objects.create(name=f"Materia {c + 1}.{s + 1}", quota=50, teacher=teacher)
+            for s in range(subjects_per_career)
+        ]
+        career.subjects.set(subjects)
+
+        career_students = [
+            StudentService.create_student({
+                "name": f"Alumno {n + 1}", "surname": f"Carrera {c + 1}",
+                "dni": f"3{c:03d}{n:04d}", "email": f"alumno{c}.{n}@budget.test", "career": career,
+            })
+            for n in range(students_per_career)
+        ]
+        # Cada alumno queda inscripto en todas las materias menos la última
+        EnrollmentService.bulk_enroll(career_students, subjects[:-1])
+        students.extend(career_students)
+
+    # Sin cambio de contraseña pendiente, para que ninguna vista redirija
+    User.objects.update(is_first_login=False)
+    User.objects.filter(pk=admin.user_id).update(is_superuser=True)
+
+    return {
+        "ADMIN": User.objects.get(pk=admin.user_id),
+        "TEACHER": User.objects.get(pk=teacher.user_id),
+        "STUDENT": User.objects.get(pk=students[0].user_id),
+    }
+
+
+def iter_view_urls(patterns=None, prefix="", namespace=None):
+    """
+    Recorre el URLconf y genera (nombre, ruta, URLPattern) de cada vista.
+    La ruta es el patrón completo (ej. "students/<int:pk>/").
+    """
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    for entry in patterns:
+        route = prefix + str(entry.pattern)
+        if isinstance(entry, URLResolver):
+            child_namespace = entry.namespace or namespace
+            if namespace and entry.namespace:
+                child_namespace = f"{namespace}:{entry.namespace}"
+            yield from iter_view_urls(entry.url_patterns, route, child_namespace)
+        elif isinstance(entry, URLPattern) and entry.name:
+            name = f"{namespace}:{entry.name}" if namespace else entry.name
+            yield name, route, entry
+
+
+# Namespaces que no son vistas propias del sistema
+SKIPPED_NAMESPACES = ("admin",)
+
+# Vistas de Django (login, password_reset, ...): no declaran presupuesto
+SKIPPED_MODULE_PREFIXES = ("django.",)
+
+# URLs cuyo <pk> no corresponde al model de la vista
+PK_MODELS = {
+    "students:student_update": ("students", "Student"),
+    "students:student_toggle_active": ("students", "Student"),
+    "careers:career_toggle_status": ("careers", "Career"),
+    "enrollments:enrollment_drop": ("enrollments", "Enrollment"),
+    "subjects:subject_enrollment_list": ("subjects", "Subject"),
+}
+
+# Vistas públicas: se piden sin sesión (con sesión redirigen al dashboard)
+ANONYMOUS_VIEWS = ("home",)
+
+# Valores fijos para parámetros de ruta que no son pk
+PATH_PARAM_VALUES = {
+    "export_format": "csv",
+}
+
+_PATH_PARAM = re.compile(r"<(?:(?P<converter>\w+):)?(?P<name>\w+)>")
+
+
+def role_for_view(view_class):
+    """
+    Rol con el que se debe pedir la vista, según el mixin de permisos que usa.
+    """
+    if issubclass(view_class, (SuperuserRequiredMixin, AdminRequiredMixin)):
+        return "ADMIN"
+    if issubclass(view_class, TeacherRequiredMixin):
+        return "TEACHER"
+    if issubclass(view_class, StudentRequiredMixin):
+        return "STUDENT"
+    return "STUDENT"
+
+
+def build_view_path(name, route, view_class):
+    """
+    Reemplaza los parámetros de la ruta. Para <int:pk> se usa la primera fila
+    del model correspondiente y para el resto los valores de PATH_PARAM_VALUES.
+    Retorna None si no se puede armar.
+    """
+    from django.apps import apps
+
+    path = route
+    for match in _PATH_PARAM.finditer(route):
+        if match.group("name") in PATH_PARAM_VALUES:
+            path = path.replace(match.group(0), PATH_PARAM_VALUES[match.group("name")])
+            continue
+        if match.group("name") != "pk":
+            return None
+        app_label, model_name = PK_MODELS.get(name, (None, None))
+        model = apps.get_model(app_label, model_name) if app_label else getattr(view_class, "model", None)
+        obj = model._default_manager.order_by("pk").first() if model else None
+        if obj is None:
+            return None
+        path = path.replace(match.group(0), str(obj.pk))
+    return "/" + path.lstrip("^").rstrip("$")
+
+
+def iter_budget_urls():
+    """
+    Genera (nombre, ruta, rol, vista) de cada vista propia del sistema que se
+    puede pedir con GET sobre el dataset de seed_query_budget_dataset().
+    El rol es None para las vistas de ANONYMOUS_VIEWS (se piden sin login).
+    Usado por check_query_budgets y por los tests de core.
+    """
+    for name, route, pattern in iter_view_urls():
+        view_class = getattr(pattern.callback, "view_class", None)
+        if view_class is None or name.split(":")[0] in SKIPPED_NAMESPACES:
+            continue
+        if view_class.__module__.startswith(SKIPPED_MODULE_PREFIXES):
+            continue
+        path = build_view_path(name, route, view_class)
+        if path is None:
+            continue
+        role = None if name in ANONYMOUS_VIEWS else role_for_view(view_class)
+        yield name, path, role, pattern.callback
+
+
+def budget_client(users, role):
+    """
+    Client con sesión iniciada con el usuario del rol (sin sesión si role es None).
+    """
+    client = Client()
+    if role is not None:
+        client.force_login(users[role])
+    return client
+
+
+
+def measure_url(client, url, **extra):
+    """
+    Ejecuta un GET y retorna (response, QueryProfile).
+    Las respuestas en streaming se consumen dentro de la medición, porque sus
+    consultas se ejecutan al generar el contenido.
+    """
+    with profile_queries() as profile:
+        response = client.get(url, **extra)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+    return response, profile
+
+
+class QueryBudgetTestMixin:
+    """
+    Mixin para TestCase: verifica que una URL no supere el presupuesto de consultas
+    declarado por su vista (query_budget) o el indicado explícitamente.
+
+    La respuesta debe ser 2xx (o el status indicado): una redirección al login,
+    un 403 o un 500 también cuestan pocas consultas y no prueban nada.
+
+    Ejemplo:
+        class StudentViewsTests(QueryBudgetTestMixin, TestCase):
+            def test_list(self):
+                self.client.force_login(self.admin)
+                self.assertQueryBudget(reverse("students:student_list"))
+    """
+
+    def assertQueryBudget(self, url, budget=None, client=None, status=None):
+        client = client or self.client
+        response, profile = measure_url(client, url)
+
+        if status is not None:
+            self.assertEqual(response.status_code, status, f"{url}: status inesperado.")
+        elif not 200 <= response.status_code < 300:
+            self.fail(f"{url}: respondió {response.status_code}, se esperaba 2xx.")
+
+        if budget is None:
+            budget = get_query_budget(response.resolver_match.func)
+        if budget is None:
+            self.fail(f"La vista de {url} no declara query_budget.")
+
+        if profile.count > budget:
+            repeated = "\n".join(f"  {n}x {sql}" for sql, n in profile.duplicates().items())
+            self.fail(
+                f"{url}: {profile.count} consultas (presupuesto {budget})."
+                + (f"\nConsultas repetidas:\n{repeated}" if repeated else "")
+            )
+        return response
@@ -0,0 +1,118 @@
+import io
+import zipfile
+from unittest import mock
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.http import Http404
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from careers.views import CareerDetailView, CareerListView
+from core.choices import active_teacher_choices, career_choices, subject_choices
+from core.db_routers import PRIMARY_DB, use_replica
+from core.exports import stream_csv, stream_xlsx
+from core.profiling import get_query_budget
+from core.testing import (
+    FAST_PASSWORD_HASHERS,
+    QueryBudgetTestMixin,
+    budget_client,
+    iter_budget_urls,
+    seed_query_budget_dataset,
+)
+from subjects.views import SubjectDetailView, SubjectListView
+
+
+@override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS)
+class QueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    """
+    Cada vista enrutada respeta su presupuesto de consultas (query_budget)
+    sobre el dataset de seed_query_budget_dataset, igual que check_query_budgets.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with override_settings(PASSWORD_HASHERS=FAST_PASSWORD_HASHERS):
+            cls.users = seed_query_budget_dataset()
+
+    def test_every_view_respects_its_query_budget(self):
+        clients = {}
+        checked = 0
+
+        for name, path, role, callback in iter_budget_urls():
+            if role not in clients:
+                clients[role] = budget_client(self.users, role)
+
+            with self.subTest(view=name, path=path):
+                if get_query_budget(callback) is None:
+                    # Solo las vistas que aceptan únicamente POST pueden no declarar presupuesto
+                    self.assertEqual(clients[role].get(path).status_code, 405)
+                    continue
+                self.assertQueryBudget(path, client=clients[role])
+                checked += 1
+
+        self.assertGreater(checked, 0)
+
+
+class ExportTests(SimpleTestCase):
+    """
+    Los valores cargados por usuarios no se interpretan como fórmulas (CSV)
+    ni rompen el XML de la hoja (XLSX).
+    """
+
+    def test_csv_escapes_formula_cells(self):
+        rows = [("=HYPERLINK(\"http://x\")", "+54 11", "-1", "@SUM(A1)", "Ana", -1, 2.5)]
+
+        content = "".join(stream_csv(("a", "b", "c", "d", "e", "f", "g"), rows))
+
+        self.assertIn("\"'=HYPERLINK(\"\"http://x\"\")\",'+54 11,'-1,'@SUM(A1),Ana,-1,2.5", content)
+
+    def test_xlsx_strips_xml_illegal_characters(self):
+        rows = [("Ana\x00\x0bMaría", "A & B <c>", "línea\ttab")]
+
+        content = b"".join(stream_xlsx(("Nombre", "Materia", "Notas"), rows))
+
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            sheet = ElementTree.fromstring(archive.read("xl/worksheets/sheet1.xml"))
+        texts = [node.text for node in sheet.iter("{http://schemas.openxmlformats.org/spreadsheetml/2006/main}t")]
+        self.assertEqual(texts[3:], ["AnaMaría", "A & B <c>", "línea\ttab"])
+
+
+class CatalogPrimaryReadTests(SimpleTestCase):
+    """
+    Lo que se guarda en el cache del catálogo se lee del primario aunque la
+    petición lea de la réplica: una réplica con retraso no deja datos viejos
+    bajo la versión nueva. No se configura una réplica real, así que cualquier
+    lectura ruteada a ella falla.
+    """
+    databases = {"default"}
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch("core.db_routers.replica_configured", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_list_pages_and_counts_read_from_the_primary(self):
+        with use_replica():
+            for view_class in (CareerListView, SubjectListView):
+                with self.subTest(view=view_class.__name__):
+                    view = view_class()
+                    view.kwargs = {}
+                    paginator = view.get_paginator(view.get_queryset(), view.paginate_by)
+                    self.assertEqual(paginator.object_list.db, PRIMARY_DB)
+
+    def test_detail_objects_read_from_the_primary(self):
+        with use_replica():
+            for view_class in (CareerDetailView, SubjectDetailView):
+                with self.subTest(view=view_class.__name__):
+                    view = view_class()
+                    view.kwargs = {"pk": 0}
+                    # Sin réplica real, leerla lanzaría ConnectionDoesNotExist
+                    with self.assertRaises(Http404):
+                        view.get_object()
+
+    def test_choice_providers_read_from_the_primary(self):
+        with use_replica():
+            for provider in (career_choices, subject_choices, active_teacher_choices):
+                with self.subTest(provider=provider.__name__):
+                    self.assertEqual(provider(), [])
@@ -0,0 +1,155 @@
+"""
+Reintentos de transacciones ante contención de la base.
+
+retry_on_contention reemplaza a @transaction.atomic en los servicios: si la
+base rechaza la transacción por contención (lock ocupado, deadlock, fallo de
+serialización) la transacción completa se revierte y se vuelve a ejecutar,
+esperando un tiempo al azar que crece en cada intento (backoff exponencial
+con jitter), hasta CONTENTION_RETRY_ATTEMPTS intentos.
+
+Solo para unidades de trabajo que se pueden repetir: todo lo que hacen debe
+quedar dentro de la transacción (las escrituras en la base y los
+transaction.on_commit). Nada de enviar emails o llamar servicios externos
+dentro de la función decorada.
+
+Si se agotan los intentos se lanza ValidationError con un mensaje para el
+usuario (las vistas ya muestran los ValidationError de los servicios).
+"""
+import functools
+import logging
+import random
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger("core.transactions")
+
+# SQLSTATE de PostgreSQL: serialization_failure, deadlock_detected, lock_not_available
+CONTENTION_SQLSTATES = frozenset({"40001", "40P01", "55P03"})
+# Códigos de MySQL: lock wait timeout, deadlock
+MYSQL_CONTENTION_CODES = frozenset({1205, 1213})
+# SQLite solo informa el lock en el mensaje
+SQLITE_LOCKED_MESSAGES = ("database is locked", "database table is locked")
+
+CONTENTION_MESSAGE = "El sistema está procesando muchas solicitudes. Intenta nuevamente en unos segundos."
+
+
+class ContentionCounters:
+    """
+    Reintentos y abandonos por función decorada, acumulados desde que arrancó
+    el proceso (o desde el último reset).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+
+    def add(self, name, event) -> None:
+        with self._lock:
+            self._counts[(name, event)] += 1
+
+    def snapshot(self) -> dict:
+        """
+        {"retries": n, "giveups": n, "by_function": {nombre: {"retries": n, "giveups": n}}}
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        by_function = {}
+        for (name, event), count in counts.items():
+            by_function.setdefault(name, {"retries": 0, "giveups": 0})[event] = count
+        return {
+            "retries": sum(entry["retries"] for entry in by_function.values()),
+            "giveups": sum(entry["giveups"] for entry in by_function.values()),
+            "by_function": by_function,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+
+
+contention_counters = ContentionCounters()
+
+
+def is_contention_error(exc) -> bool:
+    """
+    True si el error de la base se debe a contención con otra transacción
+    (vale la pena reintentar), False para cualquier otro error.
+    """
+    if not isinstance(exc, DatabaseError):
+        return False
+
+    # Django envuelve el error del driver: el original queda en __cause__
+    cause = exc.__cause__
+    sqlstate = getattr(cause, "sqlstate", None) or getattr(cause, "pgcode", None)
+    if sqlstate in CONTENTION_SQLSTATES:
+        return True
+
+    args = getattr(cause, "args", ())
+    if args and args[0] in MYSQL_CONTENTION_CODES:
+        return True
+
+    message = str(exc).lower()
+    return any(locked in message for locked in SQLITE_LOCKED_MESSAGES)
+
+
+def backoff_delay(attempt, base_delay, max_delay) -> float:
+    """
+    Espera antes del reintento número attempt + 1 (full jitter): al azar entre 0
+    y base_delay * 2^attempt, con tope max_delay. El azar evita que las
+    transacciones que chocaron vuelvan a chocar al reintentar juntas.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def retry_on_contention(func=None, *, using=None, attempts=None):
+    """
+    Decorador: ejecuta la función dentro de transaction.atomic(using) y la
+    reintenta ante errores de contención.
+
+        @staticmethod
+        @retry_on_contention
+        def create_enrollment(user, subject_id): ...
+
+    Si ya hay una transacción en curso (la función se llama desde otro
+    servicio, o desde un test con TestCase) no se reintenta: la transacción
+    externa quedó invalidada y el error sube hasta el bloque más externo, que
+    es el que puede reintentar.
+    """
+    def decorator(func):
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if transaction.get_connection(using).in_atomic_block:
+                with transaction.atomic(using=using):
+                    return func(*args, **kwargs)
+
+            max_attempts = attempts or settings.CONTENTION_RETRY_ATTEMPTS
+            for attempt in range(max_attempts):
+                try:
+                    with transaction.atomic(using=using):
+                        return func(*args, **kwargs)
+                except DatabaseError as exc:
+                    if not is_contention_error(exc):
+                        raise
+                    if attempt + 1 == max_attempts:
+                        contention_counters.add(name, "giveups")
+                        logger.warning("%s: contención después de %d intentos (%s)", name, max_attempts, exc)
+                        raise ValidationError(CONTENTION_MESSAGE, code="contention") from exc
+
+                    contention_counters.add(name, "retries")
+                    logger.info("%s: contención en el intento %d, se reintenta (%s)", name, attempt + 1, exc)
+                    time.sleep(backoff_delay(
+                        attempt, settings.CONTENTION_RETRY_BASE_DELAY, settings.CONTENTION_RETRY_MAX_DELAY
+                    ))
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
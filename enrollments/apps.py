@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EnrollmentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'enrollments'
+
+    def ready(self):
+        # Registra las señales que mantienen SubjectEnrollmentStats y StudentProgress
+        from enrollments import signals  # noqa: F401
@@ -1,5 +1,14 @@
+from functools import partial
+
 from django import forms
 
+from careers.models import Career
+from core.choices import (
+    CachedModelChoiceField,
+    CachedModelMultipleChoiceField,
+    career_choices,
+    subject_choices,
+)
 from subjects.models import Subject
 
 
@@ -12,3 +21,39 @@ class EnrollmentCreateForm(forms.Form):
             "invalid_choice": "La materia seleccionada no es válida.",
         }
     )
+
+
+class EnrollmentBulkForm(forms.Form):
+    """
+    Formulario para inscribir una cohorte completa de una carrera en varias materias.
+    """
+    career = CachedModelChoiceField(
+        queryset=Career.objects.filter(is_active=True),
+        choices_provider=partial(career_choices, active_only=True),
+        label="Carrera",
+        widget=forms.Select(attrs={"class": "form-select"}),
+        error_messages={"required": "Debe seleccionar una carrera."},
+    )
+
+    subjects = CachedModelMultipleChoiceField(
+        queryset=Subject.objects.all(),
+        choices_provider=subject_choices,
+        label="Materias",
+        widget=forms.SelectMultiple(attrs={"class": "form-select", "size": 8}),
+        error_messages={"required": "Debe seleccionar al menos una materia."},
+    )
+
+    dnis = forms.CharField(
+        label="DNIs (opcional)",
+        required=False,
+        help_text="Uno por línea o separados por coma. Si se deja vacío, se inscriben "
+                  "todos los alumnos activos de la carrera.",
+        widget=forms.Textarea(attrs={"class": "form-control", "rows": 4, "placeholder": "Ej. 30123456"}),
+    )
+
+    def clean_dnis(self):
+        """
+        Normaliza la lista de DNIs a un conjunto de strings sin espacios.
+        """
+        raw = self.cleaned_data.get("dnis", "")
+        return {dni.strip() for dni in raw.replace(",", "\n").splitlines() if dni.strip()}
@@ -0,0 +1,281 @@
+import asyncio
+import importlib
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import ThreadSensitiveContext
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client, override_settings
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import clear_url_caches, reverse
+
+from core.benchmarks import plan_pending_enrollments, summarize
+from enrollments.models import Enrollment
+from students.models import Student
+
+
+class InFlight:
+    """
+    Contador de peticiones en curso dentro del servidor; registra el máximo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self._lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            self.current -= 1
+
+
+@contextmanager
+def simulated_db_latency(seconds):
+    """
+    Agrega una demora fija antes de cada consulta, como el viaje de red a un
+    servidor de base de datos (SQLite local no la tiene). La demora bloquea el
+    hilo que ejecuta la consulta, igual que una consulta real.
+    """
+    if not seconds:
+        yield
+        return
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        if delay not in connection.execute_wrappers:
+            connection.execute_wrappers.append(delay)
+
+    connection_created.connect(install)
+    # Las conexiones que ya estaban abiertas se reabren con la demora
+    connections.close_all()
+    try:
+        yield
+    finally:
+        connection_created.disconnect(install)
+        for connection in connections.all(initialized_only=True):
+            if delay in connection.execute_wrappers:
+                connection.execute_wrappers.remove(delay)
+
+
+@contextmanager
+def enrollment_views(use_async):
+    """
+    Carga las URLs de enrollments con las vistas sincrónicas o async
+    (ver ASYNC_ENROLLMENT_VIEWS) y al salir restaura las de settings.
+    """
+    import core.urls
+    import enrollments.urls
+
+    def reload_urls():
+        importlib.reload(enrollments.urls)
+        importlib.reload(core.urls)
+        clear_url_caches()
+
+    try:
+        with override_settings(ASYNC_ENROLLMENT_VIEWS=use_async):
+            reload_urls()
+            yield
+    finally:
+        reload_urls()
+
+
+class Command(BaseCommand):
+    """
+    Compara cuántas inscripciones en curso atiende un proceso con WSGI
+    (un hilo por petición, --wsgi-threads hilos como gunicorn --threads) y con
+    ASGI (vistas async de enrollments sobre el event loop).
+
+    Para cada nivel de --concurrency, esa cantidad de alumnos envía a la vez
+    --requests inscripciones cada uno (cada alumno espera su respuesta antes de
+    enviar la siguiente). Reporta throughput, latencias, el máximo de
+    peticiones en curso dentro del servidor, errores 5xx e inscripciones creadas.
+
+    --db-latency-ms simula el viaje de red a una base remota: con SQLite local
+    las consultas no esperan a la red y ASGI no tiene tiempo muerto que aprovechar.
+
+    Opera sobre la base configurada y MODIFICA sus datos (cada fase usa alumnos
+    distintos): usarlo sobre un dataset generado con seed_academic_data.
+
+    Ejemplo:
+        python manage.py seed_academic_data --students 50000
+        python manage.py bench_async_enroll --concurrency 8,32,128 --db-latency-ms 2
+        python manage.py bench_async_enroll --wsgi-threads 16 --requests 3 --seed 7
+    """
+    help = "Benchmark de inscripciones concurrentes en un proceso: WSGI (hilos) contra ASGI (vistas async)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", default="8,32,128",
+                            help="Niveles de alumnos simultáneos, separados por coma (por defecto 8,32,128).")
+        parser.add_argument("--requests", type=int, default=2, help="Inscripciones por alumno.")
+        parser.add_argument("--wsgi-threads", type=int, default=8,
+                            help="Hilos del proceso WSGI (peticiones que atiende a la vez).")
+        parser.add_argument("--db-latency-ms", type=float, default=0.0,
+                            help="Demora simulada por consulta, en milisegundos.")
+        parser.add_argument("--seed", type=int, default=None, help="Semilla para reproducir la corrida.")
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options["concurrency"].split(",")]
+            assert levels and all(level > 0 for level in levels)
+        except (ValueError, AssertionError):
+            raise CommandError("--concurrency debe ser una lista de enteros positivos, ej. 8,32,128.")
+
+        rng = random.Random(options["seed"])
+        # Cada fase (modo y nivel) usa alumnos propios con materias pendientes
+        try:
+            plans = plan_pending_enrollments(sum(levels) * 2, options["requests"], rng)
+        except ValueError as e:
+            raise CommandError(f"{e} O bajar --concurrency/--requests.")
+        students = Student.objects.select_related("user").in_bulk(list(plans))
+        pool = [(students[student_id], subject_ids) for student_id, subject_ids in plans.items()]
+
+        setup_test_environment(debug=False)
+        quiet_loggers = [logging.getLogger(name) for name in ("django.request", "core.profiling")]
+        levels_before = [logger.level for logger in quiet_loggers]
+        for logger in quiet_loggers:
+            logger.setLevel(logging.CRITICAL)
+
+        rows = []
+        try:
+            # Sin QueryProfilingMiddleware (sincrónico), como en producción
+            with override_settings(QUERY_PROFILING=False), \
+                    simulated_db_latency(options["db_latency_ms"] / 1000):
+                for level in levels:
+                    for mode in ("WSGI", "ASGI"):
+                        phase, pool = pool[:level], pool[level:]
+                        rows.append(self._run_phase(mode, level, phase, options["wsgi_threads"]))
+        finally:
+            for logger, level in zip(quiet_loggers, levels_before):
+                logger.setLevel(level)
+            teardown_test_environment()
+
+        self._report(rows, options)
+
+    def _run_phase(self, mode, level, phase, wsgi_threads):
+        """
+        Ejecuta una fase y retorna su fila del reporte.
+        """
+        student_ids = [student.pk for student, _ in phase]
+        before = Enrollment.objects.filter(student_id__in=student_ids).count()
+
+        with enrollment_views(use_async=mode == "ASGI"):
+            url = reverse("enrollments:enrollment_create")
+            if mode == "WSGI":
+                result = self._run_wsgi(url, phase, wsgi_threads)
+            else:
+                result = asyncio.run(self._run_asgi(url, phase))
+        connections.close_all()
+
+        result.update(
+            mode=mode,
+            level=level,
+            created=Enrollment.objects.filter(student_id__in=student_ids).count() - before,
+        )
+        return result
+
+    def _run_wsgi(self, url, phase, wsgi_threads):
+        """
+        Un hilo por alumno (el cliente) y un semáforo con los hilos del servidor:
+        las peticiones que no consiguen hilo esperan en cola, como en gunicorn.
+        """
+        server_threads = threading.BoundedSemaphore(wsgi_threads)
+        in_flight = InFlight()
+        latencies, errors = [], []
+        barrier = threading.Barrier(len(phase) + 1)
+
+        clients = []
+        for student, _ in phase:
+            client = Client(raise_request_exception=False)
+            client.force_login(student.user)
+            clients.append(client)
+
+        def worker(client, subject_ids):
+            try:
+                barrier.wait()
+                for subject_id in subject_ids:
+                    start = time.perf_counter()
+                    with server_threads, in_flight:
+                        response = client.post(url, {"subject": subject_id})
+                    latencies.append(time.perf_counter() - start)
+                    errors.append(response.status_code >= 500)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=worker, args=(client, subject_ids))
+            for client, (_, subject_ids) in zip(clients, phase)
+        ]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+
+        return {"elapsed": time.perf_counter() - start, "latencies": latencies,
+                "errors": sum(errors), "peak": in_flight.peak}
+
+    async def _run_asgi(self, url, phase):
+        """
+        Una tarea por alumno sobre un único event loop.
+        """
+        in_flight = InFlight()
+        latencies, errors = [], []
+
+        clients = []
+        for student, _ in phase:
+            client = AsyncClient(raise_request_exception=False)
+            await client.aforce_login(student.user)
+            clients.append(client)
+
+        async def worker(client, subject_ids):
+            for subject_id in subject_ids:
+                start = time.perf_counter()
+                with in_flight:
+                    # Como ASGIHandler: el código sincrónico de cada petición corre en su propio hilo
+                    async with ThreadSensitiveContext():
+                        response = await client.post(url, {"subject": subject_id})
+                latencies.append(time.perf_counter() - start)
+                errors.append(response.status_code >= 500)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            worker(client, subject_ids) for client, (_, subject_ids) in zip(clients, phase)
+        ))
+        return {"elapsed": time.perf_counter() - start, "latencies": latencies,
+                "errors": sum(errors), "peak": in_flight.peak}
+
+    def _report(self, rows, options):
+        self.stdout.write(
+            f"{options['requests']} inscripciones por alumno, WSGI con {options['wsgi_threads']} hilos, "
+            f"demora simulada por consulta: {options['db_latency_ms']:g} ms"
+        )
+        self.stdout.write(
+            f"{'Modo':<6}{'Alumnos':>9}{'Pet/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'En curso':>10}{'5xx':>6}{'Creadas':>9}"
+        )
+        for row in rows:
+            summary = summarize(row["latencies"])
+            style = self.style.ERROR if row["errors"] else (lambda text: text)
+            self.stdout.write(style(
+                f"{row['mode']:<6}{row['level']:>9}{len(row['latencies']) / row['elapsed']:>9.1f}"
+                f"{summary['p50']:>9.1f}{summary['p95']:>9.1f}{summary['p99']:>9.1f}"
+                f"{row['peak']:>10}{row['errors']:>6}{row['created']:>9}"
+            ))
+        self.stdout.write(
+            "En curso: máximo de peticiones atendidas a la vez por el proceso "
+            "(en WSGI el resto espera un hilo libre)."
+        )
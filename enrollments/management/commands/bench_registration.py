@@ -0,0 +1,198 @@
+import logging
+import random
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Count, F, Q
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from core.benchmarks import SUMMARY_HEADER, format_summary, summarize
+from enrollments.models import Enrollment
+from students.models import Student
+from subjects.models import Subject
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """
+    Simula el día de inscripción: varios hilos, cada uno con su propio Client
+    logueado como un alumno distinto, mezclan listados, inscripciones y bajas
+    contra los endpoints de enrollments.
+
+    Reporta p50/p95/p99 por operación, throughput, errores (5xx) y violaciones
+    de cupo (materias con más inscripciones activas que su cupo).
+
+    Opera sobre la base configurada y MODIFICA sus datos: usarlo sobre un
+    dataset generado con seed_academic_data.
+
+    Ejemplo:
+        python manage.py seed_academic_data --students 50000
+        python manage.py bench_registration --threads 16 --requests 200
+        python manage.py bench_registration --mix 6:1:3 --seed 7
+    """
+    help = "Benchmark concurrente de inscripción, baja y listado de materias (enrollments)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8, help="Hilos concurrentes (un alumno cada uno).")
+        parser.add_argument("--requests", type=int, default=100, help="Peticiones por hilo.")
+        parser.add_argument("--mix", default="5:1:4",
+                            help="Proporción inscripción:baja:listado (por defecto 5:1:4).")
+        parser.add_argument("--seed", type=int, default=None, help="Semilla para reproducir la corrida.")
+
+    def handle(self, *args, **options):
+        try:
+            weights = [int(part) for part in options["mix"].split(":")]
+            assert len(weights) == 3 and sum(weights) > 0
+        except (ValueError, AssertionError):
+            raise CommandError("--mix debe tener el formato inscripción:baja:listado, ej. 5:1:4.")
+
+        rng = random.Random(options["seed"])
+        student_ids = list(
+            Student.objects.filter(user__is_active=True, user__is_first_login=False, career__isnull=False)
+            .values_list("pk", flat=True)
+        )
+        if len(student_ids) < options["threads"]:
+            raise CommandError("No hay suficientes alumnos activos: ejecutar seed_academic_data primero.")
+        chosen = rng.sample(student_ids, options["threads"])
+
+        # El Client necesita el entorno de test (ALLOWED_HOSTS, email en memoria).
+        # Los 5xx se cuentan en el reporte: se silencia el traceback de cada uno.
+        setup_test_environment()
+        quiet_loggers = [logging.getLogger(name) for name in ("django.request", "core.profiling")]
+        levels = [logger.level for logger in quiet_loggers]
+        for logger in quiet_loggers:
+            logger.setLevel(logging.CRITICAL)
+        try:
+            results = self._run(chosen, options["requests"], weights, rng)
+        finally:
+            for logger, level in zip(quiet_loggers, levels):
+                logger.setLevel(level)
+            teardown_test_environment()
+
+        self._report(results, options)
+
+    def _run(self, student_ids, requests_per_thread, weights, rng):
+        """
+        Lanza un hilo por alumno y espera a que terminen todos.
+        """
+        results = {"enroll": [], "drop": [], "list": [], "errors": 0, "rejected": 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(len(student_ids) + 1)
+        seeds = [rng.randrange(2 ** 32) for _ in student_ids]
+
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(student_id, requests_per_thread, weights, random.Random(seed), results, lock, barrier),
+            )
+            for student_id, seed in zip(student_ids, seeds)
+        ]
+        for thread in threads:
+            thread.start()
+
+        # Todos los hilos arrancan juntos, ya logueados
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        results["elapsed"] = time.perf_counter() - start
+        return results
+
+    def _worker(self, student_id, requests, weights, rng, results, lock, barrier):
+        try:
+            student = Student.objects.select_related("user").get(pk=student_id)
+            client = Client(raise_request_exception=False)
+            client.force_login(student.user)
+
+            # Materias del plan que el alumno todavía no cursó
+            candidates = list(
+                Subject.objects.filter(careers=student.career_id)
+                .exclude(enrollments__student=student)
+                .values_list("pk", flat=True)
+            )
+            urls = {
+                "list": reverse("enrollments:enrollment_list"),
+                "enroll": reverse("enrollments:enrollment_create"),
+            }
+        except Exception:
+            barrier.abort()
+            raise
+        barrier.wait()
+
+        latencies = {"enroll": [], "drop": [], "list": []}
+        errors = rejected = 0
+        try:
+            for _ in range(requests):
+                action = rng.choices(["enroll", "drop", "list"], weights)[0]
+
+                if action == "enroll" and candidates:
+                    subject_id = candidates.pop(rng.randrange(len(candidates)))
+                    call = lambda: client.post(urls["enroll"], {"subject": subject_id})  # noqa: E731
+                elif action == "drop":
+                    enrollment_id = (
+                        Enrollment.objects.filter(student_id=student_id, status="activa")
+                        .values_list("pk", flat=True).first()
+                    )
+                    if enrollment_id is None:
+                        action, call = "list", lambda: client.get(urls["list"])  # noqa: E731
+                    else:
+                        url = reverse("enrollments:enrollment_drop", args=[enrollment_id])
+                        call = lambda: client.post(url)  # noqa: E731
+                else:
+                    action, call = "list", lambda: client.get(urls["list"])  # noqa: E731
+
+                start = time.perf_counter()
+                response = call()
+                latencies[action].append(time.perf_counter() - start)
+
+                if response.status_code >= 500:
+                    errors += 1
+                elif action == "enroll" and not Enrollment.objects.filter(
+                    student_id=student_id, subject_id=subject_id
+                ).exists():
+                    # Cupo completo u otra regla de negocio: no es un error del sistema
+                    rejected += 1
+        finally:
+            connections.close_all()
+
+        with lock:
+            for action, values in latencies.items():
+                results[action].extend(values)
+            results["errors"] += errors
+            results["rejected"] += rejected
+
+    def _report(self, results, options):
+        elapsed = results["elapsed"]
+        total = sum(len(results[action]) for action in ("enroll", "drop", "list"))
+
+        self.stdout.write(
+            f"{options['threads']} hilos x {options['requests']} peticiones, mezcla {options['mix']}"
+        )
+        self.stdout.write(SUMMARY_HEADER)
+        for action, label in (("enroll", "Inscripción"), ("drop", "Baja"), ("list", "Listado")):
+            self.stdout.write(format_summary(label, summarize(results[action])))
+        self.stdout.write(format_summary("Total", summarize(
+            results["enroll"] + results["drop"] + results["list"]
+        )))
+
+        self.stdout.write(f"Throughput: {total / elapsed:.1f} peticiones/s en {elapsed:.2f} s")
+        self.stdout.write(f"Inscripciones rechazadas por reglas de negocio: {results['rejected']}")
+
+        # Violaciones de cupo: por contador y por conteo real de inscripciones activas
+        counter_violations = Subject.objects.filter(active_count__gt=F("quota")).count()
+        real_violations = (
+            Subject.objects.annotate(real_active=Count("enrollments", filter=Q(enrollments__status="activa")))
+            .filter(real_active__gt=F("quota"))
+            .count()
+        )
+        style = self.style.ERROR if (results["errors"] or counter_violations or real_violations) else self.style.SUCCESS
+        self.stdout.write(style(
+            f"Errores 5xx: {results['errors']} | Violaciones de cupo: "
+            f"{real_violations} (contador: {counter_violations})"
+        ))
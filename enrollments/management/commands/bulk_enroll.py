@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from careers.models import Career
+from enrollments.services import EnrollmentService
+
+
+class Command(BaseCommand):
+    """
+    Inscribe en bloque a los alumnos activos de una carrera en varias materias.
+
+    Ejemplo:
+        python manage.py bulk_enroll --career 1 --subjects 3 4 5
+        python manage.py bulk_enroll --career 1 --subjects 3 --dni 30123456 30123457
+    """
+    help = "Inscribe en bloque a los alumnos de una carrera en las materias indicadas."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--career", type=int, required=True, help="ID de la carrera.")
+        parser.add_argument("--subjects", type=int, nargs="+", required=True, help="IDs de las materias.")
+        parser.add_argument("--dni", nargs="*", default=[], help="Restringe la inscripción a estos DNIs.")
+
+    def handle(self, *args, **options):
+        try:
+            career = Career.objects.get(pk=options["career"])
+        except Career.DoesNotExist:
+            raise CommandError(f"No existe la carrera con id {options['career']}.")
+
+        student_ids, unmatched = EnrollmentService.cohort_students(career, set(options["dni"]))
+
+        result = EnrollmentService.bulk_enroll(students=student_ids, subjects=options["subjects"])
+
+        for row in unmatched:
+            self.stdout.write(f"RECHAZADA {row['dni']}: {row['reason']}")
+        for row in result["rejected"]:
+            self.stdout.write(
+                f"RECHAZADA {row['student'].dni} - {row['subject'].name}: {row['reason']}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(result['created'])} inscripciones creadas, {len(result['rejected'])} rechazadas, "
+            f"{len(unmatched)} DNIs sin alumno activo en la carrera."
+        ))
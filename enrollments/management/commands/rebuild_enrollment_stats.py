@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from enrollments.services import EnrollmentStatsService
+
+
+class Command(BaseCommand):
+    """
+    Reconstruye las estadísticas de inscripciones por materia y semestre
+    y resincroniza el contador de cupo de cada materia.
+
+    Ejemplo:
+        python manage.py rebuild_enrollment_stats
+    """
+    help = "Reconstruye SubjectEnrollmentStats y Subject.active_count desde la tabla de inscripciones."
+
+    def handle(self, *args, **options):
+        result = EnrollmentStatsService.rebuild()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['stats_rows']} filas de estadísticas generadas, "
+            f"{result['subjects_fixed']} contadores de cupo corregidos."
+        ))
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:27
+
+import django.db.models.deletion
+import enrollments.models
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_stats(apps, schema_editor):
+    """
+    Genera el resumen inicial a partir de las inscripciones existentes.
+    """
+    Enrollment = apps.get_model("enrollments", "Enrollment")
+    SubjectEnrollmentStats = apps.get_model("enrollments", "SubjectEnrollmentStats")
+
+    rows = {}
+    grouped = (
+        Enrollment.objects.order_by()
+        .values("subject_id", "semester", "status")
+        .annotate(total=Count("id"))
+    )
+    for row in grouped:
+        stats = rows.setdefault(
+            (row["subject_id"], row["semester"]),
+            SubjectEnrollmentStats(subject_id=row["subject_id"], semester=row["semester"]),
+        )
+        setattr(stats, f"{row['status']}_count", row["total"])
+
+    SubjectEnrollmentStats.objects.bulk_create(rows.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0004_alter_enrollment_status'),
+        ('subjects', '0005_subject_active_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubjectEnrollmentStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semester', models.CharField(max_length=6, validators=[enrollments.models.validate_semester], verbose_name='Semestre')),
+                ('activa_count', models.PositiveIntegerField(default=0, verbose_name='Activas')),
+                ('regular_count', models.PositiveIntegerField(default=0, verbose_name='Regulares')),
+                ('aprobada_count', models.PositiveIntegerField(default=0, verbose_name='Aprobadas')),
+                ('reprobada_count', models.PositiveIntegerField(default=0, verbose_name='Reprobadas')),
+                ('ausente_count', models.PositiveIntegerField(default=0, verbose_name='Ausentes')),
+                ('baja_count', models.PositiveIntegerField(default=0, verbose_name='Bajas')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='enrollment_stats', to='subjects.subject', verbose_name='Materia')),
+            ],
+            options={
+                'verbose_name': 'Estadística de inscripciones',
+                'verbose_name_plural': 'Estadísticas de inscripciones',
+                'constraints': [models.UniqueConstraint(fields=('subject', 'semester'), name='unique_subject_semester_stats')],
+            },
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
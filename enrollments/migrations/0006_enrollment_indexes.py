@@ -0,0 +1,35 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0005_subject_enrollment_stats'),
+        ('students', '0006_student_student_surname_name_idx'),
+        ('subjects', '0005_subject_active_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['student', '-enrolled_at', '-id'], name='enrollment_student_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['-enrolled_at', '-id'], name='enrollment_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['subject', '-enrolled_at', '-id'], name='enrollment_subject_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(fields=['status', '-enrolled_at', '-id'], name='enrollment_status_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='enrollment',
+            index=models.Index(condition=models.Q(('status', 'activa')), fields=['subject'], name='enrollment_active_subject_idx'),
+        ),
+    ]
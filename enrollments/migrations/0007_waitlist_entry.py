@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('enrollments', '0006_enrollment_indexes'),
+        ('students', '0007_student_progress'),
+        ('subjects', '0005_subject_active_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField(verbose_name='Puesto')),
+                ('joined_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de ingreso')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to='students.student', verbose_name='Estudiante')),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='subjects.subject', verbose_name='Materia')),
+            ],
+            options={
+                'verbose_name': 'Lugar en lista de espera',
+                'verbose_name_plural': 'Listas de espera',
+                'ordering': ['subject', 'position'],
+                'indexes': [models.Index(fields=['subject', 'position'], name='waitlist_subject_position_idx')],
+                'constraints': [models.UniqueConstraint(fields=('subject', 'student'), name='unique_waitlist_entry')],
+            },
+        ),
+    ]
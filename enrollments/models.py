@@ -69,10 +69,38 @@ class Enrollment(models.Model):
                 name="unique_enrollment",
             )
         ]
+        indexes = [
+            # Historial de un alumno (MyEnrollmentListView, StudentDetailView)
+            models.Index(fields=["student", "-enrolled_at", "-id"], name="enrollment_student_recent_idx"),
+            # Reporte del administrador: orden por cursor y filtros por materia/estado
+            models.Index(fields=["-enrolled_at", "-id"], name="enrollment_recent_idx"),
+            models.Index(fields=["subject", "-enrolled_at", "-id"], name="enrollment_subject_recent_idx"),
+            models.Index(fields=["status", "-enrolled_at", "-id"], name="enrollment_status_recent_idx"),
+            # Inscripciones activas por materia (cupo y reconciliación)
+            models.Index(
+                fields=["subject"],
+                condition=models.Q(status="activa"),
+                name="enrollment_active_subject_idx",
+            ),
+        ]
         ordering = ["-enrolled_at", "student__surname", "subject__name"]
         verbose_name = "Inscripción"
         verbose_name_plural = "Inscripciones"
 
+    # True cuando el servicio ya reservó el lugar en la materia (reserve_seat)
+    # antes de guardar; lo consume la señal post_save
+    seat_reserved = False
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Recuerda el estado con el que se cargó la inscripción para que las
+        señales puedan calcular el cambio de estado al guardar.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
     @staticmethod
     def get_semester_from_date(date):
         year = date.year
@@ -89,9 +117,123 @@ class Enrollment(models.Model):
                 "La materia no pertenece a la carrera del estudiante."
             )
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, skip_validation=False, **kwargs):
+        """
+        Guarda la inscripción validándola por completo.
+        skip_validation=True es solo para la capa de servicios (EnrollmentService),
+        que ya verificó plan de estudios, unicidad y cupo dentro de la misma
+        transacción; evita repetir esas queries en cada escritura.
+        """
         if not self.semester:
             date = self.enrolled_at or timezone.now()
             self.semester = self.get_semester_from_date(date)
-        self.full_clean()  # ejecuta clean_fields, clean y validate_unique
+        if not skip_validation:
+            self.full_clean()  # ejecuta clean_fields, clean y validate_unique
         super().save(*args, **kwargs)
+
+
+class WaitlistEntry(models.Model):
+    """
+    Lugar de un estudiante en la lista de espera (FIFO) de una materia con el
+    cupo completo.
+
+    position es el puesto en la fila (1 = el próximo en entrar) y se mantiene
+    contiguo: al salir alguien, los de atrás avanzan un lugar (ver
+    WaitlistService). Así el puesto de un estudiante se lee por índice, sin
+    contar filas.
+    """
+    subject = models.ForeignKey(
+        "subjects.Subject",
+        on_delete=models.CASCADE,
+        related_name="waitlist",
+        verbose_name="Materia",
+    )
+
+    student = models.ForeignKey(
+        "students.Student",
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries",
+        verbose_name="Estudiante",
+    )
+
+    position = models.PositiveIntegerField(verbose_name="Puesto")
+
+    joined_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de ingreso")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subject", "student"],
+                name="unique_waitlist_entry",
+            )
+        ]
+        indexes = [
+            # Cabeza y cola de la fila; sin UNIQUE: el corrimiento de puestos
+            # (position - n) se aplica fila por fila y pasaría por duplicados
+            models.Index(fields=["subject", "position"], name="waitlist_subject_position_idx"),
+        ]
+        ordering = ["subject", "position"]
+        verbose_name = "Lugar en lista de espera"
+        verbose_name_plural = "Listas de espera"
+
+    def __str__(self):
+        return f"{self.student} - {self.subject} (puesto {self.position})"
+
+
+class SubjectEnrollmentStats(models.Model):
+    """
+    Resumen precalculado de inscripciones por materia y semestre.
+    Se mantiene de forma incremental (ver enrollments.signals) y se puede
+    reconstruir con el comando rebuild_enrollment_stats.
+    """
+    # Campo de conteo por cada estado de Enrollment
+    COUNT_FIELDS = {status: f"{status}_count" for status, _ in Enrollment.STATUS_CHOICES}
+
+    subject = models.ForeignKey(
+        "subjects.Subject",
+        on_delete=models.CASCADE,
+        related_name="enrollment_stats",
+        verbose_name="Materia",
+    )
+
+    semester = models.CharField(
+        max_length=6,
+        validators=[validate_semester],
+        verbose_name="Semestre",
+    )
+
+    activa_count = models.PositiveIntegerField(default=0, verbose_name="Activas")
+    regular_count = models.PositiveIntegerField(default=0, verbose_name="Regulares")
+    aprobada_count = models.PositiveIntegerField(default=0, verbose_name="Aprobadas")
+    reprobada_count = models.PositiveIntegerField(default=0, verbose_name="Reprobadas")
+    ausente_count = models.PositiveIntegerField(default=0, verbose_name="Ausentes")
+    baja_count = models.PositiveIntegerField(default=0, verbose_name="Bajas")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subject", "semester"],
+                name="unique_subject_semester_stats",
+            )
+        ]
+        verbose_name = "Estadística de inscripciones"
+        verbose_name_plural = "Estadísticas de inscripciones"
+
+    @classmethod
+    def total_expression(cls, prefix=""):
+        """
+        Expresión que suma todos los estados, para usar en annotate()/aggregate().
+        Con prefix="enrollment_stats__" se puede usar desde Subject.
+        """
+        fields = [models.F(f"{prefix}{field}") for field in cls.COUNT_FIELDS.values()]
+        total = fields[0]
+        for field in fields[1:]:
+            total = total + field
+        return total
+
+    @property
+    def total(self):
+        return sum(getattr(self, field) for field in self.COUNT_FIELDS.values())
+
+    def __str__(self):
+        return f"{self.subject_id} ({self.semester}): {self.total} inscripciones"
@@ -1,7 +1,17 @@
+from collections import Counter
+
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
 from django.shortcuts import get_object_or_404
-from enrollments.models import Enrollment
+from django.utils import timezone
+
+from careers.models import Career
+from core.transactions import retry_on_contention
+from enrollments.models import Enrollment, SubjectEnrollmentStats, WaitlistEntry
+from students.models import Student
+from students.services import StudentProgressService
 from subjects.models import Subject
 from users.models import User
 
@@ -11,7 +21,7 @@ class EnrollmentService:
     Servicio para gestionar las inscripciones de estudiantes.
     """
     @staticmethod
-    @transaction.atomic
+    @retry_on_contention
     def create_enrollment(user: User, subject_id: int) -> Enrollment:
         # --- Obtención de datos ---
         # Obtención de estudiante asociado al usuario
@@ -28,13 +38,16 @@ class EnrollmentService:
             raise ValidationError("La materia especificada no existe.")
 
         # -- Validación de Existencia de Carrera --
-        if not student.career:
+        if not student.career_id:
             raise ValidationError("No tienes una carrera asignada. Contacta a administración.")
 
         # --- Validación de Carrera ---
         # Verificar que la materia pertenece a la carrera del estudiante
+        # (consulta directa a la tabla intermedia, sin cargar la carrera)
         # Excepción: Lanzar ValidationError si no pertenece
-        if not student.career.subjects.filter(pk=subject_id).exists():
+        if not Career.subjects.through.objects.filter(
+            career_id=student.career_id, subject_id=subject_id
+        ).exists():
             raise ValidationError("Esta materia no corresponde a tu plan de estudios.")
 
         # --- Validación de Unicidad ---
@@ -44,37 +57,533 @@ class EnrollmentService:
         if Enrollment.objects.filter(student=student, subject=subject).exists():
             raise ValidationError("Ya posees una inscripción histórica para esta materia.")
 
-        # --- Validación de Cupo ---
-        # Contar inscripciones activas
-        current_quota_usage = Enrollment.objects.filter(subject=subject, status="activa").count()
-
-        # Comparar con quota de Subject
-        # Si es mayor o igual a quota, lanzar ValidationError
-        if current_quota_usage >= subject.quota:
+        # --- Reserva de Cupo ---
+        # Se reserva el lugar con un único UPDATE condicional sobre el contador
+        # de la materia. Si la inserción posterior falla, la transacción revierte
+        # también la reserva.
+        # Excepción: Lanzar ValidationError si no quedan lugares
+        if not EnrollmentService.reserve_seat(subject.pk):
             raise ValidationError("El cupo de la materia está completo.")
 
         # --- Creación de Inscripción ---
-        enrollment = Enrollment.objects.create(
+        # Las validaciones de Enrollment.clean y la unicidad ya se verificaron arriba
+        enrollment = Enrollment(
             student=student,
             subject=subject,
             status="activa"
         )
+        # El lugar ya está reservado: la señal post_save no lo vuelve a sumar
+        enrollment.seat_reserved = True
+        try:
+            with transaction.atomic():
+                enrollment.save(skip_validation=True)
+        except IntegrityError:
+            # Otra petición del mismo alumno insertó la inscripción después de la
+            # validación de unicidad: se informa igual y la transacción revierte la reserva
+            raise ValidationError("Ya posees una inscripción histórica para esta materia.")
+
+        # Si estaba en la lista de espera, deja su puesto (la materia quedó
+        # bloqueada por la reserva del lugar)
+        WaitlistService.discard([(student.pk, subject.pk)])
 
         return enrollment
 
+    @staticmethod
+    def cohort_students(career, dnis=()) -> tuple:
+        """
+        Alumnos a inscribir en bloque: los activos de la carrera, o solo los de
+        los DNIs indicados.
+        Retorna (ids, rechazados), con un rechazo
+        {"dni", "student": None, "subject": None, "reason"} por cada DNI que no
+        corresponde a un alumno activo de la carrera.
+        """
+        if not dnis:
+            students = Student.objects.filter(career=career, user__is_active=True)
+            return list(students.values_list("pk", flat=True)), []
+
+        found = {
+            dni: (student_id, career_id, is_active)
+            for dni, student_id, career_id, is_active in Student.objects.filter(dni__in=dnis)
+            .values_list("dni", "pk", "career_id", "user__is_active")
+        }
+        student_ids, rejected = [], []
+        for dni in sorted(dnis):
+            student_id, career_id, is_active = found.get(dni, (None, None, None))
+            if student_id is None:
+                reason = "No existe un alumno con ese DNI."
+            elif career_id != career.pk:
+                reason = "El alumno no pertenece a la carrera seleccionada."
+            elif not is_active:
+                reason = "El estudiante está dado de baja."
+            else:
+                student_ids.append(student_id)
+                continue
+            rejected.append({"dni": dni, "student": None, "subject": None, "reason": reason})
+
+        return student_ids, rejected
+
     @staticmethod
     @transaction.atomic
+    def bulk_enroll(students, subjects) -> dict:
+        """
+        Inscribe un conjunto de estudiantes en un conjunto de materias en una sola transacción.
+
+        Aplica las mismas reglas que create_enrollment (carrera, plan de estudios,
+        unicidad y cupo) pero con consultas por conjunto, por lo que la cantidad de
+        queries no depende del tamaño del lote.
+
+        Recibe iterables de instancias o ids de Student y Subject.
+        Retorna un diccionario con:
+        - "created": lista de Enrollment creados.
+        - "rejected": lista de {"student", "subject", "reason"} por cada par rechazado.
+        """
+        student_ids = {getattr(student, "pk", student) for student in students}
+        subject_ids = {getattr(subject, "pk", subject) for subject in subjects}
+
+        # --- Obtención de datos (2 queries) ---
+        # Las materias se bloquean para que el cupo leído no cambie hasta el final
+        students = list(
+            Student.objects.filter(pk__in=student_ids)
+            .select_related("user")
+            .order_by("surname", "name", "pk")
+        )
+        subjects = list(
+            Subject.objects.select_for_update()
+            .filter(pk__in=subject_ids)
+            .order_by("name")
+        )
+
+        # --- Plan de estudios (1 query) ---
+        career_ids = {student.career_id for student in students if student.career_id}
+        plan = set(
+            Career.subjects.through.objects.filter(
+                career_id__in=career_ids, subject_id__in=subject_ids
+            ).values_list("career_id", "subject_id")
+        )
+
+        # --- Inscripciones históricas (1 query) ---
+        existing = set(
+            Enrollment.objects.filter(
+                student_id__in=student_ids, subject_id__in=subject_ids
+            ).values_list("student_id", "subject_id")
+        )
+
+        # --- Validación en memoria ---
+        remaining = {subject.pk: max(subject.quota - subject.active_count, 0) for subject in subjects}
+        semester = Enrollment.get_semester_from_date(timezone.now())
+        to_create = []
+        rejected = []
+
+        for subject in subjects:
+            for student in students:
+                if not student.user.is_active:
+                    reason = "El estudiante está dado de baja."
+                elif not student.career_id:
+                    reason = "El estudiante no tiene una carrera asignada."
+                elif (student.career_id, subject.pk) not in plan:
+                    reason = "La materia no corresponde al plan de estudios del estudiante."
+                elif (student.pk, subject.pk) in existing:
+                    reason = "El estudiante ya posee una inscripción histórica para esta materia."
+                elif remaining[subject.pk] <= 0:
+                    reason = "El cupo de la materia está completo."
+                else:
+                    reason = None
+
+                if reason:
+                    rejected.append({"student": student, "subject": subject, "reason": reason})
+                    continue
+
+                remaining[subject.pk] -= 1
+                to_create.append(
+                    Enrollment(student=student, subject=subject, status="activa", semester=semester)
+                )
+
+        # --- Creación e impacto en el cupo (2 queries) ---
+        # bulk_create no dispara señales: las estadísticas se actualizan a mano
+        created = Enrollment.objects.bulk_create(to_create)
+        EnrollmentStatsService.record_bulk_created(created)
+        StudentProgressService.record_bulk_created(created)
+        WaitlistService.discard([(enrollment.student_id, enrollment.subject_id) for enrollment in created])
+
+        seats = Counter(enrollment.subject_id for enrollment in created)
+        if seats:
+            Subject.objects.filter(pk__in=seats).update(
+                active_count=F("active_count") + Case(
+                    *[When(pk=subject_id, then=Value(count)) for subject_id, count in seats.items()],
+                    output_field=models.PositiveIntegerField(),
+                )
+            )
+
+        return {"created": created, "rejected": rejected}
+
+    @staticmethod
+    @retry_on_contention
     def unenroll_student(student, enrollment_id):
-        enrollment = get_object_or_404(Enrollment, pk=enrollment_id)
+        # Bloqueamos la inscripción para que dos bajas simultáneas no liberen el cupo dos veces
+        enrollment = get_object_or_404(Enrollment.objects.select_for_update(), pk=enrollment_id)
 
-        if enrollment.student != student:
+        if enrollment.student_id != student.pk:
             raise ValidationError("No tienes permisos para modificar esta inscripción.")
 
         # Estados válidos para darse de baja 
         if enrollment.status not in ["activa", "regular"]:
             raise ValidationError("No se puede dar de baja una materia finalizada.")
 
+        was_active = enrollment.status == "activa"
+
+        # Si estaba activa, la señal post_save libera el lugar al guardar
         enrollment.status = "baja"
-        enrollment.save()
+        enrollment.save(update_fields=["status"], skip_validation=True)
+
+        # El lugar liberado pasa al primero de la lista de espera en la misma transacción
+        if was_active:
+            WaitlistService.promote_next(enrollment.subject_id)
 
         return enrollment
+
+    # === MÉTODOS DE CUPO ===
+
+    @staticmethod
+    def reserve_seat(subject_id: int) -> bool:
+        """
+        Ocupa un lugar en la materia de forma atómica.
+        Ejecuta UPDATE ... SET active_count = active_count + 1
+        WHERE id = ? AND active_count < quota, por lo que dos pedidos concurrentes
+        nunca pueden superar el cupo y el costo no depende de la cantidad de inscripciones.
+        Retorna True si se reservó el lugar, False si el cupo está completo.
+        """
+        updated = Subject.objects.filter(
+            pk=subject_id,
+            active_count__lt=F("quota"),
+        ).update(active_count=F("active_count") + 1)
+
+        return updated == 1
+
+    @staticmethod
+    def occupy_seat(subject_id: int) -> None:
+        """
+        Suma un lugar ocupado sin controlar el cupo. Para inscripciones que pasan
+        a "activa" fuera de create_enrollment (admin, cambios de estado);
+        ver enrollments.signals.
+        """
+        Subject.objects.filter(pk=subject_id).update(active_count=F("active_count") + 1)
+
+    @staticmethod
+    def release_seat(subject_id: int) -> None:
+        """
+        Libera un lugar previamente reservado en la materia.
+        """
+        Subject.objects.filter(
+            pk=subject_id,
+            active_count__gt=0,
+        ).update(active_count=F("active_count") - 1)
+
+
+class WaitlistService:
+    """
+    Lista de espera (FIFO) de las materias con el cupo completo.
+
+    Todas las operaciones bloquean primero la fila de la materia
+    (select_for_update), así altas, bajas y promociones de una misma materia
+    se aplican de a una y los puestos quedan contiguos (1..n).
+    """
+
+    # Candidatos que se leen por consulta al buscar al próximo promovible
+    PROMOTION_BATCH = 20
+
+    @staticmethod
+    def _lock_subject(subject_id: int) -> Subject:
+        subject = Subject.objects.select_for_update().filter(pk=subject_id).first()
+        if subject is None:
+            raise ValidationError("La materia especificada no existe.")
+        return subject
+
+    @staticmethod
+    @retry_on_contention
+    def join(user: User, subject_id: int) -> WaitlistEntry:
+        """
+        Agrega al estudiante al final de la lista de espera de la materia.
+        Solo se puede esperar lugar en una materia del plan, sin inscripción
+        previa y con el cupo completo.
+        """
+        if not hasattr(user, "student_profile"):
+            raise ValidationError("El usuario no es un alumno.")
+        student = user.student_profile
+
+        if not student.career_id:
+            raise ValidationError("No tienes una carrera asignada. Contacta a administración.")
+
+        subject = WaitlistService._lock_subject(subject_id)
+
+        if not Career.subjects.through.objects.filter(
+            career_id=student.career_id, subject_id=subject_id
+        ).exists():
+            raise ValidationError("Esta materia no corresponde a tu plan de estudios.")
+
+        if Enrollment.objects.filter(student=student, subject_id=subject_id).exists():
+            raise ValidationError("Ya posees una inscripción histórica para esta materia.")
+
+        if subject.active_count < subject.quota:
+            raise ValidationError("La materia tiene cupo disponible: inscríbete directamente.")
+
+        if WaitlistEntry.objects.filter(student=student, subject_id=subject_id).exists():
+            raise ValidationError("Ya estás en la lista de espera de esta materia.")
+
+        # Último puesto por índice (subject, position), sin contar filas
+        last = (
+            WaitlistEntry.objects.filter(subject_id=subject_id)
+            .order_by("-position")
+            .values_list("position", flat=True)
+            .first()
+        )
+        return WaitlistEntry.objects.create(subject_id=subject_id, student=student, position=(last or 0) + 1)
+
+    @staticmethod
+    @retry_on_contention
+    def leave(student, subject_id: int) -> None:
+        """
+        Quita al estudiante de la lista de espera; los de atrás avanzan un puesto.
+        """
+        WaitlistService._lock_subject(subject_id)
+
+        entry = WaitlistEntry.objects.filter(student=student, subject_id=subject_id).first()
+        if entry is None:
+            raise ValidationError("No estás en la lista de espera de esta materia.")
+
+        entry.delete()
+        WaitlistService._close_gap(subject_id, entry.position)
+
+    @staticmethod
+    def _close_gap(subject_id: int, position: int) -> None:
+        WaitlistEntry.objects.filter(subject_id=subject_id, position__gt=position).update(
+            position=F("position") - 1
+        )
+
+    @staticmethod
+    def discard(pairs) -> None:
+        """
+        Quita de la lista de espera a los estudiantes que quedaron inscritos por
+        otra vía (create_enrollment, bulk_enroll). Recibe pares
+        (student_id, subject_id) y debe llamarse dentro de esa transacción, con
+        las materias ya bloqueadas. Sin entradas que quitar cuesta una consulta;
+        con entradas, tres (lectura, DELETE y un único UPDATE que renumera todas
+        las filas afectadas), sin importar cuántas sean.
+        """
+        by_subject = {}
+        for student_id, subject_id in pairs:
+            by_subject.setdefault(subject_id, set()).add(student_id)
+        if not by_subject:
+            return
+
+        condition = Q()
+        for subject_id, student_ids in by_subject.items():
+            condition |= Q(subject_id=subject_id, student_id__in=student_ids)
+        removed = list(WaitlistEntry.objects.filter(condition).values_list("pk", "subject_id", "position"))
+        if not removed:
+            return
+
+        WaitlistEntry.objects.filter(pk__in=[pk for pk, _, _ in removed]).delete()
+
+        # Cada entrada retrocede tantos puestos como entradas quitadas tenía
+        # delante. Por materia, los When van del puesto quitado más alto al más
+        # bajo: el primero que coincide da la cantidad de quitadas por delante.
+        gaps = {}
+        for _, subject_id, position in removed:
+            gaps.setdefault(subject_id, []).append(position)
+        shifts = []
+        behind_a_gap = Q()
+        for subject_id, positions in gaps.items():
+            positions.sort()
+            shifts.extend(
+                When(subject_id=subject_id, position__gt=position, then=Value(count))
+                for count, position in reversed(list(enumerate(positions, start=1)))
+            )
+            behind_a_gap |= Q(subject_id=subject_id, position__gt=positions[0])
+        WaitlistEntry.objects.filter(behind_a_gap).update(
+            position=F("position") - Case(*shifts, default=Value(0), output_field=models.PositiveIntegerField())
+        )
+
+    @staticmethod
+    def _queue(subject_id: int):
+        """
+        Recorre la lista de espera en orden, por bloques de PROMOTION_BATCH,
+        anotando si cada estudiante todavía puede inscribirse.
+        """
+        candidates = (
+            WaitlistEntry.objects.filter(subject_id=subject_id)
+            .annotate(
+                active=F("student__user__is_active"),
+                in_plan=Exists(Career.subjects.through.objects.filter(
+                    career_id=OuterRef("student__career_id"), subject_id=subject_id
+                )),
+                enrolled=Exists(Enrollment.objects.filter(
+                    student_id=OuterRef("student_id"), subject_id=subject_id
+                )),
+            )
+            .order_by("position")
+        )
+        last = 0
+        while True:
+            batch = list(candidates.filter(position__gt=last)[:WaitlistService.PROMOTION_BATCH])
+            if not batch:
+                return
+            yield from batch
+            last = batch[-1].position
+
+    @staticmethod
+    def promote_next(subject_id: int) -> Enrollment | None:
+        """
+        Inscribe al primer estudiante de la lista de espera que todavía puede
+        cursar la materia (usuario activo, sigue en una carrera con la materia
+        en el plan y no tiene inscripción), si queda un lugar libre. Los anteriores que ya no
+        pueden cursarla salen de la lista.
+
+        Se llama dentro de la transacción que liberó el lugar (unenroll_student).
+        Retorna la inscripción creada o None.
+        """
+        WaitlistService._lock_subject(subject_id)
+
+        consumed = 0
+        promoted = None
+        for entry in WaitlistService._queue(subject_id):
+            if not (entry.active and entry.in_plan) or entry.enrolled:
+                # Ya no puede cursarla: sale de la lista
+                consumed = entry.position
+                continue
+            if EnrollmentService.reserve_seat(subject_id):
+                promoted = Enrollment(student_id=entry.student_id, subject_id=subject_id, status="activa")
+                promoted.seat_reserved = True
+                promoted.save(skip_validation=True)
+                consumed = entry.position
+            break
+
+        # Salen los puestos 1..consumed y el resto avanza en un solo UPDATE
+        if consumed:
+            WaitlistEntry.objects.filter(subject_id=subject_id, position__lte=consumed).delete()
+            WaitlistEntry.objects.filter(subject_id=subject_id).update(position=F("position") - consumed)
+
+        return promoted
+
+    @staticmethod
+    @retry_on_contention
+    def fill_open_seats(subject_id: int) -> int:
+        """
+        Promueve estudiantes de la lista de espera mientras la materia tenga
+        lugares libres (ej. después de aumentar el cupo). Retorna cuántos entraron.
+        """
+        promoted = 0
+        while WaitlistService.promote_next(subject_id) is not None:
+            promoted += 1
+        return promoted
+
+
+class EnrollmentStatsService:
+    """
+    Servicio que mantiene el resumen SubjectEnrollmentStats.
+    Cada cambio de estado se aplica como un UPDATE incremental sobre la fila
+    (materia, semestre), sin volver a contar inscripciones.
+    """
+
+    @staticmethod
+    def apply_delta(subject_id: int, semester: str, deltas: dict) -> None:
+        """
+        Suma los deltas recibidos ({estado: cantidad}) a la fila de la materia y semestre.
+        Si la fila no existe todavía, la crea.
+        """
+        deltas = {status: delta for status, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        fields = SubjectEnrollmentStats.COUNT_FIELDS
+        # Los descuentos no bajan de cero: si el resumen quedó desfasado (ej. una
+        # inscripción creada con bulk_create sin registrar), borrarla no debe
+        # violar el CHECK del contador y hacer fallar la baja
+        updates = {
+            fields[status]: F(fields[status]) + delta if delta > 0 else Greatest(F(fields[status]) + delta, 0)
+            for status, delta in deltas.items()
+        }
+        qs = SubjectEnrollmentStats.objects.filter(subject_id=subject_id, semester=semester)
+
+        if qs.update(**updates):
+            return
+
+        try:
+            with transaction.atomic():
+                SubjectEnrollmentStats.objects.create(
+                    subject_id=subject_id,
+                    semester=semester,
+                    **{fields[status]: max(delta, 0) for status, delta in deltas.items()},
+                )
+        except IntegrityError:
+            # Otra transacción creó la fila en paralelo: aplicamos el incremento sobre ella
+            qs.update(**updates)
+
+    @staticmethod
+    def record_status_change(enrollment: Enrollment, old_status, new_status) -> None:
+        """
+        Registra el alta (old_status=None), la baja física (new_status=None)
+        o el cambio de estado de una inscripción.
+        """
+        if old_status == new_status:
+            return
+
+        deltas = Counter()
+        if old_status:
+            deltas[old_status] -= 1
+        if new_status:
+            deltas[new_status] += 1
+
+        EnrollmentStatsService.apply_delta(enrollment.subject_id, enrollment.semester, deltas)
+
+    @staticmethod
+    def record_bulk_created(enrollments) -> None:
+        """
+        Registra inscripciones creadas con bulk_create (que no dispara señales).
+        Ejecuta un UPDATE por cada par (materia, semestre), no por inscripción.
+        """
+        grouped = {}
+        for enrollment in enrollments:
+            key = (enrollment.subject_id, enrollment.semester)
+            grouped.setdefault(key, Counter())[enrollment.status] += 1
+
+        for (subject_id, semester), deltas in grouped.items():
+            EnrollmentStatsService.apply_delta(subject_id, semester, deltas)
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild() -> dict:
+        """
+        Reconstruye el resumen desde cero a partir de la tabla Enrollment
+        y resincroniza el contador de cupo (Subject.active_count).
+        Retorna la cantidad de filas generadas y de materias corregidas.
+        """
+        rows = {}
+        grouped = (
+            Enrollment.objects.order_by()
+            .values("subject_id", "semester", "status")
+            .annotate(total=Count("id"))
+        )
+        for row in grouped:
+            stats = rows.setdefault(
+                (row["subject_id"], row["semester"]),
+                SubjectEnrollmentStats(subject_id=row["subject_id"], semester=row["semester"]),
+            )
+            setattr(stats, SubjectEnrollmentStats.COUNT_FIELDS[row["status"]], row["total"])
+
+        SubjectEnrollmentStats.objects.all().delete()
+        SubjectEnrollmentStats.objects.bulk_create(rows.values())
+
+        active = (
+            Enrollment.objects.filter(subject=OuterRef("pk"), status="activa")
+            .order_by()
+            .values("subject")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        fixed = (
+            Subject.objects.annotate(real_count=Coalesce(Subquery(active), 0))
+            .exclude(active_count=F("real_count"))
+            .update(active_count=Coalesce(Subquery(active), 0))
+        )
+
+        return {"stats_rows": len(rows), "subjects_fixed": fixed}
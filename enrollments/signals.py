@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from enrollments.models import Enrollment
+from enrollments.services import EnrollmentService, EnrollmentStatsService
+from students.services import StudentProgressService
+
+
+@receiver(post_save, sender=Enrollment)
+def update_stats_on_save(sender, instance, created, **kwargs):
+    """
+    Actualiza SubjectEnrollmentStats, StudentProgress y el cupo de la materia
+    cuando se crea una inscripción o cambia su estado.
+    """
+    old_status = None if created else getattr(instance, "_loaded_status", None)
+    EnrollmentStatsService.record_status_change(instance, old_status, instance.status)
+    StudentProgressService.record_status_change(instance, old_status, instance.status)
+
+    # Cupo (Subject.active_count): solo ocupan lugar las inscripciones activas.
+    # create_enrollment reserva el lugar antes de guardar (seat_reserved)
+    was_active = old_status == "activa"
+    is_active = instance.status == "activa"
+    if is_active and not was_active and not instance.seat_reserved:
+        EnrollmentService.occupy_seat(instance.subject_id)
+    elif was_active and not is_active:
+        EnrollmentService.release_seat(instance.subject_id)
+    instance.seat_reserved = False
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Enrollment)
+def update_stats_on_delete(sender, instance, **kwargs):
+    """
+    Descuenta la inscripción eliminada (incluye borrados en cascada)
+    y libera su lugar si estaba activa.
+    """
+    EnrollmentStatsService.record_status_change(instance, instance.status, None)
+    StudentProgressService.record_status_change(instance, instance.status, None)
+    if instance.status == "activa":
+        EnrollmentService.release_seat(instance.subject_id)
@@ -1,3 +1,326 @@
-from django.test import TestCase
+import threading
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.core.exceptions import ValidationError
+from django.db import connection, connections, transaction
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from careers.models import Career
+from enrollments.models import Enrollment, SubjectEnrollmentStats, WaitlistEntry
+from enrollments.services import EnrollmentService, WaitlistService
+from students.models import StudentProgress
+from students.services import StudentService
+from subjects.models import Subject
+from users.services.teacher_service import TeacherService
+
+
+def create_plan(quota, students):
+    """
+    Una carrera con una materia de cupo quota y students alumnos inscriptos en la carrera.
+    """
+    teacher = TeacherService.create_teacher({
+        "name": "Pablo", "surname": "Profesor", "dni": "20000000", "email": "teacher@enrollments.test",
+        "academic_degree": "TEACHER", "hire_date": date(2020, 1, 1),
+    })
+    career = Career.objects.create(name="Sistemas")
+    subject = Subject.objects.create(name="Algoritmos", quota=quota, teacher=teacher)
+    career.subjects.set([subject])
+    return career, subject, [
+        StudentService.create_student({
+            "name": f"Alumno {n}", "surname": "Prueba", "dni": f"3000000{n}",
+            "email": f"alumno{n}@enrollments.test", "career": career,
+        })
+        for n in range(students)
+    ]
+
+
+class SeatCounterTests(TestCase):
+    """
+    Subject.active_count sigue a las inscripciones activas, se creen o cambien
+    de estado desde los servicios o directamente con el ORM.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.career, cls.subject, cls.students = create_plan(quota=2, students=3)
+
+    def active_count(self):
+        self.subject.refresh_from_db()
+        return self.subject.active_count
+
+    def test_create_enrollment_reserves_one_seat(self):
+        EnrollmentService.create_enrollment(self.students[0].user, self.subject.pk)
+
+        self.assertEqual(self.active_count(), 1)
+
+    def test_create_enrollment_rejects_when_full(self):
+        EnrollmentService.create_enrollment(self.students[0].user, self.subject.pk)
+        EnrollmentService.create_enrollment(self.students[1].user, self.subject.pk)
+
+        with self.assertRaisesMessage(ValidationError, "El cupo de la materia está completo."):
+            EnrollmentService.create_enrollment(self.students[2].user, self.subject.pk)
+        self.assertEqual(self.active_count(), 2)
+
+    def test_unenroll_releases_the_seat(self):
+        enrollment = EnrollmentService.create_enrollment(self.students[0].user, self.subject.pk)
+
+        EnrollmentService.unenroll_student(self.students[0], enrollment.pk)
+
+        self.assertEqual(self.active_count(), 0)
+        self.assertEqual(Enrollment.objects.get(pk=enrollment.pk).status, "baja")
+
+    def test_unenroll_twice_releases_once(self):
+        first = EnrollmentService.create_enrollment(self.students[0].user, self.subject.pk)
+        EnrollmentService.create_enrollment(self.students[1].user, self.subject.pk)
+
+        EnrollmentService.unenroll_student(self.students[0], first.pk)
+        with self.assertRaises(ValidationError):
+            EnrollmentService.unenroll_student(self.students[0], first.pk)
+
+        self.assertEqual(self.active_count(), 1)
+
+    def test_status_changes_through_the_orm(self):
+        enrollment = Enrollment.objects.create(student=self.students[0], subject=self.subject, status="activa")
+        self.assertEqual(self.active_count(), 1)
+
+        enrollment.status = "regular"
+        enrollment.save()
+        self.assertEqual(self.active_count(), 0)
+
+        enrollment.status = "activa"
+        enrollment.save()
+        self.assertEqual(self.active_count(), 1)
+
+        enrollment.delete()
+        self.assertEqual(self.active_count(), 0)
+
+    def test_duplicate_insert_after_the_uniqueness_check_is_a_validation_error(self):
+        EnrollmentService.create_enrollment(self.students[0].user, self.subject.pk)
+        exists = QuerySet.exists
+
+        # Simula otra petición del mismo alumno que ya pasó la validación de unicidad
+        def enrollment_not_found(queryset):
+            return False if queryset.model is Enrollment else exists(queryset)
+
+        with mock.patch.object(QuerySet, "exists", autospec=True, side_effect=enrollment_not_found):
+            with self.assertRaisesMessage(ValidationError, "Ya posees una inscripción histórica"):
+                EnrollmentService.create_enrollment(self.students[0].user, self.subject.pk)
+
+        self.assertEqual(self.active_count(), 1)
+
+    def test_delete_after_bulk_create_without_signals_keeps_counters_at_zero(self):
+        # La fila de estadísticas del semestre ya existe (en cero para "aprobada")
+        enrollment = EnrollmentService.create_enrollment(self.students[1].user, self.subject.pk)
+        # bulk_create no dispara señales: ni estadísticas ni avance la contaron
+        drifted = Enrollment.objects.bulk_create([
+            Enrollment(student=self.students[0], subject=self.subject, status="aprobada", semester=enrollment.semester),
+        ])[0]
+
+        Enrollment.objects.get(pk=drifted.pk).delete()
+
+        stats = SubjectEnrollmentStats.objects.get(subject=self.subject)
+        self.assertEqual((stats.aprobada_count, stats.activa_count), (0, 1))
+        self.assertEqual(StudentProgress.objects.get(student=self.students[0]).approved_count, 0)
+
+    def test_saving_without_status_change_keeps_the_counter(self):
+        enrollment = EnrollmentService.create_enrollment(self.students[0].user, self.subject.pk)
+
+        Enrollment.objects.get(pk=enrollment.pk).save()
+
+        self.assertEqual(self.active_count(), 1)
+
+
+# La base de test de SQLite (en memoria, cache compartido) no espera el lock:
+# la contención falla enseguida, así que se dan más reintentos que en producción
+@override_settings(CONTENTION_RETRY_ATTEMPTS=12)
+class ConcurrentEnrollmentTests(TransactionTestCase):
+    """
+    Varios alumnos pidiendo los últimos lugares a la vez, cada uno con su conexión.
+    """
+
+    def test_concurrent_enrollments_never_exceed_the_quota(self):
+        _, subject, students = create_plan(quota=3, students=8)
+        barrier = threading.Barrier(len(students))
+        results = []
+        lock = threading.Lock()
+
+        def enroll(student):
+            try:
+                barrier.wait()
+                try:
+                    EnrollmentService.create_enrollment(student.user, subject.pk)
+                    outcome = "created"
+                except ValidationError as e:
+                    outcome = e.messages[0]
+                with lock:
+                    results.append(outcome)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=enroll, args=(student,)) for student in students]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        subject.refresh_from_db()
+        self.assertEqual(results.count("created"), 3)
+        self.assertEqual(results.count("El cupo de la materia está completo."), 5)
+        self.assertEqual(Enrollment.objects.filter(subject=subject, status="activa").count(), 3)
+        self.assertEqual(subject.active_count, 3)
+
+
+class WaitlistServiceTests(TestCase):
+    """
+    Lista de espera: puestos contiguos, promoción FIFO y ampliación de cupo.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.career, cls.subject, cls.students = create_plan(quota=1, students=6)
+
+    def setUp(self):
+        # El primer alumno ocupa el único lugar
+        self.enrollment = EnrollmentService.create_enrollment(self.students[0].user, self.subject.pk)
+
+    def queue(self):
+        return list(
+            WaitlistEntry.objects.filter(subject=self.subject)
+            .order_by("position")
+            .values_list("student_id", "position")
+        )
+
+    def join(self, *students):
+        for student in students:
+            WaitlistService.join(student.user, self.subject.pk)
+
+    def test_join_appends_contiguous_positions(self):
+        first, second, third = self.students[1:4]
+        self.join(first, second, third)
+
+        self.assertEqual(self.queue(), [(first.pk, 1), (second.pk, 2), (third.pk, 3)])
+
+    def test_join_rejects_duplicates_and_subjects_with_free_seats(self):
+        self.join(self.students[1])
+
+        with self.assertRaises(ValidationError):
+            self.join(self.students[1])
+
+        Subject.objects.filter(pk=self.subject.pk).update(quota=5)
+        with self.assertRaises(ValidationError):
+            self.join(self.students[2])
+
+    def test_leave_closes_the_gap(self):
+        first, second, third = self.students[1:4]
+        self.join(first, second, third)
+
+        WaitlistService.leave(second, self.subject.pk)
+
+        self.assertEqual(self.queue(), [(first.pk, 1), (third.pk, 2)])
+
+    def test_unenroll_promotes_the_first_in_line(self):
+        first, second = self.students[1:3]
+        self.join(first, second)
+
+        EnrollmentService.unenroll_student(self.students[0], self.enrollment.pk)
+
+        self.assertTrue(Enrollment.objects.filter(student=first, subject=self.subject, status="activa").exists())
+        self.assertEqual(self.queue(), [(second.pk, 1)])
+        self.subject.refresh_from_db()
+        self.assertEqual(self.subject.active_count, 1)
+
+    def test_promote_next_drops_ineligible_entries(self):
+        moved, inactive, eligible, last = self.students[1:5]
+        self.join(moved, inactive, eligible, last)
+
+        # Uno cambió de carrera y otro fue dado de baja: ya no pueden cursarla
+        moved.career = Career.objects.create(name="Otra carrera")
+        moved.save()
+        inactive.user.is_active = False
+        inactive.user.save(update_fields=["is_active"])
+
+        EnrollmentService.unenroll_student(self.students[0], self.enrollment.pk)
+
+        self.assertTrue(Enrollment.objects.filter(student=eligible, subject=self.subject).exists())
+        self.assertFalse(Enrollment.objects.filter(student__in=[moved, inactive], subject=self.subject).exists())
+        self.assertEqual(self.queue(), [(last.pk, 1)])
+
+    def test_promote_next_without_free_seat_keeps_the_queue(self):
+        first = self.students[1]
+        self.join(first)
+
+        self.assertIsNone(WaitlistService.promote_next(self.subject.pk))
+        self.assertEqual(self.queue(), [(first.pk, 1)])
+
+    def test_fill_open_seats_after_quota_increase(self):
+        first, second, third = self.students[1:4]
+        self.join(first, second, third)
+
+        Subject.objects.filter(pk=self.subject.pk).update(quota=3)
+        promoted = WaitlistService.fill_open_seats(self.subject.pk)
+
+        self.assertEqual(promoted, 2)
+        self.assertEqual(
+            set(Enrollment.objects.filter(subject=self.subject, status="activa").values_list("student_id", flat=True)),
+            {self.students[0].pk, first.pk, second.pk},
+        )
+        self.assertEqual(self.queue(), [(third.pk, 1)])
+
+    def test_direct_enrollment_leaves_the_queue(self):
+        first, second, third = self.students[1:4]
+        self.join(first, second, third)
+
+        Subject.objects.filter(pk=self.subject.pk).update(quota=2)
+        EnrollmentService.create_enrollment(second.user, self.subject.pk)
+
+        self.assertEqual(self.queue(), [(first.pk, 1), (third.pk, 2)])
+
+
+class BulkEnrollWaitlistTests(TestCase):
+    """
+    bulk_enroll quita de la lista de espera a los inscriptos y renumera las
+    filas restantes con una cantidad fija de consultas.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.career, cls.subject, cls.students = create_plan(quota=10, students=6)
+        cls.other = Subject.objects.create(name="Bases de datos", quota=10, teacher=cls.subject.teacher)
+        cls.career.subjects.add(cls.other)
+
+    def wait(self, subject, students):
+        WaitlistEntry.objects.bulk_create([
+            WaitlistEntry(subject=subject, student=student, position=position)
+            for position, student in enumerate(students, start=1)
+        ])
+
+    def queue(self, subject):
+        return list(
+            WaitlistEntry.objects.filter(subject=subject).order_by("position").values_list("student_id", "position")
+        )
+
+    def test_enrolled_students_leave_every_queue(self):
+        s0, s1, s2, s3, s4 = self.students[:5]
+        self.wait(self.subject, [s0, s1, s2, s3, s4])
+        self.wait(self.other, [s4, s3, s2])
+
+        EnrollmentService.bulk_enroll([s1, s3], [self.subject, self.other])
+
+        self.assertEqual(self.queue(self.subject), [(s0.pk, 1), (s2.pk, 2), (s4.pk, 3)])
+        self.assertEqual(self.queue(self.other), [(s4.pk, 1), (s2.pk, 2)])
+
+    def test_query_count_does_not_depend_on_waitlisted_students(self):
+        def count_queries(enrolled):
+            savepoint = transaction.savepoint()
+            # Los inscriptos quedan intercalados con quienes siguen esperando
+            queue = [student for pair in zip(enrolled, self.students[len(enrolled):]) for student in pair]
+            self.wait(self.subject, queue)
+            with CaptureQueriesContext(connection) as queries:
+                EnrollmentService.bulk_enroll(enrolled, [self.subject])
+            transaction.savepoint_rollback(savepoint)
+            return len(queries)
+
+        self.assertEqual(count_queries(self.students[:1]), count_queries(self.students[:3]))
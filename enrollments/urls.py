@@ -1,13 +1,30 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
 app_name = "enrollments"
 
+# Con ASYNC_ENROLLMENT_VIEWS (despliegue ASGI) la oferta, la inscripción y la
+# baja usan sus versiones async
+if settings.ASYNC_ENROLLMENT_VIEWS:
+    list_view = views.AsyncStudentEnrollmentListView
+    action_view = views.AsyncEnrollmentActionView
+    drop_view = views.AsyncEnrollmentDropView
+else:
+    list_view = views.StudentEnrollmentListView
+    action_view = views.EnrollmentActionView
+    drop_view = views.EnrollmentDropView
+
 urlpatterns = [
-    path("list/", views.StudentEnrollmentListView.as_view(), name="enrollment_list"),
-    path("create/", views.EnrollmentActionView.as_view(), name="enrollment_create"),
+    path("list/", list_view.as_view(), name="enrollment_list"),
+    path("create/", action_view.as_view(), name="enrollment_create"),
     path("my-enrollments/", views.MyEnrollmentListView.as_view(), name="my_enrollments"),
-    path("unenroll/<int:pk>/", views.EnrollmentDropView.as_view(), name="enrollment_drop"),
+    path("unenroll/<int:pk>/", drop_view.as_view(), name="enrollment_drop"),
+    path("waitlist/join/", views.WaitlistJoinView.as_view(), name="waitlist_join"),
+    path("waitlist/<int:subject_id>/leave/", views.WaitlistLeaveView.as_view(), name="waitlist_leave"),
     path("admin-list/", views.EnrollmentAdminListView.as_view(), name="enrollment_admin_list"),
+    path("admin-list/export/<str:export_format>/", views.EnrollmentExportView.as_view(),
+         name="enrollment_export"),
+    path("bulk-create/", views.EnrollmentBulkCreateView.as_view(), name="enrollment_bulk_create"),
 
 ]
@@ -1,46 +1,69 @@
+from asgiref.sync import sync_to_async
 from django.contrib import messages
+from django.core.paginator import InvalidPage, Paginator
 from django.forms import ValidationError
 from django.shortcuts import redirect
-from django.views.generic import ListView, View
-from django.db.models import Count, Q
-from django.http import HttpResponseNotAllowed
-
-from users.mixins import StudentRequiredMixin, AdminRequiredMixin
-
-from .forms import EnrollmentCreateForm
-from .models import Enrollment
-from .services import EnrollmentService
-from careers.models import Career
-from students.models import Student
+from django.template.response import TemplateResponse
+from django.views.generic import FormView, ListView, View
+from django.db.models import F, OuterRef, Subquery
+from django.http import Http404, HttpResponseNotAllowed
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from core.async_db import run_in_db_thread
+from core.choices import career_choices, subject_choices
+from core.db_routers import ReplicaReadMixin
+from core.exports import EXPORT_FORMATS, streaming_export_response
+from core.pagination import KeysetPaginationMixin
+from users.mixins import AsyncStudentRequiredMixin, StudentRequiredMixin, AdminRequiredMixin
+
+from .forms import EnrollmentBulkForm, EnrollmentCreateForm
+from .models import Enrollment, WaitlistEntry
+from .services import EnrollmentService, WaitlistService
+from students.services import StudentProgressService
 from subjects.models import Subject
 
 
-class StudentEnrollmentListView(StudentRequiredMixin, ListView):
+class StudentEnrollmentListView(StudentRequiredMixin, ReplicaReadMixin, ListView):
     """
     Vista para listar las materias disponibles para inscripción de un estudiante.
     Muestra las materias que pertenecen a la carrera del estudiante y en las que
     no está actualmente inscrito.
-    Además, anota cada materia con la cantidad de inscripciones activas.
+    Además, anota cada materia con la cantidad de inscripciones activas
+    (leída del contador de cupo de la materia, sin contar filas).
     """
     model = Subject
     template_name = "enrollments/enrollment_list.html"
+    query_budget = 4
     context_object_name = "subjects"
     paginate_by = 20
 
     def get_queryset(self):
-        student = Student.objects.get(user=self.request.user)
-
+        # El perfil (con su carrera) ya viene cargado en request.profile
+        return self.available_subjects(self.request.profile)
+
+    @staticmethod
+    def available_subjects(student):
+        """
+        Materias del plan del estudiante en las que no tiene inscripción.
+        Compartida con la versión async de la vista.
+        """
         # En caso de que el estudiante no tenga carrera asignada, no se muestran materias
-        if not student.career:
+        if not student.career_id:
             return Subject.objects.none()
 
+        # Puesto en la lista de espera, leído por el índice único (materia, estudiante)
+        waitlist_position = WaitlistEntry.objects.filter(
+            subject=OuterRef("pk"), student=student
+        ).values("position")[:1]
+
         queryset = (
-            Subject.objects.filter(careers=student.career)
+            Subject.objects.filter(careers=student.career_id)
             .exclude(enrollments__student=student)
+            .select_related("teacher")
             .annotate(
-                active_enrollments_count=Count(
-                    "enrollments", filter=Q(enrollments__status="activa")
-                )
+                active_enrollments_count=F("active_count"),
+                waitlist_position=Subquery(waitlist_position),
             )
             .order_by("name")
         )
@@ -48,7 +71,7 @@ class StudentEnrollmentListView(StudentRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        student = Student.objects.get(user=self.request.user)
+        student = self.request.profile
         context["student"] = student
         context["career"] = student.career
         return context
@@ -77,24 +100,81 @@ class EnrollmentActionView(StudentRequiredMixin, View):
         return redirect("enrollments:enrollment_list")
 
 
-class MyEnrollmentListView(StudentRequiredMixin, ListView):
+class MyEnrollmentListView(StudentRequiredMixin, ReplicaReadMixin, ListView):
     """
     Vista para listar las inscripciones de un estudiante.
     """
     template_name = "enrollments/my_enrollments.html"
+    query_budget = 3
     context_object_name = "enrollments"
 
     def get_queryset(self):
-        student = self.request.user.student_profile
+        student = self.request.profile
 
         return (
             Enrollment.objects.filter(
                 student=student
             )
-            .select_related("subject")
+            .select_related("subject__teacher")
             .order_by("-enrolled_at")
         )
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Una lectura por clave primaria sobre StudentProgress
+        context["progress"] = StudentProgressService.get_progress(self.request.profile)
+        return context
+
+
+class WaitlistJoinView(StudentRequiredMixin, View):
+    """
+    Vista para anotarse en la lista de espera de una materia con el cupo completo.
+    Cuando se libera un lugar, el primero de la lista queda inscrito
+    (ver WaitlistService.promote_next).
+    """
+    def post(self, request, *args, **kwargs):
+        form = EnrollmentCreateForm(request.POST)
+
+        if not form.is_valid():
+            messages.error(request, "Datos inválidos.")
+            return redirect("enrollments:enrollment_list")
+
+        try:
+            subject = form.cleaned_data["subject"]
+            entry = WaitlistService.join(user=request.user, subject_id=subject.id)
+
+        except ValidationError as e:
+            messages.error(request, str(e))
+            return redirect("enrollments:enrollment_list")
+
+        messages.success(
+            request,
+            f"Te anotaste en la lista de espera (puesto {entry.position}). "
+            "Si se libera un lugar quedarás inscrito automáticamente."
+        )
+        return redirect("enrollments:enrollment_list")
+
+    def get(self, *args, **kwargs):
+        return HttpResponseNotAllowed(["POST"])
+
+
+class WaitlistLeaveView(StudentRequiredMixin, View):
+    """
+    Vista para salir de la lista de espera de una materia.
+    """
+
+    def post(self, request, subject_id):
+        try:
+            WaitlistService.leave(request.profile, subject_id)
+            messages.success(request, "Saliste de la lista de espera.")
+        except ValidationError as e:
+            messages.error(request, str(e))
+
+        return redirect("enrollments:enrollment_list")
+
+    def get(self, *args, **kwargs):
+        return HttpResponseNotAllowed(["POST"])
+
 
 class EnrollmentDropView(StudentRequiredMixin, View):
     """
@@ -102,7 +182,7 @@ class EnrollmentDropView(StudentRequiredMixin, View):
     """
 
     def post(self, request, pk):
-        student = request.user.student_profile
+        student = request.profile
         try:
             EnrollmentService.unenroll_student(student, pk)
             messages.success(request, "Te has dado de baja correctamente.")
@@ -115,14 +195,132 @@ class EnrollmentDropView(StudentRequiredMixin, View):
         return HttpResponseNotAllowed(["POST"])
 
 
-class EnrollmentAdminListView(AdminRequiredMixin, ListView):
+class AsyncStudentEnrollmentListView(AsyncStudentRequiredMixin, ReplicaReadMixin, View):
+    """
+    Versión async de StudentEnrollmentListView para el despliegue ASGI
+    (ver ASYNC_ENROLLMENT_VIEWS en settings). Mismo template y contexto.
+
+    El conteo y la página se leen con el ORM async; la página se carga completa
+    antes de renderizar, así el template no ejecuta consultas.
+    """
+    template_name = StudentEnrollmentListView.template_name
+    query_budget = StudentEnrollmentListView.query_budget
+    paginate_by = StudentEnrollmentListView.paginate_by
+
+    async def get(self, request, *args, **kwargs):
+        student = request.profile
+        queryset = StudentEnrollmentListView.available_subjects(student)
+
+        # Paginator.count es un cached_property: se precarga con el conteo async
+        paginator = Paginator(queryset, self.paginate_by)
+        paginator.count = await queryset.acount()
+        page_number = request.GET.get("page") or 1
+        try:
+            page = paginator.page(paginator.num_pages if page_number == "last" else page_number)
+        except InvalidPage:
+            raise Http404("Página inválida.")
+        page.object_list = [subject async for subject in page.object_list]
+
+        context = {
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": page.has_other_pages(),
+            "object_list": page.object_list,
+            "subjects": page.object_list,
+            "student": student,
+            "career": student.career,
+        }
+        return TemplateResponse(request, self.template_name, context)
+
+
+class AsyncEnrollmentActionView(AsyncStudentRequiredMixin, View):
+    """
+    Versión async de EnrollmentActionView. La transacción de
+    EnrollmentService.create_enrollment corre entera en el pool de hilos.
+    """
+
+    async def post(self, request, *args, **kwargs):
+        form = EnrollmentCreateForm(request.POST)
+
+        # La validación del formulario consulta la materia con el ORM sincrónico
+        if not await sync_to_async(form.is_valid)():
+            messages.error(request, "Datos inválidos.")
+            return redirect("enrollments:enrollment_list")
+
+        try:
+            subject = form.cleaned_data["subject"]
+            await run_in_db_thread(EnrollmentService.create_enrollment, user=request.user, subject_id=subject.id)
+
+        except ValidationError as e:
+            messages.error(request, str(e))
+            return redirect("enrollments:enrollment_list")
+
+        messages.success(request, "Te has inscrito correctamente en la materia.")
+        return redirect("enrollments:enrollment_list")
+
+
+class AsyncEnrollmentDropView(AsyncStudentRequiredMixin, View):
+    """
+    Versión async de EnrollmentDropView. La transacción de
+    EnrollmentService.unenroll_student corre entera en el pool de hilos.
+    """
+
+    async def post(self, request, pk):
+        student = request.profile
+        try:
+            await run_in_db_thread(EnrollmentService.unenroll_student, student, pk)
+            messages.success(request, "Te has dado de baja correctamente.")
+        except Exception as e:
+            messages.error(request, str(e))
+
+        return redirect("enrollments:my_enrollments")
+
+    async def get(self, *args, **kwargs):
+        return HttpResponseNotAllowed(["POST"])
+
+
+class EnrollmentAdminFilterMixin:
+    """
+    Filtros del reporte de inscripciones del administrador (carrera, materia,
+    DNI y estado, por GET). Compartidos por el listado y la exportación.
+    """
+    filter_params = ("career_id", "subject_id", "student_dni", "status")
+
+    def get_filters(self):
+        return {name: self.request.GET.get(name, "") for name in self.filter_params}
+
+    def filter_enrollments(self, qs):
+        filters = self.get_filters()
+
+        if filters["career_id"]:
+            qs = qs.filter(student__career_id=filters["career_id"])
+
+        if filters["subject_id"]:
+            qs = qs.filter(subject_id=filters["subject_id"])
+
+        if filters["student_dni"]:
+            qs = qs.filter(student__dni=filters["student_dni"])
+
+        if filters["status"]:
+            qs = qs.filter(status=filters["status"])
+
+        return qs.order_by("-enrolled_at", "-id")
+
+
+class EnrollmentAdminListView(
+    AdminRequiredMixin, ReplicaReadMixin, EnrollmentAdminFilterMixin, KeysetPaginationMixin, ListView
+):
     """
     Vista para listar todas las inscripciones con filtros para el administrador.
+    Usa paginación por cursor sobre (enrolled_at, id): las páginas profundas del
+    historial cuestan lo mismo que la primera y no se ejecuta COUNT(*) sobre el join.
     """
     model = Enrollment
     template_name = "enrollments/enrollment_admin_list.html"
+    query_budget = 5
     context_object_name = "enrollments"
     paginate_by = 20
+    keyset_ordering = ("-enrolled_at", "-id")
 
     def get_queryset(self):
         qs = (
@@ -133,43 +331,99 @@ class EnrollmentAdminListView(AdminRequiredMixin, ListView):
                 "student__career",
             )
         )
+        return self.filter_enrollments(qs)
 
-        # --- Filtros dinámicos ---
-        career_id = self.request.GET.get("career_id")
-        subject_id = self.request.GET.get("subject_id")
-        student_dni = self.request.GET.get("student_dni")
-        status = self.request.GET.get("status")
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
 
-        if career_id:
-            qs = qs.filter(student__career_id=career_id)
+        # Para llenar los <select>: tuplas (id, nombre) cacheadas
+        context["careers"] = career_choices()
+        context["subjects"] = subject_choices()
 
-        if subject_id:
-            qs = qs.filter(subject_id=subject_id)
+        # Para llenar el <select> de status
+        context["status_choices"] = Enrollment.STATUS_CHOICES
 
-        if student_dni:
-            qs = qs.filter(student__dni=student_dni)
+        # Para mantener los filtros en el formulario y en los links de exportación
+        filters = self.get_filters()
+        context["filters"] = filters
+        context["export_query"] = urlencode({name: value for name, value in filters.items() if value})
 
-        if status:
-            qs = qs.filter(status=status)
+        return context
 
-        return qs.order_by("-enrolled_at")
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
+class EnrollmentExportView(AdminRequiredMixin, ReplicaReadMixin, EnrollmentAdminFilterMixin, View):
+    """
+    Exporta en CSV o XLSX todas las inscripciones del reporte del administrador,
+    con los mismos filtros que EnrollmentAdminListView.
+    Las filas se leen con values_list().iterator() y se envían en streaming:
+    la memoria no depende de la cantidad de inscripciones.
+    """
+    query_budget = 3
+
+    EXPORT_COLUMNS = (
+        ("enrolled_at", "Fecha"),
+        ("semester", "Semestre"),
+        ("student__surname", "Apellido"),
+        ("student__name", "Nombre"),
+        ("student__dni", "DNI"),
+        ("student__user__email", "Email"),
+        ("student__career__name", "Carrera"),
+        ("subject__name", "Materia"),
+        ("status", "Estado"),
+    )
+    CHUNK_SIZE = 2000
+
+    def get(self, request, export_format):
+        if export_format not in EXPORT_FORMATS:
+            raise Http404("Formato de exportación no soportado.")
+
+        qs = self.filter_enrollments(Enrollment.objects.all())
+        # El archivo se genera después de dispatch: se fija ahora la base elegida
+        # por el router (la réplica, si corresponde).
+        qs = qs.using(qs.db)
+
+        fields = [field for field, _ in self.EXPORT_COLUMNS]
+        header = [label for _, label in self.EXPORT_COLUMNS]
+        status_labels = dict(Enrollment.STATUS_CHOICES)
+        status_index = fields.index("status")
+
+        rows = (
+            row[:status_index] + (status_labels.get(row[status_index], row[status_index]),)
+            for row in qs.values_list(*fields).iterator(chunk_size=self.CHUNK_SIZE)
+        )
+        filename = f"inscripciones_{timezone.localdate():%Y%m%d}"
+        return streaming_export_response(export_format, filename, header, rows)
 
-        # Para llenar los <select>
-        context["careers"] = Career.objects.all().order_by("name")
-        context["subjects"] = Subject.objects.all().order_by("name")
 
-        # Para llenar el <select> de status
-        context["status_choices"] = Enrollment.STATUS_CHOICES
+class EnrollmentBulkCreateView(AdminRequiredMixin, FormView):
+    """
+    Vista para inscribir en bloque a los alumnos de una carrera en varias materias.
+    Delega la lógica transaccional en EnrollmentService.bulk_enroll y muestra
+    el detalle de los pares rechazados.
+    """
+    form_class = EnrollmentBulkForm
+    template_name = "enrollments/enrollment_bulk_form.html"
+    query_budget = 4
 
-        # Para mantener los filtros en el formulario
-        context["filters"] = {
-            "career_id": self.request.GET.get("career_id", ""),
-            "subject_id": self.request.GET.get("subject_id", ""),
-            "student_dni": self.request.GET.get("student_dni", ""),
-            "status": self.request.GET.get("status", ""),
-        }
+    def form_valid(self, form):
+        student_ids, unmatched = EnrollmentService.cohort_students(
+            form.cleaned_data["career"], form.cleaned_data["dnis"]
+        )
 
-        return context
+        result = EnrollmentService.bulk_enroll(
+            students=student_ids,
+            subjects=form.cleaned_data["subjects"],
+        )
+        # Los DNIs sin alumno activo en la carrera también se listan como rechazos
+        result["rejected"] = unmatched + result["rejected"]
+
+        created = len(result["created"])
+        rejected = len(result["rejected"])
+        if created:
+            messages.success(self.request, f"Se crearon {created} inscripciones.")
+        if rejected:
+            messages.error(self.request, f"Se rechazaron {rejected} inscripciones. Ver detalle abajo.")
+        if not created and not rejected:
+            messages.error(self.request, "No se encontraron alumnos para inscribir.")
+
+        return self.render_to_response(self.get_context_data(form=form, result=result))
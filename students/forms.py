@@ -1,6 +1,9 @@
+from functools import partial
+
 from django import forms
 from django.contrib.auth import get_user_model
 from careers.models import Career
+from core.choices import CachedModelChoiceField, career_choices
 from .services import StudentService
 from .models import Student
 
@@ -89,19 +92,17 @@ class StudentForm(forms.Form):
         if not dni.isdigit() or not (7 <= len(dni) <= 8):
             raise forms.ValidationError("El DNI debe tener 7 u 8 dígitos numéricos.")
 
-        qs = Student.objects.filter(dni=dni)
-        if self.student:
-            qs = qs.exclude(id=self.student.id)
-
-        if qs.exists():
+        exclude_student_id = self.student.id if self.student else None
+        if not StudentService.validate_dni_unique(dni, exclude_student_id=exclude_student_id):
             raise forms.ValidationError("Este DNI ya está registrado.")
 
         return dni
 
 
 class StudentCareerForm(forms.ModelForm):
-    career = forms.ModelChoiceField(
+    career = CachedModelChoiceField(
         queryset=Career.objects.filter(is_active=True),
+        choices_provider=partial(career_choices, active_only=True),
         label="Carrera",
         required=False,
         empty_label="----------",
@@ -111,3 +112,39 @@ class StudentCareerForm(forms.ModelForm):
     class Meta:
         model = Student
         fields = ['career']
+
+
+class StudentImportForm(forms.Form):
+    """
+    Formulario para importar estudiantes en bloque desde un CSV.
+    """
+    file = forms.FileField(
+        label="Archivo CSV",
+        help_text="Columnas: email, dni, nombre, apellido y opcionalmente carrera, domicilio, "
+                  "fecha_nacimiento y telefono. Separado por coma o punto y coma, en UTF-8.",
+        widget=forms.ClearableFileInput(attrs={"class": "form-control", "accept": ".csv"}),
+        error_messages={"required": "Debe seleccionar un archivo."},
+    )
+    career = CachedModelChoiceField(
+        queryset=Career.objects.filter(is_active=True),
+        choices_provider=partial(career_choices, active_only=True),
+        label="Carrera",
+        required=False,
+        empty_label="----------",
+        help_text="Se asigna a las filas que no tienen columna carrera.",
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    dry_run = forms.BooleanField(
+        label="Solo validar (no importar)",
+        required=False,
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+
+    # Límite del archivo: una cohorte de ingresantes ocupa bastante menos
+    MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+
+    def clean_file(self):
+        file = self.cleaned_data["file"]
+        if file.size > self.MAX_UPLOAD_SIZE:
+            raise forms.ValidationError("El archivo no puede superar los 5 MB.")
+        return file
@@ -0,0 +1,68 @@
+import csv
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from careers.models import Career
+from students.services import StudentImportService
+
+
+class Command(BaseCommand):
+    """
+    Importa estudiantes desde un CSV (planilla de admisiones).
+
+    Columnas: email, dni, nombre, apellido y opcionalmente carrera, domicilio,
+    fecha_nacimiento y telefono. Las filas con errores no se importan y se
+    informan con su número de línea (en pantalla o en el CSV de --report).
+
+    Ejemplo:
+        python manage.py import_students ingresantes.csv --career 1
+        python manage.py import_students ingresantes.csv --dry-run --report errores.csv
+    """
+    help = "Importa estudiantes en bloque desde un archivo CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Ruta del archivo CSV.")
+        parser.add_argument("--career", type=int, default=None,
+                            help="ID de la carrera para las filas sin columna carrera.")
+        parser.add_argument("--dry-run", action="store_true", help="Solo valida, no crea estudiantes.")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="Procesos para hashear contraseñas (por defecto, uno por CPU).")
+        parser.add_argument("--report", default=None, help="Escribe los errores por fila en este CSV.")
+
+    def handle(self, *args, **options):
+        career = None
+        if options["career"] is not None:
+            try:
+                career = Career.objects.get(pk=options["career"])
+            except Career.DoesNotExist:
+                raise CommandError(f"No existe la carrera con id {options['career']}.")
+
+        start = time.perf_counter()
+        try:
+            with open(options["path"], "rb") as file:
+                rows = StudentImportService.read_rows(file)
+            result = StudentImportService.import_students(
+                rows, career=career, dry_run=options["dry_run"], workers=options["workers"]
+            )
+        except OSError as e:
+            raise CommandError(f"No se pudo leer el archivo: {e}")
+        except ValidationError as e:
+            raise CommandError(" ".join(e.messages))
+
+        if options["report"]:
+            with open(options["report"], "w", newline="", encoding="utf-8") as report:
+                writer = csv.DictWriter(report, fieldnames=["row", "dni", "email", "message"])
+                writer.writeheader()
+                writer.writerows(result["errors"])
+        else:
+            for error in result["errors"]:
+                self.stdout.write(f"FILA {error['row']} ({error['dni']} {error['email']}): {error['message']}")
+
+        action = "válidas (sin importar)" if options["dry_run"] else "importadas"
+        style = self.style.WARNING if result["errors"] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"{result['total']} filas: {result['valid'] if options['dry_run'] else result['created']} {action}, "
+            f"{len(result['errors'])} con errores, en {time.perf_counter() - start:.1f} s."
+        ))
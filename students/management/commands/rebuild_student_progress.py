@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from students.models import Student
+from students.services import StudentProgressService
+
+
+class Command(BaseCommand):
+    """
+    Reconstruye StudentProgress desde las inscripciones, por bloques de
+    estudiantes procesados en paralelo.
+
+    Cada bloque es una transacción propia (StudentProgressService.rebuild_chunk):
+    dos consultas de lectura y un INSERT ... ON CONFLICT, así un error o un
+    corte a mitad de camino deja los bloques anteriores ya corregidos. Con
+    --workers > 1 los bloques se calculan en hilos con su propia conexión; en
+    SQLite las escrituras igual se serializan, la ganancia está en las lecturas.
+
+    Ejemplo:
+        python manage.py rebuild_student_progress
+        python manage.py rebuild_student_progress --chunk-size 500 --workers 4
+        python manage.py rebuild_student_progress --career 3
+    """
+    help = "Reconstruye el avance académico (StudentProgress) de los estudiantes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=StudentProgressService.CHUNK_SIZE,
+                            help="Estudiantes por transacción.")
+        parser.add_argument("--workers", type=int, default=4, help="Bloques procesados a la vez.")
+        parser.add_argument("--career", type=int, default=None,
+                            help="Solo los estudiantes de esta carrera (id).")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--chunk-size y --workers deben ser mayores a 0.")
+
+        students = Student.objects.order_by("pk")
+        if options["career"] is not None:
+            students = students.filter(career_id=options["career"])
+        student_ids = list(students.values_list("pk", flat=True))
+
+        chunk_size = options["chunk_size"]
+        chunks = [student_ids[start:start + chunk_size] for start in range(0, len(student_ids), chunk_size)]
+
+        start = time.perf_counter()
+        if options["workers"] == 1:
+            rebuilt = sum(StudentProgressService.rebuild_chunk(chunk) for chunk in chunks)
+        else:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+                rebuilt = sum(executor.map(self._rebuild_chunk, chunks))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Avance recalculado para {rebuilt} estudiantes en {len(chunks)} bloques "
+            f"({time.perf_counter() - start:.1f} s)."
+        ))
+
+    @staticmethod
+    def _rebuild_chunk(chunk):
+        try:
+            return StudentProgressService.rebuild_chunk(chunk)
+        finally:
+            # Cada hilo abre su conexión: se cierra al terminar el bloque
+            connections.close_all()
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0002_alter_career_description'),
+        ('students', '0005_alter_student_phone'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['surname', 'name'], name='student_surname_name_idx'),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.5 on 2026-10-18 04:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Q
+
+
+def backfill_progress(apps, schema_editor):
+    """
+    Calcula el avance inicial de cada estudiante a partir de sus inscripciones.
+    """
+    Student = apps.get_model("students", "Student")
+    StudentProgress = apps.get_model("students", "StudentProgress")
+    Career = apps.get_model("careers", "Career")
+    Enrollment = apps.get_model("enrollments", "Enrollment")
+
+    plan_counts = dict(
+        Career.subjects.through.objects.order_by()
+        .values("career_id").annotate(total=Count("id"))
+        .values_list("career_id", "total")
+    )
+    counts = {
+        row["student_id"]: row
+        for row in (
+            Enrollment.objects.filter(subject__careers=F("student__career"))
+            .order_by().values("student_id")
+            .annotate(
+                approved=Count("id", filter=Q(status="aprobada")),
+                in_progress=Count("id", filter=Q(status__in=["activa", "regular"])),
+            )
+        )
+    }
+
+    rows = []
+    for student_id, career_id in Student.objects.values_list("pk", "career_id").iterator():
+        row = counts.get(student_id, {})
+        rows.append(StudentProgress(
+            student_id=student_id,
+            career_id=career_id,
+            plan_count=plan_counts.get(career_id, 0),
+            approved_count=row.get("approved", 0),
+            in_progress_count=row.get("in_progress", 0),
+        ))
+    StudentProgress.objects.bulk_create(rows, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0002_alter_career_description'),
+        ('enrollments', '0006_enrollment_indexes'),
+        ('students', '0006_student_student_surname_name_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentProgress',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='progress', serialize=False, to='students.student', verbose_name='Estudiante')),
+                ('plan_count', models.PositiveIntegerField(default=0, verbose_name='Materias del plan')),
+                ('approved_count', models.PositiveIntegerField(default=0, verbose_name='Aprobadas')),
+                ('in_progress_count', models.PositiveIntegerField(default=0, verbose_name='En curso')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Actualizado')),
+                ('career', models.ForeignKey(blank=True, help_text='Carrera sobre cuyo plan se calculó el avance.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='careers.career', verbose_name='Carrera')),
+            ],
+            options={
+                'verbose_name': 'Avance académico',
+                'verbose_name_plural': 'Avances académicos',
+            },
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
@@ -6,6 +6,8 @@ from careers.models import Career
 
 
 class Student(Person):
+    PERSON_ROLE = "STUDENT"
+
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -39,6 +41,16 @@ class Student(Person):
                 }
             )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Recuerda la carrera con la que se cargó el estudiante para que las
+        señales detecten el cambio de carrera al guardar (ver StudentProgress).
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_career_id = instance.__dict__.get("career_id")
+        return instance
+
     def save(self, *args, **kwargs):
         """
         Sobrescribe el método save para ejecutar las validaciones.
@@ -52,3 +64,65 @@ class Student(Person):
     class Meta:
         verbose_name = "Estudiante"
         verbose_name_plural = "Estudiantes"
+        indexes = [
+            # Orden del listado de alumnos (StudentListView)
+            models.Index(fields=["surname", "name"], name="student_surname_name_idx"),
+        ]
+
+
+class StudentProgress(models.Model):
+    """
+    Avance del estudiante en el plan de estudios de su carrera (modelo de lectura).
+
+    Se mantiene de forma incremental cuando cambia el estado de una inscripción
+    o la carrera del estudiante (ver students.signals y enrollments.signals) y
+    se puede reconstruir con el comando rebuild_student_progress.
+    Solo cuentan las inscripciones a materias del plan de la carrera actual.
+    """
+    # Categoría de avance de cada estado de Enrollment (los demás cuentan como pendientes)
+    STATUS_CATEGORIES = {
+        "aprobada": "approved_count",
+        "activa": "in_progress_count",
+        "regular": "in_progress_count",
+    }
+
+    student = models.OneToOneField(
+        Student,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="progress",
+        verbose_name="Estudiante",
+    )
+
+    career = models.ForeignKey(
+        Career,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        verbose_name="Carrera",
+        help_text="Carrera sobre cuyo plan se calculó el avance.",
+    )
+
+    plan_count = models.PositiveIntegerField(default=0, verbose_name="Materias del plan")
+    approved_count = models.PositiveIntegerField(default=0, verbose_name="Aprobadas")
+    in_progress_count = models.PositiveIntegerField(default=0, verbose_name="En curso")
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Actualizado")
+
+    class Meta:
+        verbose_name = "Avance académico"
+        verbose_name_plural = "Avances académicos"
+
+    @property
+    def remaining_count(self):
+        return max(self.plan_count - self.approved_count - self.in_progress_count, 0)
+
+    @property
+    def completion_percent(self):
+        if not self.plan_count:
+            return 0
+        return round(self.approved_count * 100 / self.plan_count, 1)
+
+    def __str__(self):
+        return f"{self.student_id}: {self.approved_count}/{self.plan_count} aprobadas"
@@ -1,7 +1,21 @@
-from django.db import transaction
+import csv
+import io
+from collections import Counter
+from datetime import datetime
+
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.functions import Greatest
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from .models import Student
+from django.core.validators import validate_email
+from django.utils import timezone
+from careers.models import Career
+from core.transactions import retry_on_contention
+from enrollments.models import Enrollment
+from users.models import PersonIdentity
+from users.search import index_people_bulk, normalize_text
+from .models import Student, StudentProgress
 
 User = get_user_model()
 
@@ -13,7 +27,7 @@ class StudentService:
     """
 
     @staticmethod
-    @transaction.atomic
+    @retry_on_contention
     def create_student(data):
         """
         Crea un nuevo usuario (User) con rol STUDENT y el Student asociado.
@@ -46,7 +60,7 @@ class StudentService:
         return student
 
     @staticmethod
-    @transaction.atomic
+    @retry_on_contention
     def update_student(student: Student, *, email, dni, name, surname, career, address=None, birth_date=None,
                        phone=None):
         """
@@ -67,6 +81,9 @@ class StudentService:
                 {"dni": "El DNI ya está registrado en el sistema (puede ser otro Alumno, Admin o Docente)."})
 
         # --- Actualizar datos del STUDENT ---
+        # El email se asigna antes de guardar al Student para que
+        # el índice de búsqueda (Person.save) tome el valor nuevo.
+        user.email = email
         student.dni = dni
         student.name = name
         student.surname = surname
@@ -78,8 +95,6 @@ class StudentService:
         student.save()
 
         # --- Actualizar datos del USER ---
-        user.email = email
-
         # Si el modelo User tuviera DNI, se actualizaría aquí.
         if hasattr(user, "dni"):
             user.dni = dni
@@ -109,26 +124,8 @@ class StudentService:
         Valida que el DNI sea único en el sistema (Student, Teacher, Admin).
         Retorna True si es válido (no existe), False si ya existe.
         """
-        # Importaciones locales para evitar Circular Import Error
-        from users.models import Admin, Teacher
-
-        # Verificar colisión con otros roles
-        if Admin.objects.filter(dni=dni).exists():
-            return False
-        if Teacher.objects.filter(dni=dni).exists():
-            return False
-
-        # Verificar colisión con Students
-        qs = Student.objects.filter(dni=dni)
-
-        if exclude_student_id:
-            # Si estamos editando, exclúyeme a mí mismo
-            qs = qs.exclude(pk=exclude_student_id)
-
-        if qs.exists():
-            return False
-
-        return True
+        # Una sola consulta al registro global (si estamos editando, exclúyeme a mí mismo)
+        return PersonIdentity.is_dni_available(dni, Student.PERSON_ROLE, exclude_student_id)
 
     @staticmethod
     def validate_email_unique(email: str, exclude_user_id: int = None) -> bool:
@@ -141,3 +138,464 @@ class StudentService:
             qs = qs.exclude(id=exclude_user_id)
 
         return not qs.exists()
+
+
+class StudentImportService:
+    """
+    Alta masiva de estudiantes desde un CSV (planilla de admisiones).
+
+    A diferencia de create_student, valida el archivo completo por conjuntos:
+    - duplicados dentro del archivo (DNI y email),
+    - DNIs y emails ya registrados, con una consulta IN por bloque,
+    - formato de cada campo con los validadores del modelo (sin consultas).
+    Los usuarios se arman con User.objects.build_users_bulk (contraseñas
+    hasheadas en un pool de procesos, antes de abrir la transacción) y luego
+    User, Student, PersonIdentity y el índice de búsqueda se insertan con
+    bulk_create por bloques, todo en una sola transacción.
+    """
+
+    CHUNK_SIZE = 500
+
+    # Encabezados aceptados (en minúsculas, sin acentos ni guiones bajos) -> campo
+    COLUMNS = {
+        "email": "email",
+        "correo": "email",
+        "dni": "dni",
+        "nombre": "name",
+        "name": "name",
+        "apellido": "surname",
+        "surname": "surname",
+        "carrera": "career",
+        "career": "career",
+        "domicilio": "address",
+        "address": "address",
+        "fecha nacimiento": "birth_date",
+        "fecha de nacimiento": "birth_date",
+        "birth date": "birth_date",
+        "telefono": "phone",
+        "phone": "phone",
+    }
+    REQUIRED_COLUMNS = ("email", "dni", "name", "surname")
+    COLUMN_LABELS = {"email": "email", "dni": "dni", "name": "nombre", "surname": "apellido"}
+    DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y")
+
+    @staticmethod
+    def read_rows(file) -> list:
+        """
+        Lee el CSV (archivo de texto o binario, separado por coma o punto y coma)
+        y retorna una lista de diccionarios con los campos del estudiante.
+        Cada fila lleva en "row" su número de línea en el archivo.
+        """
+        content = file.read()
+        if isinstance(content, bytes):
+            try:
+                content = content.decode("utf-8-sig")
+            except UnicodeDecodeError:
+                raise ValidationError("El archivo debe estar codificado en UTF-8.")
+        content = content.lstrip("﻿")
+        if not content.strip():
+            raise ValidationError("El archivo está vacío.")
+
+        try:
+            dialect = csv.Sniffer().sniff(content.splitlines()[0], delimiters=",;")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(io.StringIO(content), dialect)
+
+        header = [
+            StudentImportService.COLUMNS.get(normalize_text(name.replace("_", " ")))
+            for name in next(reader)
+        ]
+        missing = [column for column in StudentImportService.REQUIRED_COLUMNS if column not in header]
+        if missing:
+            labels = ", ".join(StudentImportService.COLUMN_LABELS[column] for column in missing)
+            raise ValidationError(f"Faltan columnas obligatorias: {labels}.")
+
+        rows = []
+        for line, values in enumerate(reader, start=2):
+            if not any(value.strip() for value in values):
+                continue
+            row = {"row": line}
+            for field, value in zip(header, values):
+                if field:
+                    row[field] = value.strip()
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def import_students(rows, career=None, dry_run=False, workers=None) -> dict:
+        """
+        Valida e importa las filas leídas con read_rows. Las filas con errores
+        se informan y no se importan; el resto se crea en una sola transacción.
+
+        career es la carrera por defecto para las filas sin columna "carrera".
+        Con dry_run=True solo valida.
+
+        Retorna un diccionario con:
+        - "total": cantidad de filas del archivo.
+        - "valid": cantidad de filas sin errores.
+        - "created": cantidad de estudiantes creados (0 con dry_run).
+        - "errors": lista de {"row", "dni", "email", "message"} ordenada por fila.
+        """
+        valid, errors = StudentImportService._validate(rows, career)
+
+        created = 0
+        if valid and not dry_run:
+            try:
+                created = StudentImportService._create(valid, StudentImportService._build_users(valid, workers))
+            except IntegrityError:
+                # Otro alta registró el mismo DNI o email entre la validación y la escritura
+                raise ValidationError(
+                    "Algunos DNIs o emails se registraron durante la importación. "
+                    "No se importó ninguna fila: volver a intentar."
+                )
+
+        return {
+            "total": len(rows),
+            "created": created,
+            "valid": len(valid),
+            "errors": sorted(errors, key=lambda error: error["row"]),
+        }
+
+    @staticmethod
+    def _validate(rows, career):
+        """
+        Retorna (estudiantes válidos sin guardar, errores por fila).
+        """
+        errors = []
+
+        def reject(row, message):
+            errors.append({
+                "row": row["row"],
+                "dni": row.get("dni", ""),
+                "email": row.get("email", ""),
+                "message": message,
+            })
+
+        # --- Carreras por nombre, sin distinguir mayúsculas (1 query) ---
+        careers = {}
+        if any(row.get("career") for row in rows):
+            careers = {c.name.lower(): c for c in Career.objects.all()}
+
+        # --- Validación de cada fila en memoria ---
+        candidates = []
+        seen_dnis, seen_emails = {}, {}
+        for row in rows:
+            missing = [field for field in StudentImportService.REQUIRED_COLUMNS if not row.get(field)]
+            if missing:
+                labels = ", ".join(StudentImportService.COLUMN_LABELS[field] for field in missing)
+                reject(row, f"Faltan datos obligatorios: {labels}.")
+                continue
+
+            email = User.objects.normalize_email(row["email"])
+            try:
+                validate_email(email)
+            except ValidationError:
+                reject(row, "Email inválido.")
+                continue
+
+            row_career = career
+            if row.get("career"):
+                row_career = careers.get(row["career"].lower())
+                if row_career is None:
+                    reject(row, f"La carrera \"{row['career']}\" no existe.")
+                    continue
+
+            birth_date = None
+            if row.get("birth_date"):
+                for date_format in StudentImportService.DATE_FORMATS:
+                    try:
+                        birth_date = datetime.strptime(row["birth_date"], date_format).date()
+                        break
+                    except ValueError:
+                        pass
+                else:
+                    reject(row, "Fecha de nacimiento inválida (usar AAAA-MM-DD o DD/MM/AAAA).")
+                    continue
+
+            student = Student(
+                dni=row["dni"],
+                name=row["name"],
+                surname=row["surname"],
+                career=row_career,
+                address=row.get("address") or None,
+                birth_date=birth_date,
+                phone=row.get("phone") or None,
+            )
+            student.normalize_names()
+            try:
+                # Validadores de campo (DNI, teléfono, longitudes): no consultan la base
+                student.clean_fields(exclude=["user", "career"])
+            except ValidationError as e:
+                reject(row, " ".join(message for messages in e.message_dict.values() for message in messages))
+                continue
+
+            # --- Duplicados dentro del archivo ---
+            if student.dni in seen_dnis:
+                reject(row, f"DNI repetido en el archivo (fila {seen_dnis[student.dni]}).")
+                continue
+            if email in seen_emails:
+                reject(row, f"Email repetido en el archivo (fila {seen_emails[email]}).")
+                continue
+            seen_dnis[student.dni] = row["row"]
+            seen_emails[email] = row["row"]
+
+            candidates.append((row, email, student))
+
+        # --- Duplicados contra la base: una consulta IN por bloque y por campo ---
+        valid = []
+        chunk_size = StudentImportService.CHUNK_SIZE
+        for start in range(0, len(candidates), chunk_size):
+            chunk = candidates[start:start + chunk_size]
+            taken_dnis = PersonIdentity.taken_dnis(student.dni for _, _, student in chunk)
+            taken_emails = set(
+                User.objects.filter(email__in=[email for _, email, _ in chunk]).values_list("email", flat=True)
+            )
+            for row, email, student in chunk:
+                if student.dni in taken_dnis:
+                    reject(row, "El DNI ya está registrado en el sistema.")
+                elif email in taken_emails:
+                    reject(row, "El email ya está registrado en el sistema.")
+                else:
+                    valid.append((email, student))
+
+        return valid, errors
+
+    @staticmethod
+    def _build_users(valid, workers=None) -> list:
+        """
+        Arma los Users (sin guardar) de las filas válidas. Va fuera de la
+        transacción: hashear es lo más lento de la importación y, con SQLite en
+        modo IMMEDIATE, dentro de ella bloquearía a cualquier otra escritura.
+        """
+        # Mismas políticas que create_user (contraseña inicial = DNI, hasher provisorio);
+        # los hashes se calculan todos juntos en el pool de procesos
+        return User.objects.build_users_bulk(
+            [{"email": email, "role": "STUDENT", "dni": student.dni} for email, student in valid],
+            workers=workers,
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def _create(valid, users) -> int:
+        """
+        Inserta los Users ya armados por _build_users y crea Students,
+        identidades y entradas de búsqueda por bloques.
+        """
+        users = User.objects.bulk_create(users, batch_size=StudentImportService.CHUNK_SIZE)
+
+        chunk_size = StudentImportService.CHUNK_SIZE
+        for start in range(0, len(valid), chunk_size):
+            chunk = valid[start:start + chunk_size]
+            students = []
+            for user, (_, student) in zip(users[start:start + chunk_size], chunk):
+                student.user = user
+                students.append(student)
+            Student.objects.bulk_create(students)
+            PersonIdentity.register_people_bulk(students)
+            index_people_bulk(students)
+            # bulk_create no dispara señales: el avance se inicializa a mano
+            StudentProgressService.initialize_bulk(students)
+
+        return len(valid)
+
+
+class StudentProgressService:
+    """
+    Mantiene StudentProgress, el avance de cada estudiante en su plan de estudios.
+
+    Los cambios de estado de una inscripción se aplican como un UPDATE con F()
+    sobre la fila del estudiante; el cálculo completo (plan contra historial)
+    solo se hace al crear la fila, al cambiar de carrera, al cambiar el plan
+    o al reconstruir.
+    """
+
+    CHUNK_SIZE = 1000
+
+    UPDATE_FIELDS = ["career", "plan_count", "approved_count", "in_progress_count", "updated_at"]
+
+    @staticmethod
+    def build(pairs, with_history=True) -> list:
+        """
+        Calcula desde cero el avance de los estudiantes dados como pares
+        (student_id, career_id). Dos consultas para todo el bloque.
+        Con with_history=False no se leen inscripciones (estudiantes nuevos).
+        """
+        pairs = list(pairs)
+        career_ids = {career_id for _, career_id in pairs if career_id}
+
+        plan_counts = {}
+        if career_ids:
+            plan_counts = dict(
+                Career.subjects.through.objects.filter(career_id__in=career_ids)
+                .order_by().values("career_id").annotate(total=Count("id"))
+                .values_list("career_id", "total")
+            )
+
+        counts = {}
+        if with_history and career_ids:
+            in_progress = [status for status, field in StudentProgress.STATUS_CATEGORIES.items()
+                           if field == "in_progress_count"]
+            grouped = (
+                Enrollment.objects.filter(
+                    student_id__in=[student_id for student_id, career_id in pairs if career_id],
+                    # Solo materias del plan de la carrera actual del estudiante
+                    subject__careers=F("student__career"),
+                )
+                .order_by().values("student_id")
+                .annotate(
+                    approved=Count("id", filter=Q(status="aprobada")),
+                    in_progress=Count("id", filter=Q(status__in=in_progress)),
+                )
+            )
+            counts = {row["student_id"]: row for row in grouped}
+
+        return [
+            StudentProgress(
+                student_id=student_id,
+                career_id=career_id,
+                plan_count=plan_counts.get(career_id, 0),
+                approved_count=counts.get(student_id, {}).get("approved", 0),
+                in_progress_count=counts.get(student_id, {}).get("in_progress", 0),
+            )
+            for student_id, career_id in pairs
+        ]
+
+    @staticmethod
+    def save(rows) -> list:
+        """
+        Inserta o reemplaza las filas en un solo INSERT ... ON CONFLICT.
+        """
+        return StudentProgress.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["student"],
+            update_fields=StudentProgressService.UPDATE_FIELDS,
+        )
+
+    @staticmethod
+    def refresh(student) -> StudentProgress:
+        """
+        Recalcula el avance de un estudiante (ej. al cambiar de carrera).
+        """
+        return StudentProgressService.save(
+            StudentProgressService.build([(student.pk, student.career_id)])
+        )[0]
+
+    @staticmethod
+    def initialize(student) -> StudentProgress:
+        """
+        Crea la fila de un estudiante nuevo: todavía no tiene inscripciones.
+        """
+        return StudentProgressService.save(
+            StudentProgressService.build([(student.pk, student.career_id)], with_history=False)
+        )[0]
+
+    @staticmethod
+    def initialize_bulk(students) -> None:
+        """
+        initialize para estudiantes creados con bulk_create (importación CSV).
+        """
+        StudentProgressService.save(StudentProgressService.build(
+            [(student.pk, student.career_id) for student in students], with_history=False
+        ))
+
+    @staticmethod
+    def get_progress(student) -> StudentProgress:
+        """
+        Avance del estudiante: una lectura por clave primaria (o ninguna si la
+        vista usó select_related("progress")). Si la fila falta, se calcula.
+        """
+        try:
+            return student.progress
+        except StudentProgress.DoesNotExist:
+            return StudentProgressService.refresh(student)
+
+    @staticmethod
+    def record_status_change(enrollment, old_status, new_status) -> None:
+        """
+        Registra el alta (old_status=None), la baja física (new_status=None)
+        o el cambio de estado de una inscripción.
+
+        El UPDATE solo alcanza la fila si la materia pertenece al plan de la
+        carrera con la que se calculó el avance.
+        """
+        old_field = StudentProgress.STATUS_CATEGORIES.get(old_status)
+        new_field = StudentProgress.STATUS_CATEGORIES.get(new_status)
+        if old_field == new_field:
+            return
+
+        updates = {"updated_at": timezone.now()}
+        if old_field:
+            # Sin bajar de cero, aunque el avance haya quedado desfasado
+            updates[old_field] = Greatest(F(old_field) - 1, 0)
+        if new_field:
+            updates[new_field] = F(new_field) + 1
+
+        updated = StudentProgress.objects.filter(
+            student_id=enrollment.student_id, career__subjects=enrollment.subject_id
+        ).update(**updates)
+
+        # Sin fila todavía (ej. creada antes de StudentProgress): se calcula completa,
+        # ya con el cambio guardado
+        if not updated and not StudentProgress.objects.filter(student_id=enrollment.student_id).exists():
+            StudentProgressService.refresh(Student.objects.only("career").get(pk=enrollment.student_id))
+
+    @staticmethod
+    def record_bulk_created(enrollments) -> None:
+        """
+        Registra inscripciones creadas con bulk_create (que no dispara señales).
+        Un UPDATE por categoría, no por estudiante. Las inscripciones deben ser
+        de materias del plan de cada estudiante (bulk_enroll lo valida).
+        """
+        grouped = {}
+        for enrollment in enrollments:
+            field = StudentProgress.STATUS_CATEGORIES.get(enrollment.status)
+            if field:
+                grouped.setdefault(field, Counter())[enrollment.student_id] += 1
+
+        student_ids = set()
+        for field, per_student in grouped.items():
+            student_ids.update(per_student)
+            StudentProgress.objects.filter(student_id__in=per_student).update(**{
+                field: F(field) + Case(
+                    *(When(student_id=student_id, then=Value(total)) for student_id, total in per_student.items()),
+                    default=Value(0),
+                    output_field=models.PositiveIntegerField(),
+                ),
+                "updated_at": timezone.now(),
+            })
+
+        # Estudiantes sin fila: se calculan completos (ya incluyen las inscripciones nuevas)
+        missing = student_ids - set(
+            StudentProgress.objects.filter(student_id__in=student_ids).values_list("student_id", flat=True)
+        )
+        if missing:
+            StudentProgressService.save(StudentProgressService.build(
+                Student.objects.filter(pk__in=missing).values_list("pk", "career_id")
+            ))
+
+    @staticmethod
+    @retry_on_contention
+    def rebuild_chunk(student_ids) -> int:
+        """
+        Recalcula desde cero el avance de un bloque de estudiantes en una
+        transacción (ver el comando rebuild_student_progress).
+        """
+        rows = StudentProgressService.build(
+            Student.objects.filter(pk__in=student_ids).values_list("pk", "career_id")
+        )
+        StudentProgressService.save(rows)
+        return len(rows)
+
+    @staticmethod
+    def rebuild_career(career_id) -> int:
+        """
+        Recalcula el avance de los estudiantes de una carrera (cambió su plan).
+        """
+        student_ids = list(Student.objects.filter(career_id=career_id).values_list("pk", flat=True))
+        chunk_size = StudentProgressService.CHUNK_SIZE
+        return sum(
+            StudentProgressService.rebuild_chunk(student_ids[start:start + chunk_size])
+            for start in range(0, len(student_ids), chunk_size)
+        )
@@ -0,0 +1,44 @@
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from careers.models import Career
+from students.models import Student
+from students.services import StudentProgressService
+
+
+@receiver(post_save, sender=Student)
+def update_progress_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Crea el avance del estudiante nuevo y lo recalcula si cambió de carrera.
+    """
+    if raw:
+        return
+    if created:
+        StudentProgressService.initialize(instance)
+    elif instance.career_id != getattr(instance, "_loaded_career_id", instance.career_id):
+        StudentProgressService.refresh(instance)
+    instance._loaded_career_id = instance.career_id
+
+
+@receiver(m2m_changed, sender=Career.subjects.through)
+def update_progress_on_plan_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Recalcula el avance de los estudiantes de las carreras cuyo plan cambió
+    (career.subjects.add/remove/clear o subject.careers.add/remove/clear).
+    """
+    if action == "pre_clear" and reverse:
+        # Después del clear ya no se sabe de qué carreras era la materia
+        instance._progress_career_ids = set(instance.careers.values_list("pk", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        career_ids = {instance.pk}
+    elif action == "post_clear":
+        career_ids = getattr(instance, "_progress_career_ids", set())
+    else:
+        career_ids = pk_set or set()
+
+    for career_id in career_ids:
+        StudentProgressService.rebuild_career(career_id)
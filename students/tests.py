@@ -1,3 +1,41 @@
-from django.test import TestCase
+import io
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TransactionTestCase
+
+from careers.models import Career
+from students.models import Student
+from students.services import StudentImportService
+from users import hashing
+
+User = get_user_model()
+
+
+class StudentImportTests(TransactionTestCase):
+    """
+    Importación masiva de estudiantes desde CSV.
+    """
+
+    def test_passwords_are_hashed_outside_the_transaction(self):
+        career = Career.objects.create(name="Sistemas")
+        rows = StudentImportService.read_rows(io.StringIO(
+            "email,dni,nombre,apellido\n"
+            "ana@import.test,30000001,Ana,Gómez\n"
+            "luis@import.test,30000002,Luis,Pérez\n"
+        ))
+        in_atomic_block = []
+
+        def hash_passwords(*args, **kwargs):
+            in_atomic_block.append(connection.in_atomic_block)
+            return original(*args, **kwargs)
+
+        original = hashing.hash_passwords
+        with mock.patch.object(hashing, "hash_passwords", side_effect=hash_passwords):
+            result = StudentImportService.import_students(rows, career=career, workers=1)
+
+        self.assertEqual(result["created"], 2)
+        self.assertEqual(in_atomic_block, [False])
+        self.assertEqual(Student.objects.filter(career=career).count(), 2)
+        self.assertTrue(User.objects.get(email="ana@import.test").check_password("30000001"))
@@ -7,17 +7,19 @@ from django.urls import reverse, reverse_lazy
 from django.shortcuts import get_object_or_404, redirect
 from django.views.generic import FormView, ListView, DetailView, UpdateView
 from django.views import View
-from django.db.models import Q
 
+from core.db_routers import ReplicaReadMixin
 from users.mixins import AdminRequiredMixin
-from .forms import StudentForm, StudentCareerForm
+from users.search import search_person_ids
+from .forms import StudentForm, StudentCareerForm, StudentImportForm
 from .models import Student
-from .services import StudentService
+from .services import StudentImportService, StudentProgressService, StudentService
 
 
 class StudentCreateView(AdminRequiredMixin, FormView):
     form_class = StudentForm
     template_name = 'students/student_form.html'
+    query_budget = 2
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
@@ -47,9 +49,43 @@ class StudentCreateView(AdminRequiredMixin, FormView):
         return context
 
 
-class StudentListView(AdminRequiredMixin, ListView):
+class StudentImportView(AdminRequiredMixin, FormView):
+    """
+    Vista para importar estudiantes desde un CSV (planilla de admisiones).
+    Delega la validación y el alta en StudentImportService y muestra el
+    detalle de las filas con errores.
+    """
+    form_class = StudentImportForm
+    template_name = 'students/student_import.html'
+    query_budget = 3
+
+    def form_valid(self, form):
+        try:
+            rows = StudentImportService.read_rows(form.cleaned_data["file"])
+            result = StudentImportService.import_students(
+                rows,
+                career=form.cleaned_data["career"],
+                dry_run=form.cleaned_data["dry_run"],
+            )
+        except ValidationError as e:
+            form.add_error("file", e)
+            return self.form_invalid(form)
+
+        errors = len(result["errors"])
+        if form.cleaned_data["dry_run"]:
+            messages.info(self.request, f"{result['valid']} de {result['total']} filas son válidas.")
+        elif result["created"]:
+            messages.success(self.request, f"Se importaron {result['created']} estudiantes.")
+        if errors:
+            messages.error(self.request, f"{errors} filas tienen errores y no se importaron. Ver detalle abajo.")
+
+        return self.render_to_response(self.get_context_data(form=form, result=result))
+
+
+class StudentListView(AdminRequiredMixin, ReplicaReadMixin, ListView):
     model = Student
     template_name = 'students/student_list.html'
+    query_budget = 4
     context_object_name = 'students'
     paginate_by = 20  # Requisito de paginación por defecto
 
@@ -61,16 +97,23 @@ class StudentListView(AdminRequiredMixin, ListView):
         # Capturar el parámetro de búsqueda desde GET
         search_query = self.request.GET.get('search', '').strip()
 
-        if search_query:
-            # Filtrar por nombre, apellido o email (case-insensitive)
-            queryset = queryset.filter(
-                Q(name__icontains=search_query) |
-                Q(surname__icontains=search_query) |
-                Q(user__email__icontains=search_query)
-            )
+        # Buscar por nombre, apellido, DNI o email en el índice de búsqueda
+        # (sin acentos y por prefijo); los ids quedan ordenados por relevancia
+        self.search_ids = search_person_ids("STUDENT", search_query) if search_query else None
 
         return queryset
 
+    def paginate_queryset(self, queryset, page_size):
+        if self.search_ids is None:
+            return super().paginate_queryset(queryset, page_size)
+
+        # Con búsqueda se pagina sobre todas las coincidencias (lista de ids,
+        # sin COUNT) y solo se cargan los alumnos de la página, en orden de relevancia
+        paginator, page, ids, is_paginated = super().paginate_queryset(self.search_ids, page_size)
+        students = queryset.in_bulk(ids)
+        page.object_list = [students[pk] for pk in ids if pk in students]
+        return paginator, page, page.object_list, is_paginated
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['title'] = 'Listado de Alumnos'
@@ -78,21 +121,29 @@ class StudentListView(AdminRequiredMixin, ListView):
         return context
 
 
-class StudentDetailView(AdminRequiredMixin, DetailView):
+class StudentDetailView(AdminRequiredMixin, ReplicaReadMixin, DetailView):
     model = Student
     template_name = "students/student_detail.html"
+    query_budget = 5
     context_object_name = 'student'
 
     def get_queryset(self):
-        # Optimización para evitar N+1
-        return Student.objects.select_related("user", "career")
+        # Optimización para evitar N+1 (el avance viene en el mismo JOIN)
+        return Student.objects.select_related("user", "career", "progress")
+
+    @staticmethod
+    def enrollment_history(student):
+        """
+        Historial de inscripciones del alumno, de la más reciente a la más antigua.
+        """
+        return student.enrollments.select_related('subject').order_by('-enrolled_at')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         student = self.object
 
         # Buscamos las inscripciones ordenadas
-        enrollments_qs = student.enrollments.all().order_by('-enrolled_at')
+        enrollments_qs = self.enrollment_history(student)
 
         # Paginamos (10 por página)
         paginator = Paginator(enrollments_qs, 10)
@@ -105,6 +156,7 @@ class StudentDetailView(AdminRequiredMixin, DetailView):
         context['enrollments_page'] = page_obj
         context['page_obj'] = page_obj
         context['is_paginated'] = page_obj.has_other_pages()
+        context['progress'] = StudentProgressService.get_progress(student)
 
         return context
 
@@ -112,6 +164,7 @@ class StudentDetailView(AdminRequiredMixin, DetailView):
 class StudentUpdateView(AdminRequiredMixin, FormView):
     form_class = StudentForm
     template_name = "students/student_form.html"
+    query_budget = 4
     success_url = reverse_lazy("students:student_list")
 
     def dispatch(self, request, *args, **kwargs):
@@ -160,6 +213,7 @@ class StudentCareerUpdateView(AdminRequiredMixin, UpdateView):
     model = Student
     form_class = StudentCareerForm
     template_name = "students/student_career_form.html"
+    query_budget = 6
 
     def get_success_url(self):
         return reverse_lazy("students:student_detail", kwargs={"pk": self.object.pk})
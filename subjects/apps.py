@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class SubjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'subjects'
+
+    def ready(self):
+        # Registra las señales que invalidan el cache del catálogo
+        from subjects import signals  # noqa: F401
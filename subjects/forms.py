@@ -1,12 +1,14 @@
 from django import forms
 
+from core.choices import CachedModelChoiceField, active_teacher_choices
 from subjects.models import Subject
 from users.models import Teacher
 
 
 class SubjectForm(forms.ModelForm):
-    teacher = forms.ModelChoiceField(
+    teacher = CachedModelChoiceField(
         queryset=Teacher.objects.filter(user__is_active=True),
+        choices_provider=active_teacher_choices,
         required=False,
         widget=forms.Select(attrs={
             'class': 'form-select'
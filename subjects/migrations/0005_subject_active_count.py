@@ -0,0 +1,36 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:24
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_active_count(apps, schema_editor):
+    """
+    Inicializa el contador de inscripciones activas de cada materia
+    a partir de las inscripciones existentes.
+    """
+    Subject = apps.get_model("subjects", "Subject")
+
+    subjects = Subject.objects.annotate(
+        current=Count("enrollments", filter=Q(enrollments__status="activa"))
+    ).filter(current__gt=0)
+
+    for subject in subjects:
+        Subject.objects.filter(pk=subject.pk).update(active_count=subject.current)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subjects', '0004_allow_teacher_null'),
+        ('enrollments', '0004_alter_enrollment_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subject',
+            name='active_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Cantidad de inscripciones activas (mantenida automáticamente).', verbose_name='Inscripciones activas'),
+        ),
+        migrations.RunPython(backfill_active_count, migrations.RunPython.noop),
+    ]
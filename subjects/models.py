@@ -35,6 +35,17 @@ class Subject(models.Model):
         help_text="Cantidad máxima de estudiantes permitidos en la materia",
     )
 
+    # Contador desnormalizado de inscripciones activas.
+    # Lo mantiene EnrollmentService con UPDATEs condicionales (ver reserve_seat)
+    # y las señales de enrollments en cada cambio de estado desde o hacia "activa",
+    # así el control de cupo no depende de un COUNT sobre Enrollment.
+    active_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Inscripciones activas",
+        help_text="Cantidad de inscripciones activas (mantenida automáticamente).",
+    )
+
     class Meta:
         constraints = [
             models.UniqueConstraint(Lower("name"), name="uq_subject_name_lower")
@@ -43,3 +54,16 @@ class Subject(models.Model):
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        """
+        Evita que un save() completo (ej. desde SubjectForm) pise el contador
+        de cupo con el valor leído al cargar la instancia.
+        """
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "active_count"
+            ]
+        super().save(*args, **kwargs)
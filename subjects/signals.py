@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_version
+from users.models import Teacher, User
+from .models import Subject
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def invalidate_subject_cache(sender, **kwargs):
+    """
+    Invalida las páginas cacheadas que muestran datos de materias.
+    """
+    bump_version("subject")
+
+
+@receiver(post_save, sender=Teacher)
+@receiver(post_delete, sender=Teacher)
+def invalidate_teacher_cache(sender, **kwargs):
+    """
+    Las páginas de materias muestran el nombre del profesor titular.
+    """
+    bump_version("teacher")
+
+
+@receiver(post_save, sender=User)
+def invalidate_teacher_choices(sender, instance, update_fields=None, **kwargs):
+    """
+    Las opciones de profesores solo incluyen a los que tienen el usuario activo.
+    Los guardados que no tocan is_active (ej. last_login) no invalidan.
+    """
+    if instance.role != "TEACHER":
+        return
+    if update_fields is not None and "is_active" not in update_fields:
+        return
+    bump_version("teacher")
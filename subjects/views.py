@@ -1,13 +1,21 @@
+from functools import partial
+
 from django.contrib import messages
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Prefetch, Sum
+from django.db.models.functions import Coalesce
 from django.shortcuts import redirect, get_object_or_404
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, ListView, UpdateView, DeleteView, DetailView
 
+from core.cache import CatalogCacheMixin, cached
+from core.db_routers import ReplicaReadMixin
 from users.mixins import AdminRequiredMixin, TeacherRequiredMixin
 from subjects.forms import SubjectForm
 from subjects.models import Subject
-from enrollments.models import Enrollment
+from careers.models import Career
+from enrollments.models import Enrollment, SubjectEnrollmentStats
+from enrollments.services import WaitlistService
 
 
 class SubjectCreateView(AdminRequiredMixin, CreateView):
@@ -18,6 +26,7 @@ class SubjectCreateView(AdminRequiredMixin, CreateView):
     model = Subject
     form_class = SubjectForm
     template_name = "subjects/subject_form.html"
+    query_budget = 3
 
     def form_valid(self, form):
         response = super().form_valid(form)
@@ -31,12 +40,17 @@ class SubjectCreateView(AdminRequiredMixin, CreateView):
         return reverse_lazy("subjects:subject_detail", kwargs={"pk": self.object.pk})
 
 
-class SubjectListView(AdminRequiredMixin, ListView):
-
+class SubjectListView(AdminRequiredMixin, ReplicaReadMixin, CatalogCacheMixin, ListView):
+    """
+    Listado de materias. El total y la tabla de cada página se cachean
+    (ver core.cache) hasta que se edita una materia o un profesor.
+    """
     model = Subject
     template_name = "subjects/subject_list.html"
+    query_budget = 4
     context_object_name = "subjects"
     paginate_by = 20
+    catalog_namespaces = ("subject", "teacher")
 
     def get_queryset(self):
         """
@@ -57,29 +71,45 @@ class SubjectListView(AdminRequiredMixin, ListView):
         return context
 
 
-class SubjectDetailView(AdminRequiredMixin, DetailView):
+class SubjectDetailView(AdminRequiredMixin, ReplicaReadMixin, CatalogCacheMixin, DetailView):
     """
     Ficha técnica de la Materia (SGA-89).
     Solo accesible por Administradores.
     """
     model = Subject
     template_name = "subjects/subject_detail.html"
+    # Con el cache vacío: sesión, usuario, materia, carreras y estadísticas
+    query_budget = 5
     context_object_name = "subject"
+    catalog_namespaces = ("subject", "career", "teacher")
 
     def get_queryset(self):
         """
         Optimización aplicada:
         1. select_related: Trae el profesor en la misma query.
         2. prefetch_related: Trae las carreras.
-        3. annotate: Cuenta los enrollments directamente en la DB.
         """
         return (
             Subject.objects.all()
             .select_related("teacher")
             .prefetch_related("careers")
-            .annotate(enrollment_count=Count('enrollments'))
         )
 
+    def get_object(self, queryset=None):
+        """
+        La materia (con profesor y carreras) se toma del cache. La cantidad de
+        inscripciones cambia con cada inscripción, por eso no se cachea: se suman
+        las estadísticas precalculadas (una fila por semestre) en cada petición.
+        """
+        subject = cached(
+            self.get_catalog_key("subject_detail", self.kwargs["pk"]),
+            partial(super().get_object, queryset),
+        )
+        subject.enrollment_count = SubjectEnrollmentStats.objects.filter(subject=subject).aggregate(
+            total=Coalesce(Sum(SubjectEnrollmentStats.total_expression()), 0)
+        )["total"]
+        return subject
+
 
 class SubjectUpdateView(AdminRequiredMixin, UpdateView):
     """
@@ -89,13 +119,24 @@ class SubjectUpdateView(AdminRequiredMixin, UpdateView):
     model = Subject
     form_class = SubjectForm
     template_name = "subjects/subject_form.html"
+    query_budget = 4
 
     def form_valid(self, form):
-        response = super().form_valid(form)
+        # Si se amplió el cupo, los lugares nuevos son para la lista de espera:
+        # el cupo y la promoción se guardan en la misma transacción, así una
+        # inscripción directa no puede tomar antes un lugar nuevo
+        with transaction.atomic():
+            response = super().form_valid(form)
+            promoted = 0
+            if "quota" in form.changed_data:
+                promoted = WaitlistService.fill_open_seats(self.object.pk)
+
         messages.success(
             self.request,
             f"La materia ha sido actualizada correctamente."
         )
+        if promoted:
+            messages.info(self.request, f"{promoted} estudiantes de la lista de espera quedaron inscritos.")
         return response
 
     def get_success_url(self):
@@ -109,12 +150,13 @@ class SubjectDeleteView(AdminRequiredMixin, DeleteView):
     """
     model = Subject
     template_name = "subjects/subject_confirm_delete.html"
+    query_budget = 4
     success_url = reverse_lazy("subjects:subject_list")
     context_object_name = "subject"
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        subject = self.get_object()
+        subject = self.object
         # Indica si hay inscripciones asociadas (bloqueante)
         context["has_enrollments"] = subject.enrollments.exists()
         # Lista de carreras asociadas (informativo)
@@ -142,16 +184,24 @@ class SubjectDeleteView(AdminRequiredMixin, DeleteView):
 class MySubjectsListView(TeacherRequiredMixin, ListView):
     model = Subject
     template_name = "subjects/my_subjects.html"
+    query_budget = 4
     context_object_name = "subjects"
 
     def get_queryset(self):
         # Obtenemos el perfil del profesor del usuario logueado
-        teacher = self.request.user.teacher_profile
+        teacher = self.request.profile
 
-        # Filtramos las materias donde este profesor es el titular
+        # Filtramos las materias donde este profesor es el titular.
+        # La cantidad de inscriptos sale de las estadísticas precalculadas y de
+        # las carreras solo se carga el nombre que muestra el template.
         return (
             Subject.objects.filter(teacher=teacher)
-            .prefetch_related('careers', 'enrollments')
+            .prefetch_related(Prefetch('careers', queryset=Career.objects.only('id', 'name')))
+            .annotate(
+                enrollment_count=Coalesce(
+                    Sum(SubjectEnrollmentStats.total_expression("enrollment_stats__")), 0
+                )
+            )
             .order_by('name')
         )
 
@@ -164,6 +214,7 @@ class MySubjectsListView(TeacherRequiredMixin, ListView):
 class SubjectEnrollmentListView(TeacherRequiredMixin, ListView):
     model = Enrollment
     template_name = "subjects/subject_enrollment_list.html"
+    query_budget = 4
     context_object_name = "enrollments"
 
     def get_queryset(self):
@@ -171,7 +222,7 @@ class SubjectEnrollmentListView(TeacherRequiredMixin, ListView):
         subject_id = self.kwargs['pk']
 
         # Obtenemos el perfil del profesor actual
-        teacher = self.request.user.teacher_profile
+        teacher = self.request.profile
 
         # Buscamos la materia, pero filtrando por el profesor.
         # Si la materia existe pero es de otro profesor, lanzará 404 Not Found.
@@ -180,7 +231,7 @@ class SubjectEnrollmentListView(TeacherRequiredMixin, ListView):
         # 4. Retornamos las inscripciones de esa materia
         return (
             Enrollment.objects.filter(subject=self.subject)
-            .select_related('student')
+            .select_related('student__user')
             .order_by('student__surname', 'student__name')
         )
 
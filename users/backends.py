@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    Backend de autenticación que carga el usuario de la sesión junto con su perfil.
+
+    ModelBackend.get_user() solo trae la fila de User; cada acceso posterior a
+    student_profile / teacher_profile / admin_profile (base.html, mixins, vistas)
+    disparaba una consulta extra. Acá se resuelve todo en un único join.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related(
+                "student_profile__career",
+                "teacher_profile",
+                "admin_profile",
+            ).get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
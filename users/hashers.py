@@ -0,0 +1,37 @@
+"""
+Hasher "provisorio" para las contraseñas iniciales de alumnos y profesores.
+
+La contraseña inicial es el DNI y se reemplaza obligatoriamente en el primer
+login (is_first_login=True), así que no justifica el costo completo de PBKDF2
+(cientos de milisegundos por hash). Estas cuentas se crean con un PBKDF2 de
+menos iteraciones; al completar el primer login la contraseña nueva se guarda
+con el hasher por defecto (ver AuthService.complete_first_login_process).
+
+Se configura con PROVISIONAL_PASSWORD_HASHER (nombre del algoritmo, que debe
+estar en PASSWORD_HASHERS). Con None se usa el hasher por defecto.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, get_hasher, get_hashers_by_algorithm
+
+
+class ProvisionalPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    algorithm = "pbkdf2_sha256_provisional"
+    iterations = 20_000
+
+
+def get_provisional_hasher():
+    """
+    Hasher para las contraseñas iniciales. Si no hay uno configurado (o no está
+    en PASSWORD_HASHERS, ej. en tests con un hasher rápido) usa el por defecto.
+    """
+    algorithm = getattr(settings, "PROVISIONAL_PASSWORD_HASHER", None)
+    if algorithm and algorithm in get_hashers_by_algorithm():
+        return get_hasher(algorithm)
+    return get_hasher("default")
+
+
+def is_provisional(encoded: str) -> bool:
+    """
+    True si el hash guardado fue generado con el hasher provisorio.
+    """
+    return bool(encoded) and encoded.startswith(f"{ProvisionalPBKDF2PasswordHasher.algorithm}$")
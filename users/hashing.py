@@ -0,0 +1,49 @@
+"""
+Hasheo de contraseñas en bloque.
+
+Con los parámetros por defecto de Django cada hash PBKDF2 cuesta cientos de
+milisegundos de CPU: al importar miles de usuarios el hasheo domina el tiempo
+total. hash_passwords reparte el trabajo en un pool de procesos (un hash no
+libera el GIL, por eso no alcanza con hilos).
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import get_hasher
+from django.utils.module_loading import import_string
+
+# Por debajo de este tamaño no conviene pagar el arranque de los procesos
+MIN_POOL_BATCH = 32
+
+
+def _hash_one(hasher_path, password):
+    """
+    Función del proceso hijo: recibe la ruta de la clase del hasher (no usa
+    settings, los procesos hijos no necesitan inicializar Django).
+    """
+    hasher = import_string(hasher_path)()
+    return hasher.encode(password, hasher.salt())
+
+
+def hash_passwords(passwords, algorithm="default", workers=None) -> list:
+    """
+    Retorna el hash (formato de User.password) de cada contraseña, en el mismo orden.
+
+    algorithm es el nombre de un hasher de PASSWORD_HASHERS ("default" usa el
+    primero). workers es la cantidad de procesos (por defecto, uno por CPU).
+    """
+    passwords = list(passwords)
+    hasher = get_hasher(algorithm)
+    hasher_path = f"{type(hasher).__module__}.{type(hasher).__qualname__}"
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(passwords) < MIN_POOL_BATCH:
+        return [hasher.encode(password, hasher.salt()) for password in passwords]
+
+    # "spawn": el proceso web puede tener hilos y conexiones abiertas que no
+    # deben copiarse con fork
+    context = multiprocessing.get_context("spawn")
+    chunksize = max(len(passwords) // (workers * 4), 1)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        return list(pool.map(_hash_one, [hasher_path] * len(passwords), passwords, chunksize=chunksize))
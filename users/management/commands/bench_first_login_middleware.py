@@ -0,0 +1,96 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.test import RequestFactory
+from django.urls import reverse
+
+from users.middleware import ForcePasswordChangeMiddleware
+
+User = get_user_model()
+
+
+class LegacyForcePasswordChangeMiddleware:
+    """
+    Versión anterior de ForcePasswordChangeMiddleware (dos reverse() por petición
+    de un usuario en primer login), usada como referencia.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.user.is_authenticated:
+            return self.get_response(request)
+        if not getattr(request.user, "is_first_login", False):
+            return self.get_response(request)
+        change_pass_url = reverse("users:first_login_change_password")
+        logout_url = reverse("logout")
+        if request.path != change_pass_url and request.path != logout_url:
+            if settings.STATIC_URL and request.path.startswith(settings.STATIC_URL):
+                return self.get_response(request)
+            return redirect(change_pass_url)
+        return self.get_response(request)
+
+
+class Command(BaseCommand):
+    """
+    Microbenchmark del costo por petición de ForcePasswordChangeMiddleware,
+    comparando la versión anterior con la actual (URLs resueltas una vez).
+    No toca la base de datos: usa un usuario en memoria.
+
+    Ejemplo:
+        python manage.py bench_first_login_middleware --requests 50000
+    """
+    help = "Mide la sobrecarga por petición de ForcePasswordChangeMiddleware (antes / después)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=20000, help="Peticiones por escenario.")
+
+    def handle(self, *args, **options):
+        n = options["requests"]
+        factory = RequestFactory()
+        # Respuesta fija: solo se mide el trabajo del middleware
+        response = HttpResponse()
+        legacy = LegacyForcePasswordChangeMiddleware(lambda request: response)
+        middleware = ForcePasswordChangeMiddleware(lambda request: response)
+        change_pass_url = reverse("users:first_login_change_password")
+
+        scenarios = [
+            ("Anónimo", None, "/"),
+            ("Primer login completado", False, "/dashboard/"),
+            ("Primer login pendiente (redirige)", True, "/dashboard/"),
+            ("Primer login pendiente (página de cambio)", True, change_pass_url),
+        ]
+
+        self.stdout.write(f"{'Escenario':<45}{'Antes (µs)':>12}{'Después (µs)':>14}")
+        for label, first_login, path in scenarios:
+            request = factory.get(path)
+            if first_login is None:
+                request.user = AnonymousUser()
+            else:
+                request.user = User(pk=1, email="bench@example.com", role="STUDENT", is_first_login=first_login)
+
+            before = self._measure(lambda: legacy(request), n)
+
+            # Primera petición: resuelve las URLs exentas
+            middleware(request)
+            after = self._measure(lambda: middleware(request), n)
+
+            self.stdout.write(f"{label:<45}{before:>12.2f}{after:>14.2f}")
+
+        self.stdout.write(self.style.SUCCESS(f"{n} peticiones por escenario."))
+
+    @staticmethod
+    def _measure(call, n):
+        """
+        Tiempo promedio por llamada, en microsegundos.
+        """
+        start = time.perf_counter()
+        for _ in range(n):
+            call()
+        return (time.perf_counter() - start) / n * 1_000_000
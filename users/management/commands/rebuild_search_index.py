@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from students.models import Student
+from users.models import Admin, PersonSearchEntry, Teacher
+from users.search import index_people_bulk
+
+
+class Command(BaseCommand):
+    """
+    Reconstruye el índice de búsqueda de personas (alumnos, profesores y administradores).
+    Útil si se modificaron datos por fuera de los servicios (ej. email desde el Django Admin).
+
+    Ejemplo:
+        python manage.py rebuild_search_index
+    """
+    help = "Reconstruye PersonSearchEntry a partir de Student, Teacher y Admin."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=2000, help="Personas por lote.")
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        PersonSearchEntry.objects.all().delete()
+
+        total = 0
+        for model in (Student, Teacher, Admin):
+            chunk = []
+            for person in model.objects.select_related("user").iterator(chunk_size=options["chunk_size"]):
+                chunk.append(person)
+                if len(chunk) >= options["chunk_size"]:
+                    index_people_bulk(chunk)
+                    total += len(chunk)
+                    chunk = []
+            index_people_bulk(chunk)
+            total += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(f"{total} personas indexadas."))
@@ -1,7 +1,10 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Tuple
 
+from django.contrib.auth.hashers import get_hasher, make_password
 from django.contrib.auth.models import UserManager as DjangoUserManager
 
+from users.hashers import get_provisional_hasher
+
 if TYPE_CHECKING:
     from .models import User
 
@@ -20,19 +23,17 @@ class CustomUserManager(DjangoUserManager):
         if role not in allowed_roles:
             raise ValueError(f"El rol debe ser uno de {', '.join(sorted(allowed_roles))}")
 
-    def create_user(
+    def _build_user(
         self,
-        username_ignored: str = None,
         email: str = None,
         dni: Optional[str] = None,
         role: str = None,
         password: Optional[str] = None,
         **extra_fields,
-    ) -> "User":
+    ) -> Tuple["User", str]:
         """
-        Crear y guardar un usuario con políticas específicas según el rol:
-        - STUDENT/TEACHER: la contraseña es el DNI. No existen contraseñas manuales. El campo 'is_first_login' es True.
-        - ADMIN: la contraseña es manual. El campo 'is_first_login' es False.
+        Arma el usuario (sin guardar ni hashear) aplicando las políticas de cada rol.
+        Retorna (usuario, contraseña en texto plano).
         """
         # Validaciones
         self._validate_common(email, role)
@@ -69,17 +70,77 @@ class CustomUserManager(DjangoUserManager):
         if not final_password:
             raise ValueError("No se pudo determinar la contraseña final")
 
-        # Crear el usuario
         user = self.model(
             email=email,
             role=role,
             **extra_fields
         )
+        return user, final_password
+
+    @staticmethod
+    def _hasher_for(user: "User"):
+        """
+        Las cuentas con primer login pendiente usan el hasher provisorio (ver users.hashers).
+        """
+        return get_provisional_hasher() if user.is_first_login else get_hasher("default")
 
-        user.set_password(final_password)
+    def create_user(
+        self,
+        username_ignored: str = None,
+        email: str = None,
+        dni: Optional[str] = None,
+        role: str = None,
+        password: Optional[str] = None,
+        **extra_fields,
+    ) -> "User":
+        """
+        Crear y guardar un usuario con políticas específicas según el rol:
+        - STUDENT/TEACHER: la contraseña es el DNI. No existen contraseñas manuales. El campo 'is_first_login' es True.
+        - ADMIN: la contraseña es manual. El campo 'is_first_login' es False.
+        """
+        user, raw_password = self._build_user(email=email, dni=dni, role=role, password=password, **extra_fields)
+
+        user.password = make_password(raw_password, hasher=self._hasher_for(user))
+        # Igual que set_password: los validadores de contraseña se notifican al guardar
+        user._password = raw_password
         user.save(using=self._db)
         return user
 
+    def build_users_bulk(self, rows, workers: Optional[int] = None) -> list:
+        """
+        Arma (sin guardar) varios usuarios con las mismas políticas que create_user.
+
+        rows es un iterable de diccionarios con los argumentos de create_user
+        (email, role, dni, password y campos extra). Los hashes se calculan en un
+        pool de procesos (users.hashing). No toca la base: conviene llamarlo antes
+        de abrir la transacción que los inserta, para no retener el lock de
+        escritura mientras se hashea.
+        Retorna la lista de usuarios, en el orden de rows.
+        """
+        from users.hashing import hash_passwords
+
+        built = [self._build_user(**row) for row in rows]
+
+        # Un lote de hashes por algoritmo (provisorio / por defecto)
+        by_algorithm = {}
+        for index, (user, raw_password) in enumerate(built):
+            by_algorithm.setdefault(self._hasher_for(user).algorithm, []).append((index, raw_password))
+
+        for algorithm, pending in by_algorithm.items():
+            hashes = hash_passwords([raw for _, raw in pending], algorithm=algorithm, workers=workers)
+            for (index, _), encoded in zip(pending, hashes):
+                built[index][0].password = encoded
+
+        return [user for user, _ in built]
+
+    def create_users_bulk(self, rows, workers: Optional[int] = None, batch_size: Optional[int] = None) -> list:
+        """
+        Crea varios usuarios con las mismas políticas que create_user: los arma
+        con build_users_bulk y los inserta con bulk_create.
+        Retorna la lista de usuarios creados, en el orden de rows.
+        """
+        return self.bulk_create(self.build_users_bulk(rows, workers=workers), batch_size=batch_size)
+
     def create_superuser(
         self,
         username_ignored: str = None,
@@ -1,52 +1,90 @@
+from django.contrib.auth.middleware import AuthenticationMiddleware
 from django.shortcuts import redirect
 from django.urls import reverse, NoReverseMatch
 
 from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
 
 
-class ForcePasswordChangeMiddleware:
+class ProfileAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware que además expone request.profile: el Student,
+    Teacher o Admin del usuario logueado (None si es anónimo o no tiene perfil).
+
+    Junto con users.backends.ProfileModelBackend, la identidad completa del
+    usuario se resuelve con una sola consulta por request.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        user = request.user
+        request.profile = user.profile if user.is_authenticated else None
+
+
+class ForcePasswordChangeMiddleware(MiddlewareMixin):
     """
     Middleware que fuerza a los usuarios a cambiar su contraseña si 'is_first_login' es True.
     Intercepta todas las peticiones excepto:
     1. La propia página de cambio de contraseña.
     2. La acción de cerrar sesión (logout).
     3. Archivos estáticos (CSS/JS) necesarios para renderizar la página.
+
+    El usuario ya viene cargado por ProfileAuthenticationMiddleware, así que leer
+    is_first_login no agrega consultas, y un cambio del administrador en ese campo
+    se aplica en la petición siguiente. Las URLs exentas se resuelven una sola vez.
+
+    Con MiddlewareMixin funciona tanto en WSGI como en ASGI (en ASGI,
+    process_request corre en un hilo y la vista async no pierde su concurrencia).
     """
 
     def __init__(self, get_response):
-        self.get_response = get_response
+        super().__init__(get_response)
+        # (change_pass_url, logout_url): se resuelven una sola vez
+        self._exempt_urls = None
+
+    def get_exempt_urls(self):
+        """
+        Resuelve las URLs protegidas en la primera petición y las reutiliza.
+        Se hace acá y no en __init__ porque el URLconf puede no estar cargado todavía.
+        """
+        if self._exempt_urls is None:
+            try:
+                self._exempt_urls = (
+                    reverse("users:first_login_change_password"),
+                    # Ajusta "logout" o "users:logout" según cómo llames a tu ruta de salida
+                    reverse("logout"),
+                )
+            except NoReverseMatch:
+                # Usamos try/except para evitar errores 500 si las rutas no cargaron aún.
+                return None
+        return self._exempt_urls
 
-    def __call__(self, request):
+    def process_request(self, request):
         # 1. Si no está autenticado, no hay nada que validar.
         if not request.user.is_authenticated:
-            return self.get_response(request)
+            return None
 
         # 2. Verificamos el flag del usuario de forma segura.
         # Si ya cambió la clave o el campo no existe, dejamos pasar.
         if not getattr(request.user, 'is_first_login', False):
-            return self.get_response(request)
+            return None
 
-        # 3. Intentamos resolver las URLs protegidas.
-        # Usamos try/except para evitar errores 500 si las rutas no cargaron aún.
-        try:
-            change_pass_url = reverse("users:first_login_change_password")
-            # Ajusta "logout" o "users:logout" según cómo llames a tu ruta de salida
-            logout_url = reverse("logout")
-        except NoReverseMatch:
-            return self.get_response(request)
+        exempt_urls = self.get_exempt_urls()
+        if exempt_urls is None:
+            return None
 
         current_path = request.path
 
-        # 4. Lógica de Bloqueo "El Guardián"
+        # 3. Lógica de Bloqueo "El Guardián"
         # Si NO está en la página de cambio Y NO está saliendo...
-        if current_path != change_pass_url and current_path != logout_url:
+        if current_path not in exempt_urls:
 
             # PERMITIR RECURSOS:
             # Es vital dejar pasar los estilos para que la página de error se vea bien.
             if settings.STATIC_URL and current_path.startswith(settings.STATIC_URL):
-                return self.get_response(request)
+                return None
 
             # BLOQUEO:
-            return redirect(change_pass_url)
+            return redirect(exempt_urls[0])
 
-        return self.get_response(request)
\ No newline at end of file
+        return None
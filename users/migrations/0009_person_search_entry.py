@@ -0,0 +1,124 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:31
+
+import unicodedata
+
+from django.db import OperationalError, migrations, models
+
+
+def normalize_text(value) -> str:
+    """
+    Copia de users.search.normalize_text al momento de esta migración
+    (una migración no debe depender del código actual de la app).
+    """
+    value = unicodedata.normalize("NFKD", str(value or ""))
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return " ".join(value.lower().split())
+
+
+SQLITE_FTS = [
+    # Tabla FTS5 de contenido externo: el texto vive en users_personsearchentry
+    "CREATE VIRTUAL TABLE users_personsearchentry_fts USING fts5("
+    "document, content='users_personsearchentry', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER users_personsearchentry_ai AFTER INSERT ON users_personsearchentry BEGIN "
+    "INSERT INTO users_personsearchentry_fts(rowid, document) VALUES (new.id, new.document); END",
+    "CREATE TRIGGER users_personsearchentry_ad AFTER DELETE ON users_personsearchentry BEGIN "
+    "INSERT INTO users_personsearchentry_fts(users_personsearchentry_fts, rowid, document) "
+    "VALUES ('delete', old.id, old.document); END",
+    "CREATE TRIGGER users_personsearchentry_au AFTER UPDATE ON users_personsearchentry BEGIN "
+    "INSERT INTO users_personsearchentry_fts(users_personsearchentry_fts, rowid, document) "
+    "VALUES ('delete', old.id, old.document); "
+    "INSERT INTO users_personsearchentry_fts(rowid, document) VALUES (new.id, new.document); END",
+]
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS users_personsearchentry_ai",
+    "DROP TRIGGER IF EXISTS users_personsearchentry_ad",
+    "DROP TRIGGER IF EXISTS users_personsearchentry_au",
+    "DROP TABLE IF EXISTS users_personsearchentry_fts",
+]
+
+POSTGRES_TRGM = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX users_personsearchentry_document_trgm "
+    "ON users_personsearchentry USING gin (document gin_trgm_ops)",
+]
+
+POSTGRES_TRGM_DROP = [
+    "DROP INDEX IF EXISTS users_personsearchentry_document_trgm",
+]
+
+
+def create_search_structures(apps, schema_editor):
+    """
+    Crea el índice de texto propio de cada motor.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        try:
+            for statement in SQLITE_FTS:
+                schema_editor.execute(statement)
+        except OperationalError:
+            # SQLite compilado sin FTS5: la búsqueda usa el modo por subcadena
+            for statement in SQLITE_FTS_DROP:
+                schema_editor.execute(statement)
+    elif vendor == "postgresql":
+        for statement in POSTGRES_TRGM:
+            schema_editor.execute(statement)
+
+
+def drop_search_structures(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": SQLITE_FTS_DROP, "postgresql": POSTGRES_TRGM_DROP}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def backfill_search_entries(apps, schema_editor):
+    """
+    Indexa alumnos, profesores y administradores existentes.
+    """
+    PersonSearchEntry = apps.get_model("users", "PersonSearchEntry")
+    models_by_role = {
+        "STUDENT": apps.get_model("students", "Student"),
+        "TEACHER": apps.get_model("users", "Teacher"),
+        "ADMIN": apps.get_model("users", "Admin"),
+    }
+
+    for role, model in models_by_role.items():
+        entries = [
+            PersonSearchEntry(
+                role=role,
+                person_id=person.pk,
+                document=normalize_text(f"{person.name} {person.surname} {person.dni} {person.user.email}"),
+            )
+            for person in model.objects.select_related("user").iterator(chunk_size=2000)
+        ]
+        PersonSearchEntry.objects.bulk_create(entries, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_alter_admin_phone_alter_teacher_phone'),
+        ('students', '0006_student_student_surname_name_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonSearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('ADMIN', 'Administrador'), ('STUDENT', 'Alumno'), ('TEACHER', 'Profesor')], max_length=10, verbose_name='Rol')),
+                ('person_id', models.PositiveBigIntegerField(help_text='ID del Student, Teacher o Admin indexado.', verbose_name='ID de la persona')),
+                ('document', models.TextField(help_text='Texto normalizado sobre el que se busca.', verbose_name='Documento')),
+            ],
+            options={
+                'verbose_name': 'Entrada de búsqueda',
+                'verbose_name_plural': 'Entradas de búsqueda',
+                'constraints': [models.UniqueConstraint(fields=('role', 'person_id'), name='unique_person_search_entry')],
+            },
+        ),
+        migrations.RunPython(create_search_structures, drop_search_structures),
+        migrations.RunPython(backfill_search_entries, migrations.RunPython.noop),
+    ]
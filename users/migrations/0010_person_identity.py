@@ -0,0 +1,60 @@
+# Generated by Django 5.2.5 on 2026-10-18 03:33
+
+from django.db import migrations, models
+
+
+def backfill_person_identities(apps, schema_editor):
+    """
+    Registra el DNI de alumnos, profesores y administradores existentes.
+    Si un DNI está repetido entre roles la migración se detiene: hay que corregir
+    los datos antes de poder aplicar la restricción global.
+    """
+    PersonIdentity = apps.get_model("users", "PersonIdentity")
+    models_by_role = {
+        "STUDENT": apps.get_model("students", "Student"),
+        "TEACHER": apps.get_model("users", "Teacher"),
+        "ADMIN": apps.get_model("users", "Admin"),
+    }
+
+    owners = {}
+    duplicates = []
+    for role, model in models_by_role.items():
+        for person_id, dni in model.objects.values_list("pk", "dni").iterator(chunk_size=2000):
+            if dni in owners:
+                duplicates.append(f"{dni} ({owners[dni][0]} {owners[dni][1]} / {role} {person_id})")
+                continue
+            owners[dni] = (role, person_id)
+
+    if duplicates:
+        raise RuntimeError("DNIs repetidos entre roles: " + ", ".join(duplicates))
+
+    PersonIdentity.objects.bulk_create(
+        [PersonIdentity(dni=dni, role=role, person_id=person_id) for dni, (role, person_id) in owners.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_person_search_entry'),
+        ('students', '0006_student_student_surname_name_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PersonIdentity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dni', models.CharField(max_length=10, unique=True, verbose_name='DNI')),
+                ('role', models.CharField(choices=[('ADMIN', 'Administrador'), ('STUDENT', 'Alumno'), ('TEACHER', 'Profesor')], max_length=10, verbose_name='Rol')),
+                ('person_id', models.PositiveBigIntegerField(help_text='ID del Student, Teacher o Admin dueño del DNI.', verbose_name='ID de la persona')),
+            ],
+            options={
+                'verbose_name': 'Identidad',
+                'verbose_name_plural': 'Identidades',
+                'constraints': [models.UniqueConstraint(fields=('role', 'person_id'), name='unique_person_identity')],
+            },
+        ),
+        migrations.RunPython(backfill_person_identities, migrations.RunPython.noop),
+    ]
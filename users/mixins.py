@@ -81,7 +81,8 @@ class StudentRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
         """
         Comprobación de permisos
         """
-        return self.request.user.role == "STUDENT"
+        # request.profile lo carga ProfileAuthenticationMiddleware (sin consultas extra)
+        return self.request.user.role == "STUDENT" and self.request.profile is not None
     
     def handle_no_permission(self):
         """
@@ -96,6 +97,21 @@ class StudentRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
             return super().handle_no_permission()
 
 
+class AsyncStudentRequiredMixin(StudentRequiredMixin):
+    """
+    StudentRequiredMixin para vistas async (handlers definidos con async def).
+
+    Las comprobaciones no consultan la base: request.user y request.profile
+    ya los resolvió ProfileAuthenticationMiddleware antes de llegar a la vista.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated or not self.test_func():
+            return self.handle_no_permission()
+        # Se saltean los dispatch sincrónicos de LoginRequiredMixin y UserPassesTestMixin
+        return await super(UserPassesTestMixin, self).dispatch(request, *args, **kwargs)
+
+
 class TeacherRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     """
     Mixin para verificar que el usuario sea un Profesor.
@@ -104,9 +120,10 @@ class TeacherRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
 
     def test_func(self):
         """
-        Validamos contra el rol 'TEACHER' en el modelo User.
+        Validamos contra el rol 'TEACHER' en el modelo User
+        y que exista su perfil de Profesor (request.profile).
         """
-        return self.request.user.role == "TEACHER"
+        return self.request.user.role == "TEACHER" and self.request.profile is not None
 
     def handle_no_permission(self):
         """
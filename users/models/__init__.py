@@ -2,5 +2,7 @@ from users.models.user import User
 from users.models.person import Person
 from users.models.admin import Admin
 from users.models.teacher import Teacher
+from users.models.search import PersonSearchEntry
+from users.models.identity import PersonIdentity
 
-__all__ = ['User', 'Person', 'Admin', 'Teacher']
+__all__ = ['User', 'Person', 'Admin', 'Teacher', 'PersonSearchEntry', 'PersonIdentity']
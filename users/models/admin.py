@@ -5,6 +5,8 @@ from django.utils import timezone
 
 
 class Admin(Person):
+    PERSON_ROLE = "ADMIN"
+
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -0,0 +1,74 @@
+from django.db import models
+
+from .user import User
+
+
+class PersonIdentity(models.Model):
+    """
+    Registro global de DNIs de todas las personas del sistema (Student, Teacher y Admin).
+
+    Person es abstracto y cada rol tiene su propia tabla, por lo que el unique de
+    Person.dni solo garantiza unicidad dentro de cada rol. Esta tabla centraliza el
+    DNI con un índice único, de modo que la base de datos rechaza los duplicados
+    entre roles y la validación se resuelve con una sola consulta.
+
+    Se mantiene desde Person.save() y se limpia al borrar la persona (users.signals).
+    """
+    dni = models.CharField(
+        max_length=10,
+        unique=True,
+        verbose_name="DNI",
+    )
+
+    role = models.CharField(
+        max_length=10,
+        choices=User.ROLE_CHOICES,
+        verbose_name="Rol",
+    )
+
+    person_id = models.PositiveBigIntegerField(
+        verbose_name="ID de la persona",
+        help_text="ID del Student, Teacher o Admin dueño del DNI.",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["role", "person_id"],
+                name="unique_person_identity",
+            )
+        ]
+        verbose_name = "Identidad"
+        verbose_name_plural = "Identidades"
+
+    def __str__(self):
+        return f"{self.dni} ({self.role} {self.person_id})"
+
+    @classmethod
+    def is_dni_available(cls, dni: str, role: str = None, person_id: int = None) -> bool:
+        """
+        Retorna True si el DNI no está registrado, o si lo tiene la misma persona
+        (role, person_id) que se está editando.
+        """
+        owner = cls.objects.filter(dni=dni).values_list("role", "person_id").first()
+        if owner is None:
+            return True
+        return person_id is not None and owner == (role, person_id)
+
+    @classmethod
+    def taken_dnis(cls, dnis) -> set:
+        """
+        Retorna el subconjunto de DNIs que ya están registrados (una sola consulta).
+        """
+        return set(cls.objects.filter(dni__in=list(dnis)).values_list("dni", flat=True))
+
+    @classmethod
+    def register_people_bulk(cls, people) -> None:
+        """
+        Registra en bloque los DNIs de personas creadas con bulk_create
+        (que no pasa por Person.save()).
+        """
+        cls.objects.bulk_create([
+            cls(dni=person.dni, role=person.PERSON_ROLE, person_id=person.pk)
+            for person in people
+        ])
@@ -1,5 +1,6 @@
+from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
 
 
 class Person(models.Model):
@@ -57,6 +58,9 @@ class Person(models.Model):
         ]
     )
 
+    # Rol del User asociado a cada tipo de persona (lo define cada subclase)
+    PERSON_ROLE = None
+
     class Meta:
         # con abstract=True se evita la creación de una tabla de Person
         abstract = True
@@ -69,9 +73,47 @@ class Person(models.Model):
     def __str__(self):
         return f"{self.surname}, {self.name}"
 
-    def save(self, *args, **kwargs):
+    def normalize_names(self):
+        """
+        Nombre y apellido sin espacios extremos y con mayúscula inicial.
+        """
         if self.name:
             self.name = self.name.strip().title()
         if self.surname:
             self.surname = self.surname.strip().title()
-        super().save(*args, **kwargs)
+
+    def save(self, *args, **kwargs):
+        self.normalize_names()
+        # La fila de la persona y su DNI en el registro global se escriben juntos
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.register_identity()
+        self.update_search_index()
+
+    def register_identity(self):
+        """
+        Registra (o actualiza) el DNI en PersonIdentity.
+        El índice único del registro rechaza DNIs repetidos entre roles.
+        """
+        # Importación local para evitar Circular Import Error
+        from users.models.identity import PersonIdentity
+
+        try:
+            with transaction.atomic():
+                identity, created = PersonIdentity.objects.get_or_create(
+                    role=self.PERSON_ROLE, person_id=self.pk, defaults={"dni": self.dni}
+                )
+                if not created and identity.dni != self.dni:
+                    identity.dni = self.dni
+                    identity.save(update_fields=["dni"])
+        except IntegrityError:
+            raise ValidationError({"dni": "El DNI ya está registrado en el sistema."})
+
+    def update_search_index(self):
+        """
+        Mantiene actualizada la entrada de búsqueda (ver users.search).
+        """
+        # Importación local para evitar Circular Import Error
+        from users.search import index_person
+
+        index_person(self)
@@ -0,0 +1,42 @@
+from django.db import models
+
+from .user import User
+
+
+class PersonSearchEntry(models.Model):
+    """
+    Documento de búsqueda normalizado (minúsculas y sin acentos) de una persona
+    del sistema: nombre, apellido, DNI y email.
+
+    Se mantiene desde Person.save() y se consulta a través de users.search:
+    - SQLite: tabla virtual FTS5 (users_personsearchentry_fts) sincronizada por triggers.
+    - PostgreSQL: índice GIN con pg_trgm sobre document.
+    """
+    role = models.CharField(
+        max_length=10,
+        choices=User.ROLE_CHOICES,
+        verbose_name="Rol",
+    )
+
+    person_id = models.PositiveBigIntegerField(
+        verbose_name="ID de la persona",
+        help_text="ID del Student, Teacher o Admin indexado.",
+    )
+
+    document = models.TextField(
+        verbose_name="Documento",
+        help_text="Texto normalizado sobre el que se busca.",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["role", "person_id"],
+                name="unique_person_search_entry",
+            )
+        ]
+        verbose_name = "Entrada de búsqueda"
+        verbose_name_plural = "Entradas de búsqueda"
+
+    def __str__(self):
+        return f"{self.role} {self.person_id}: {self.document}"
@@ -7,6 +7,8 @@ from .user import User
 
 
 class Teacher(Person):
+    PERSON_ROLE = "TEACHER"
+
     ACADEMIC_DEGREE_CHOICES = [
         ("GRADUATE", "Licenciado"),
         ("ENGINEER", "Ingeniero"),
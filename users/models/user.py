@@ -1,6 +1,8 @@
+from django.contrib.auth.hashers import acheck_password, check_password
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from users.hashers import is_provisional
 from users.managers import CustomUserManager
 
 
@@ -15,6 +17,13 @@ class User(AbstractUser):
         ("TEACHER", "Profesor"),
     ]
 
+    # Relación inversa (OneToOne) con el perfil de cada rol
+    PROFILE_RELATIONS = {
+        "STUDENT": "student_profile",
+        "TEACHER": "teacher_profile",
+        "ADMIN": "admin_profile",
+    }
+
     # NOTA:
     # - El email se usará como USERNAME_FIELD.
     # - La contraseña inicial se seteará con el DNI de la Persona asociada.
@@ -58,32 +67,42 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.email} ({self.role})"
 
+    def check_password(self, raw_password):
+        """
+        Mientras el primer login esté pendiente la contraseña provisoria no se
+        re-hashea al iniciar sesión (Django lo haría por no usar el hasher por
+        defecto): se reemplaza al completar el primer login.
+        """
+        if self.is_first_login and is_provisional(self.password):
+            return check_password(raw_password, self.password)
+        return super().check_password(raw_password)
+
+    async def acheck_password(self, raw_password):
+        if self.is_first_login and is_provisional(self.password):
+            return await acheck_password(raw_password, self.password)
+        return await super().acheck_password(raw_password)
+
+    @property
+    def profile(self):
+        """
+        Retorna el perfil (Student, Teacher o Admin) que corresponde al rol, o None.
+        Si el usuario se cargó con users.backends.ProfileModelBackend el perfil
+        ya viene en el mismo join y no se consulta la base de datos.
+        """
+        relation = self.PROFILE_RELATIONS.get(self.role)
+        if relation is None:
+            return None
+        # RelatedObjectDoesNotExist hereda de AttributeError
+        return getattr(self, relation, None)
+
     @property
     def full_name_display(self):
         """
         Retorna el nombre real desde el perfil asociado.
         Si no existe, retorna el email.
         """
-        name = self.email
-        is_email = True
-
-        try:
-            if self.role == 'STUDENT' and hasattr(self, 'student_profile'):
-                name = self.student_profile.get_full_name()
-                is_email = False
-
-            elif self.role == 'TEACHER' and hasattr(self, 'teacher_profile'):
-                name = self.teacher_profile.get_full_name()
-                is_email = False
-
-            elif self.role == 'ADMIN' and hasattr(self, 'admin_profile'):
-                name = self.admin_profile.get_full_name()
-                is_email = False
-
-        except Exception:
-            pass
-
-        if is_email:
-            return name
+        profile = self.profile
+        if profile is None:
+            return self.email
 
-        return name.title()
+        return profile.get_full_name().title()
@@ -0,0 +1,133 @@
+"""
+Búsqueda de personas (alumnos, profesores y administradores).
+
+El texto de cada persona se guarda normalizado en PersonSearchEntry y se consulta
+con el mecanismo nativo de cada motor:
+- SQLite: FTS5 con coincidencia por prefijo y orden por relevancia (bm25).
+- PostgreSQL: similitud de trigramas (pg_trgm) más coincidencia por prefijo.
+- Otros motores: coincidencia por subcadena sobre el documento normalizado.
+"""
+import re
+import unicodedata
+
+from django.db import DatabaseError, connections, router
+from django.db.models import Q
+
+from users.models import PersonSearchEntry
+
+FTS_TABLE = "users_personsearchentry_fts"
+
+
+def normalize_text(value) -> str:
+    """
+    Pasa el texto a minúsculas, quita acentos y colapsa espacios.
+    Ej.: "  José   PÉREZ " -> "jose perez"
+    """
+    value = unicodedata.normalize("NFKD", str(value or ""))
+    value = "".join(char for char in value if not unicodedata.combining(char))
+    return " ".join(value.lower().split())
+
+
+def build_document(person) -> str:
+    """
+    Arma el documento de búsqueda de una persona (Student, Teacher o Admin).
+    """
+    user = getattr(person, "user", None)
+    parts = [person.name, person.surname, person.dni, user.email if user else ""]
+    return normalize_text(" ".join(part for part in parts if part))
+
+
+def index_person(person) -> None:
+    """
+    Crea o actualiza la entrada de búsqueda de la persona.
+    """
+    PersonSearchEntry.objects.update_or_create(
+        role=person.PERSON_ROLE,
+        person_id=person.pk,
+        defaults={"document": build_document(person)},
+    )
+
+
+def index_people_bulk(people) -> None:
+    """
+    Indexa en bloque personas recién creadas con bulk_create (que no pasa por save()).
+    """
+    PersonSearchEntry.objects.bulk_create([
+        PersonSearchEntry(role=person.PERSON_ROLE, person_id=person.pk, document=build_document(person))
+        for person in people
+    ])
+
+
+def _terms(query: str) -> list:
+    return re.findall(r"\w+", normalize_text(query))
+
+
+def search_person_ids(role: str, query: str, limit: int = None) -> list:
+    """
+    Retorna los ids de las personas del rol que coinciden con la búsqueda,
+    ordenados por relevancia. Cada término se busca como prefijo
+    (ej. "jo per" encuentra a "José Pérez").
+
+    Sin limit retorna todas las coincidencias (solo ids: la vista pagina sobre
+    la lista y carga únicamente las personas de la página).
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    # Misma base que usaría el ORM (la réplica, si la vista lee de ella)
+    connection = connections[router.db_for_read(PersonSearchEntry)]
+    if connection.vendor == "sqlite":
+        try:
+            return _search_sqlite_fts(connection, role, terms, limit)
+        except DatabaseError:
+            # FTS5 no disponible en esta compilación de SQLite
+            pass
+    elif connection.vendor == "postgresql":
+        return _search_postgres_trigram(role, terms, limit)
+
+    return _search_fallback(role, terms, limit)
+
+
+def _search_sqlite_fts(connection, role, terms, limit):
+    match = " ".join(f'"{term}"*' for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT e.person_id FROM {FTS_TABLE} f "
+            f"JOIN users_personsearchentry e ON e.id = f.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND e.role = %s "
+            f"ORDER BY f.rank LIMIT %s",
+            # LIMIT -1: sin límite en SQLite
+            [match, role, -1 if limit is None else limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _search_postgres_trigram(role, terms, limit):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    query = " ".join(terms)
+    # Prefijo de cada término al inicio del documento o de una palabra
+    prefix = Q()
+    for term in terms:
+        prefix &= Q(document__startswith=term) | Q(document__contains=f" {term}")
+
+    return list(
+        PersonSearchEntry.objects.filter(role=role)
+        .annotate(similarity=TrigramWordSimilarity(query, "document"))
+        .filter(prefix | Q(similarity__gte=0.3))
+        .order_by("-similarity", "person_id")
+        .values_list("person_id", flat=True)[:limit]
+    )
+
+
+def _search_fallback(role, terms, limit):
+    condition = Q()
+    for term in terms:
+        condition &= Q(document__contains=term)
+
+    return list(
+        PersonSearchEntry.objects.filter(Q(role=role) & condition)
+        .order_by("person_id")
+        .values_list("person_id", flat=True)[:limit]
+    )
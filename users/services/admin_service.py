@@ -3,7 +3,7 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils import timezone
 
-from users.models import Admin
+from users.models import Admin, PersonIdentity
 
 User = get_user_model()
 
@@ -70,18 +70,10 @@ class AdminService:
     def validate_dni_unique(dni: str) -> bool:
         """
         Valida que el DNI sea único globalmente.
-        Person es abstracto, así que chequeamos las entidades concretas.
+        Person es abstracto, así que se consulta el registro global PersonIdentity.
         Retorna True si el DNI no existe, False si ya está en uso.
         """
-        # Importaciones locales para evitar dependencias circulares
-        from students.models import Student
-        from users.models import Teacher
-
-        exists_in_admin = Admin.objects.filter(dni=dni).exists()
-        exists_in_student = Student.objects.filter(dni=dni).exists()
-        exists_in_teacher = Teacher.objects.filter(dni=dni).exists()
-
-        return not (exists_in_admin or exists_in_student or exists_in_teacher)
+        return PersonIdentity.is_dni_available(dni)
 
     @staticmethod
     def validate_email_unique(email: str) -> bool:
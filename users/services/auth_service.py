@@ -16,11 +16,12 @@ class AuthService:
         """
         Finaliza el proceso de primer login de forma atómica.
         """
-        # Guardar la contraseña
-        user_updated = form.save()
+        # La contraseña nueva se hashea con el hasher por defecto (set_password),
+        # reemplazando el hash provisorio del DNI (ver users.hashers)
+        user_updated = form.save(commit=False)
 
         # Actualizar el flag
         user_updated.is_first_login = False
-        user_updated.save(update_fields=["is_first_login"])
+        user_updated.save(update_fields=["password", "is_first_login"])
 
         return user_updated
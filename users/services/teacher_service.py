@@ -2,6 +2,7 @@ from django.db import transaction
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 
+from core.transactions import retry_on_contention
 from users.models.teacher import Teacher
 
 
@@ -14,7 +15,7 @@ class TeacherService:
     """
 
     @staticmethod
-    @transaction.atomic
+    @retry_on_contention
     def create_teacher(data: dict) -> Teacher:
         """
         Crea un User (con rol Teacher) y un Teacher (Person)
@@ -73,26 +74,10 @@ class TeacherService:
         Valida que el DNI sea único en TODO el sistema.
         Retorna True si es válido (no existe), False si ya existe.
         """
-        # Importaciones locales para evitar Circular Import Error
-        from users.models import Admin
-        from students.models import Student
-
-        # Verificar colisión con otros roles
-        if Admin.objects.filter(dni=dni).exists():
-            return False
-        if Student.objects.filter(dni=dni).exists():
-            return False
-
-        # Verificar colisión con Teachers
-        qs = Teacher.objects.filter(dni=dni)
-
-        if exclude_teacher_id:
-            qs = qs.exclude(pk=exclude_teacher_id)
-
-        if qs.exists():
-            return False
+        # Importación local para evitar Circular Import Error
+        from users.models import PersonIdentity
 
-        return True
+        return PersonIdentity.is_dni_available(dni, Teacher.PERSON_ROLE, exclude_teacher_id)
 
     @staticmethod
     def validate_email_unique(email: str, exclude_user_id: int = None) -> bool:
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from users.models import Person, PersonIdentity, PersonSearchEntry
+
+
+@receiver(post_delete)
+def release_person_records(sender, instance, **kwargs):
+    """
+    Al borrar un Student, Teacher o Admin (incluye borrados en cascada desde User)
+    libera su DNI del registro global y quita su entrada de búsqueda.
+    Person es abstracto, por eso la señal no filtra por sender.
+    """
+    if not isinstance(instance, Person) or instance.PERSON_ROLE is None:
+        return
+
+    PersonIdentity.objects.filter(role=instance.PERSON_ROLE, person_id=instance.pk).delete()
+    PersonSearchEntry.objects.filter(role=instance.PERSON_ROLE, person_id=instance.pk).delete()
+
@@ -1,3 +1,42 @@
+from datetime import date
+
 from django.test import TestCase
+from django.urls import reverse
+
+from users.services.teacher_service import TeacherService
+
+
+class ForcePasswordChangeMiddlewareTests(TestCase):
+    """
+    El cambio de contraseña se exige según el estado actual del usuario, también
+    en sesiones ya abiertas.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        teacher = TeacherService.create_teacher({
+            "name": "Pablo", "surname": "Profesor", "dni": "20000000", "email": "teacher@users.test",
+            "academic_degree": "TEACHER", "hire_date": date(2020, 1, 1),
+        })
+        cls.user = teacher.user
+        cls.user.is_first_login = False
+        cls.user.save(update_fields=["is_first_login"])
+
+    def test_cleared_session_is_not_redirected(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("profile"))
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_reenabled_first_login_redirects_an_existing_session(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("profile"))
+
+        # Un administrador vuelve a exigir el cambio de contraseña
+        self.user.is_first_login = True
+        self.user.save(update_fields=["is_first_login"])
+
+        response = self.client.get(reverse("profile"))
 
-# Create your tests here.
+        self.assertRedirects(response, reverse("users:first_login_change_password"), fetch_redirect_response=False)
@@ -20,6 +20,7 @@ from .services.teacher_service import TeacherService
 # Vista Home (para usuarios no autenticados)
 class HomeView(TemplateView):
     template_name = "home.html"
+    query_budget = 2
 
     def dispatch(self, request, *args, **kwargs):
         # Si ya está autenticado, redirigimos a Dashboard
@@ -33,12 +34,14 @@ class HomeView(TemplateView):
 # Vista Dashboard (para usuarios autenticados)
 class DashboardView(LoginRequiredMixin, TemplateView):
     template_name = "dashboard.html"
+    query_budget = 2
     login_url = '/login/'
     redirect_field_name = 'next'
 
 
 class ProfileView(LoginRequiredMixin, TemplateView):
     template_name = "profile.html"
+    query_budget = 2
     login_url = '/login/'
     redirect_field_name = 'next'
 
@@ -46,6 +49,7 @@ class ProfileView(LoginRequiredMixin, TemplateView):
 class AdminListView(SuperuserRequiredMixin, ListView):
     model = Admin
     template_name = "users/admin_list.html"
+    query_budget = 4
     context_object_name = "admins"
     queryset = Admin.objects.select_related('user').all().order_by('-hire_date')
     paginate_by = 20
@@ -54,6 +58,7 @@ class AdminListView(SuperuserRequiredMixin, ListView):
 class AdminCreateView(SuperuserRequiredMixin, FormView):
     form_class = AdminCreateForm
     template_name = "users/admin_create.html"
+    query_budget = 2
     success_url = reverse_lazy("users:admin_list")
 
     def form_valid(self, form):
@@ -75,6 +80,7 @@ class AdminCreateView(SuperuserRequiredMixin, FormView):
 class AdminDeleteView(SuperuserRequiredMixin, DeleteView):
     model = Admin
     template_name = "users/admin_confirm_delete.html"
+    query_budget = 3
     success_url = reverse_lazy("users:admin_list")
     context_object_name = "admin"
 
@@ -108,6 +114,7 @@ class AdminDeleteView(SuperuserRequiredMixin, DeleteView):
 class TeacherCreateView(AdminRequiredMixin, FormView):
     form_class = TeacherCreateForm
     template_name = "users/teacher_create.html"
+    query_budget = 2
     success_url = reverse_lazy("users:teacher_list")
 
     def form_valid(self, form):
@@ -124,6 +131,7 @@ class TeacherCreateView(AdminRequiredMixin, FormView):
 class TeacherListView(AdminRequiredMixin, ListView):
     model = Teacher
     template_name = "users/teacher_list.html"
+    query_budget = 4
     context_object_name = "teachers"
     paginate_by = 20
 
@@ -139,6 +147,7 @@ class TeacherDeleteView(AdminRequiredMixin, DeleteView):
     """
     model = Teacher
     template_name = "users/teacher_confirm_delete.html"
+    query_budget = 4
     context_object_name = "teacher"
     success_url = reverse_lazy("users:teacher_list")
 
@@ -167,6 +176,7 @@ class TeacherDeleteView(AdminRequiredMixin, DeleteView):
 
 class FirstLoginChangePasswordView(PasswordChangeView):
     template_name = "users/first_login_change_password.html"
+    query_budget = 2
     form_class = FirstLoginPasswordChangeForm
     success_url = reverse_lazy("dashboard")
 
@@ -189,6 +199,7 @@ class UserPasswordChangeView(LoginRequiredMixin, PasswordChangeView):
     Vista para que un usuario logueado cambie su contraseña voluntariamente.
     """
     template_name = 'users/password_change.html'
+    query_budget = 2
     success_url = reverse_lazy('profile')
 
     def form_valid(self, form):